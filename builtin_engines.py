@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import urllib.parse
+
+from engine_registry import TranslationEngineBase
+from offline_dict import LOCAL_DICT_ENGINE
+
+
+class WebOnlyEngine(TranslationEngineBase):
+    """只能在网页中查看翻译的引擎，没有可直接调用的接口"""
+
+    def placeholder(self, text, from_lang="auto", to_lang="zh"):
+        # 模拟的翻译结果
+        return f"[{self.name}] {text} → {'英文翻译结果' if from_lang == 'zh' else '中文翻译结果'}"
+
+
+class BaiduEngine(WebOnlyEngine):
+    name = "百度翻译"
+    web_url_template = "https://fanyi.baidu.com/#{lang_from}/{lang_to}/{query}"
+
+
+class GoogleEngine(WebOnlyEngine):
+    name = "谷歌翻译"
+    web_url_template = "https://translate.google.com/?sl={lang_from}&tl={lang_to}&text={query}"
+
+
+class YoudaoEngine(TranslationEngineBase):
+    name = "有道翻译"
+    web_url_template = "https://fanyi.youdao.com/"
+    api_url_template = "https://fanyi.youdao.com/translate?&doctype=json&type={lang_from}2{lang_to}&i={query}"
+    capabilities = {"streaming": True, "local": False, "languages": None}
+
+    def translate_stream(self, text, from_lang="auto", to_lang="zh", cancel_event=None):
+        """逐句产出译文
+
+        接口一次返回完整的 JSON，这里只是在读完响应后按句子产出，
+        并不能比 translate() 更早拿到第一句译文。
+        """
+        api_url = self.api_url_template.format(lang_from=from_lang, lang_to=to_lang, query=urllib.parse.quote(text))
+        response = self.context.http.get(self.name, api_url, cancel_event=cancel_event)
+        result = response.json()
+        # translateResult 按段落分组，每个段落包含若干句子
+        for index, paragraph in enumerate(result.get("translateResult") or []):
+            if index:
+                yield "\n"
+            for sentence in paragraph:
+                yield sentence["tgt"]
+
+
+class LocalDictEngine(TranslationEngineBase):
+    """本地离线词典"""
+    name = LOCAL_DICT_ENGINE
+    capabilities = {"streaming": False, "local": True, "languages": None}
+
+    def translate(self, text, from_lang="auto", to_lang="zh", cancel_event=None):
+        dictionary = self.context.offline_dict
+        if dictionary is None:
+            return None
+        return dictionary.lookup(text, from_lang, to_lang)
+
+    def placeholder(self, text, from_lang="auto", to_lang="zh"):
+        return '本地词典中没有找到该词条\n\n请切换到在线翻译引擎，或点击"打开网页"在浏览器中查看翻译。'
+
+
+BUILTIN_ENGINES = [BaiduEngine, GoogleEngine, YoudaoEngine, LocalDictEngine]
+
+
+def register_builtin_engines(registry):
+    """登记内置翻译引擎"""
+    for engine_class in BUILTIN_ENGINES:
+        registry.register(engine_class.name, engine_class)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import time
+from collections import deque
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtGui import QClipboard, QGuiApplication
+
+
+class ClipboardWatcher(QObject):
+    """剪贴板变化监视器：优先使用 QClipboard 的变化信号，轮询仅作为后备方案"""
+    clipboard_changed = pyqtSignal(str)
+    selection_changed = pyqtSignal(str)
+    # 用户操作通知，可从钩子线程发出，由界面线程重置轮询间隔
+    user_active = pyqtSignal()
+
+    def __init__(self, parent=None, watch_selection=False, poll_interval_ms=500,
+                 max_poll_interval_ms=5000, force_polling=False):
+        super().__init__(parent)
+        self.clipboard = QGuiApplication.clipboard()
+        self.watch_selection = watch_selection and self.clipboard.supportsSelection()
+        self.poll_interval_ms = poll_interval_ms
+        self.max_poll_interval_ms = max(poll_interval_ms, max_poll_interval_ms)
+        self.current_interval_ms = poll_interval_ms
+        # 最近一分钟内的剪贴板读取时间戳
+        self.read_times = deque()
+        self.last_text = self.read_text(QClipboard.Mode.Clipboard)
+        self.last_selection = ""
+        self.active = True
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setSingleShot(True)
+        self.poll_timer.timeout.connect(self.poll)
+        self.user_active.connect(self.reset_backoff)
+
+        self.use_polling = force_polling or self.needs_polling()
+        if self.use_polling:
+            self.poll_timer.start(self.current_interval_ms)
+        else:
+            self.clipboard.dataChanged.connect(self.on_data_changed)
+            if self.watch_selection:
+                self.clipboard.selectionChanged.connect(self.on_selection_changed)
+
+    @staticmethod
+    def needs_polling():
+        """判断当前平台是否需要轮询：macOS 和 Wayland 下后台应用收不到剪贴板变化信号"""
+        if sys.platform == "darwin":
+            return True
+        return QGuiApplication.platformName().startswith("wayland")
+
+    def read_text(self, mode=QClipboard.Mode.Clipboard):
+        """读取剪贴板文本并记录读取次数"""
+        now = time.monotonic()
+        self.read_times.append(now)
+        while self.read_times and now - self.read_times[0] > 60:
+            self.read_times.popleft()
+        return self.clipboard.text(mode)
+
+    def reads_per_minute(self):
+        """最近一分钟内的剪贴板读取次数"""
+        now = time.monotonic()
+        while self.read_times and now - self.read_times[0] > 60:
+            self.read_times.popleft()
+        return len(self.read_times)
+
+    def on_data_changed(self):
+        """剪贴板内容变化"""
+        text = self.read_text(QClipboard.Mode.Clipboard)
+        if text and text != self.last_text:
+            self.last_text = text
+            self.clipboard_changed.emit(text)
+
+    def on_selection_changed(self):
+        """X11 主选区变化"""
+        text = self.read_text(QClipboard.Mode.Selection)
+        if text and text != self.last_selection:
+            self.last_selection = text
+            self.selection_changed.emit(text)
+
+    def poll(self):
+        """后备轮询：无变化时逐步延长间隔，有变化时恢复初始间隔"""
+        previous = self.last_text
+        self.on_data_changed()
+        if self.last_text != previous:
+            self.current_interval_ms = self.poll_interval_ms
+        else:
+            self.current_interval_ms = min(int(self.current_interval_ms * 1.5), self.max_poll_interval_ms)
+        self.poll_timer.start(self.current_interval_ms)
+
+    def notify_activity(self):
+        """报告用户操作（点击、按键），可在任意线程中调用"""
+        self.user_active.emit()
+
+    def reset_backoff(self):
+        """用户有操作时恢复轮询初始间隔"""
+        if self.use_polling and self.active and self.current_interval_ms != self.poll_interval_ms:
+            self.current_interval_ms = self.poll_interval_ms
+            self.poll_timer.start(self.current_interval_ms)
+
+    def stop(self):
+        """停止监视"""
+        if not self.active:
+            return
+        self.active = False
+        self.poll_timer.stop()
+        if not self.use_polling:
+            self.clipboard.dataChanged.disconnect(self.on_data_changed)
+            if self.watch_selection:
+                self.clipboard.selectionChanged.disconnect(self.on_selection_changed)
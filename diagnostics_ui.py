@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog,
+                             QMessageBox)
+
+from latency_trace import latency_tracer, STAGE_NAMES
+
+
+class DiagnosticsDialog(QDialog):
+    """诊断窗口：显示划词翻译各阶段的耗时分布和翻译引擎统计"""
+
+    def __init__(self, engine_stats=None, hook_stats=None, request_stats=None, parent=None):
+        super().__init__(parent)
+        # 获取引擎统计、钩子事件计数和请求合并/限流计数的函数，刷新时重新调用
+        self.engine_stats = engine_stats
+        self.hook_stats = hook_stats
+        self.request_stats = request_stats
+        self.setWindowTitle("诊断")
+        self.setMinimumSize(560, 420)
+        self.setup_ui()
+        self.refresh()
+
+    def setup_ui(self):
+        """设置用户界面"""
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(QLabel("各阶段距上一阶段的耗时（毫秒），“请求翻译”包含用户点击前的停留时间："))
+        self.stage_table = self.create_table(["阶段", "次数", "P50", "P95", "最大"])
+        layout.addWidget(self.stage_table)
+
+        layout.addWidget(QLabel("翻译引擎请求统计（毫秒）："))
+        self.engine_table = self.create_table(["引擎", "请求数", "成功率", "P50", "P95", "限流次数"])
+        layout.addWidget(self.engine_table)
+
+        self.request_label = QLabel()
+        layout.addWidget(self.request_label)
+
+        self.hook_label = QLabel()
+        layout.addWidget(self.hook_label)
+
+        buttons_layout = QHBoxLayout()
+        refresh_button = QPushButton("刷新")
+        refresh_button.clicked.connect(self.refresh)
+        export_button = QPushButton("导出...")
+        export_button.clicked.connect(self.export_traces)
+        clear_button = QPushButton("清空记录")
+        clear_button.clicked.connect(self.clear_traces)
+        close_button = QPushButton("关闭")
+        close_button.clicked.connect(self.accept)
+        buttons_layout.addWidget(refresh_button)
+        buttons_layout.addWidget(export_button)
+        buttons_layout.addWidget(clear_button)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(close_button)
+        layout.addLayout(buttons_layout)
+
+    def create_table(self, headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        return table
+
+    def fill_table(self, table, rows):
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(value))
+
+    def refresh(self):
+        """重新统计并刷新表格"""
+        stage_rows = [
+            [STAGE_NAMES.get(stage, stage), str(stats["count"]), f"{stats['p50_ms']:.1f}",
+             f"{stats['p95_ms']:.1f}", f"{stats['max_ms']:.1f}"]
+            for stage, stats in latency_tracer.stage_percentiles().items()
+        ]
+        self.fill_table(self.stage_table, stage_rows)
+
+        engine_stats = self.engine_stats() if self.engine_stats else {}
+        request_stats = self.request_stats() if self.request_stats else {}
+        throttled = request_stats.get("throttled", {})
+        engine_rows = [
+            [engine, str(stats["requests"]), f"{stats['success_rate']:.0%}",
+             f"{stats['p50_ms']:.1f}", f"{stats['p95_ms']:.1f}",
+             str(throttled.get(engine, {}).get("throttled", 0))]
+            for engine, stats in engine_stats.items()
+        ]
+        self.fill_table(self.engine_table, engine_rows)
+
+        if request_stats:
+            wait_ms = sum(stats["wait_ms"] for stats in throttled.values())
+            self.request_label.setText(
+                f"翻译请求：共 {request_stats['requests']}，合并重复请求 {request_stats['coalesced']}，"
+                f"进行中 {request_stats['in_flight']}，限流等待共 {wait_ms:.0f} 毫秒")
+            cache = request_stats.get("cache")
+            if cache:
+                self.request_label.setText(
+                    self.request_label.text() +
+                    f"\n翻译缓存：命中 {cache['hits']}（内存 {cache['memory_hits']}，磁盘 {cache['disk_hits']}），"
+                    f"未命中 {cache['misses']}，命中率 {cache['hit_rate']:.0%}，"
+                    f"淘汰 {cache['memory_evictions']}（内存）/{cache['disk_evictions']}（磁盘）")
+            prefetch = request_stats.get("prefetch")
+            if prefetch:
+                self.request_label.setText(
+                    self.request_label.text() +
+                    f"\n预取：发出 {prefetch['started']}，命中 {prefetch['hits']}，合并 {prefetch['joined']}，"
+                    f"放弃 {prefetch['cancelled']}，超出预算 {prefetch['skipped']}")
+
+        if self.hook_stats:
+            stats = self.hook_stats()
+            self.hook_label.setText(
+                f"键盘/鼠标事件：收到 {stats['posted']}，分发 {stats['dispatched']}，"
+                f"合并 {stats['coalesced']}，丢弃 {stats['dropped']}，待处理 {stats['pending']}")
+            callbacks = stats.get("callbacks")
+            if callbacks:
+                self.hook_label.setText(
+                    self.hook_label.text() + "\n钩子回调耗时（平均/最大，毫秒）：" +
+                    "，".join(f"{name} {record['avg_ms']:.2f}/{record['max_ms']:.2f}"
+                             for name, record in callbacks.items()))
+            selection = stats.get("selection")
+            if selection:
+                strategy, elapsed_ms = stats.get("last_selection", ("", 0.0))
+                self.hook_label.setText(
+                    self.hook_label.text() + "\n获取选中文本耗时（次数 平均/最大，毫秒）：" +
+                    "，".join(f"{name} {record['count']} {record['avg_ms']:.1f}/{record['max_ms']:.1f}"
+                             for name, record in selection.items()) +
+                    (f"；最近一次 {strategy} {elapsed_ms:.1f}" if strategy else ""))
+
+    def export_traces(self):
+        """把延迟记录导出为 JSON Lines 文件"""
+        default_name = time.strftime("latency-%Y%m%d-%H%M%S.jsonl")
+        path, _ = QFileDialog.getSaveFileName(self, "导出延迟记录", default_name,
+                                              "JSON Lines (*.jsonl)")
+        if not path:
+            return
+        try:
+            count = latency_tracer.export_jsonl(path)
+        except OSError as e:
+            QMessageBox.warning(self, "导出失败", str(e))
+            return
+        QMessageBox.information(self, "导出完成", f"已导出 {count} 条记录到 {path}")
+
+    def clear_traces(self):
+        latency_tracer.clear()
+        self.refresh()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# 同时请求所有引擎、使用最先返回结果的伪引擎名称
+FASTEST_ENGINE = "最快引擎"
+
+
+class EngineScoreboard:
+    """记录各翻译引擎的滚动延迟和成功率，用于给引擎排序"""
+
+    def __init__(self, alpha=0.3, default_latency_ms=1000.0, failure_penalty_ms=3000.0):
+        self.alpha = alpha
+        self.default_latency_ms = default_latency_ms
+        self.failure_penalty_ms = failure_penalty_ms
+        # {引擎名称: [平均延迟(毫秒), 成功率, 样本数]}
+        self.scores = {}
+        self.lock = threading.Lock()
+
+    def record(self, engine, latency_ms, ok):
+        """记录一次请求结果，使用指数加权移动平均"""
+        with self.lock:
+            score = self.scores.get(engine)
+            if score is None:
+                self.scores[engine] = [latency_ms, 1.0 if ok else 0.0, 1]
+                return
+            score[0] += self.alpha * (latency_ms - score[0])
+            score[1] += self.alpha * ((1.0 if ok else 0.0) - score[1])
+            score[2] += 1
+
+    def expected_ms(self, engine):
+        """预期拿到可用结果的耗时：平均延迟加上按失败率计算的惩罚，没有样本的引擎使用默认值"""
+        with self.lock:
+            score = self.scores.get(engine)
+        if score is None:
+            return self.default_latency_ms
+        return score[0] + (1.0 - score[1]) * self.failure_penalty_ms
+
+    def ranked(self, engines):
+        """按预期耗时从快到慢排序"""
+        return sorted(engines, key=self.expected_ms)
+
+    def snapshot(self):
+        """获取统计快照"""
+        with self.lock:
+            return {
+                engine: {"latency_ms": score[0], "success_rate": score[1], "samples": score[2]}
+                for engine, score in self.scores.items()
+            }
+
+
+class _AnyEvent:
+    """任一事件被设置即视为已设置，用于把外部取消和竞速结束合并传给请求"""
+
+    def __init__(self, *events):
+        self.events = [event for event in events if event is not None]
+
+    def is_set(self):
+        return any(event.is_set() for event in self.events)
+
+
+class EngineRacer:
+    """同时向多个翻译引擎发起请求，返回最先成功的结果并取消其余请求"""
+
+    def __init__(self, engine, scoreboard=None, max_workers=4):
+        self.engine = engine
+        self.scoreboard = scoreboard or EngineScoreboard()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="race")
+
+    def race(self, text, from_lang, to_lang, engines, cancel_event=None):
+        """返回 (引擎名称, 译文)；所有引擎都没有结果时返回 (None, None)"""
+        race_done = threading.Event()
+        attempt_cancel = _AnyEvent(race_done, cancel_event)
+        # 按历史表现排序提交，线程池满时表现好的引擎先执行
+        futures = {
+            self.executor.submit(self._attempt, name, text, from_lang, to_lang, attempt_cancel): name
+            for name in self.scoreboard.ranked(engines)
+        }
+        try:
+            for future in as_completed(futures):
+                if attempt_cancel.is_set():
+                    break
+                result = future.result()
+                if result is not None:
+                    return futures[future], result
+        finally:
+            # 取得结果后取消其余请求：未开始的直接取消，进行中的不再重试
+            race_done.set()
+            for future in futures:
+                future.cancel()
+        return None, None
+
+    def _attempt(self, name, text, from_lang, to_lang, cancel_event):
+        """请求单个引擎并记录耗时"""
+        start = time.perf_counter()
+        try:
+            result = self.engine.request_translation(text, from_lang, to_lang, name, cancel_event)
+        except Exception:
+            result = None
+        # 被取消的请求不计入统计，避免惩罚只是慢了一步的引擎
+        if not cancel_event.is_set():
+            self.scoreboard.record(name, (time.perf_counter() - start) * 1000, result is not None)
+        return result
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
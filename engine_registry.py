@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""翻译引擎插件接口和注册表
+
+新增翻译引擎不需要修改 main.py，有两种方式：
+
+1. 在程序目录的 plugins/ 下放一个 .py 文件，定义 register_engines(registry)，
+   在其中调用 registry.register(名称, 引擎类)；
+2. 在已安装的 Python 包中声明 "translation_tool.engines" 入口点，
+   入口点名称为引擎名称，指向引擎类。
+
+引擎类继承 TranslationEngineBase，构造时传入 EngineContext。
+"""
+
+import os
+import sys
+import importlib.util
+import threading
+from importlib import metadata
+
+ENTRY_POINT_GROUP = "translation_tool.engines"
+DEFAULT_PLUGIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plugins")
+
+
+class EngineContext:
+    """引擎共享的资源"""
+
+    def __init__(self, http=None, settings=None, offline_dict=None):
+        # 共享的 HTTP 客户端（http_client.HttpClient）
+        self.http = http
+        self.settings = settings
+        self.offline_dict = offline_dict
+
+
+class TranslationEngineBase:
+    """翻译引擎插件基类
+
+    子类至少实现 translate() 或 translate_stream() 之一；
+    只能在网页中翻译的引擎只需设置 web_url_template。
+    """
+    name = ""
+    # 网页翻译地址，可使用 {lang_from}、{lang_to}、{query} 占位符
+    web_url_template = ""
+    # 引擎能力：streaming 支持逐段返回，local 表示不需要网络，
+    # languages 为支持的语言列表（None 表示不限）
+    capabilities = {"streaming": False, "local": False, "languages": None}
+    # 每秒最多请求次数，None 表示不限制
+    rate_limit = None
+    # 单次请求的最大字符数，None 表示不限制；长文本按此切分后再分段请求
+    max_chars = None
+
+    def __init__(self, context):
+        self.context = context
+
+    def translate(self, text, from_lang="auto", to_lang="zh", cancel_event=None):
+        """返回译文；引擎没有可用的翻译接口或没有结果时返回 None，请求失败时抛出异常"""
+        translated = "".join(self.translate_stream(text, from_lang, to_lang, cancel_event))
+        return translated or None
+
+    def translate_stream(self, text, from_lang="auto", to_lang="zh", cancel_event=None):
+        """逐段产出译文，默认一次性产出 translate() 的结果"""
+        if type(self).translate is TranslationEngineBase.translate:
+            # 子类两个方法都没有实现，视为没有翻译接口
+            return
+        result = self.translate(text, from_lang, to_lang, cancel_event)
+        if result:
+            yield result
+
+    def has_api(self):
+        """引擎是否有可直接调用的翻译接口；只能在网页中翻译的引擎返回 False"""
+        cls = type(self)
+        return cls.translate is not TranslationEngineBase.translate or \
+            cls.translate_stream is not TranslationEngineBase.translate_stream
+
+    def web_url(self, text, from_lang="auto", to_lang="zh", query=""):
+        """网页翻译地址，query 为已编码的文本；不支持网页翻译时返回空字符串"""
+        if not self.web_url_template:
+            return ""
+        return self.web_url_template.format(lang_from=from_lang, lang_to=to_lang, query=query)
+
+    def placeholder(self, text, from_lang="auto", to_lang="zh"):
+        """没有翻译结果时显示的提示"""
+        return '正在翻译中...\n\n请稍候，或点击"打开网页"在浏览器中查看完整翻译。'
+
+    def close(self):
+        """释放引擎占用的资源"""
+
+
+class EngineRegistry:
+    """翻译引擎注册表：登记引擎工厂，首次使用时才创建实例，之后共享同一个实例"""
+
+    def __init__(self, context=None, plugin_dirs=(DEFAULT_PLUGIN_DIR,), entry_point_group=ENTRY_POINT_GROUP):
+        self.context = context or EngineContext()
+        self.plugin_dirs = list(plugin_dirs)
+        self.entry_point_group = entry_point_group
+        # {引擎名称: 引擎类或 factory(context)}，入口点在首次使用时才导入
+        self.factories = {}
+        self.instances = {}
+        self.discovered = False
+        self.lock = threading.RLock()
+
+    def register(self, name, factory):
+        """登记引擎；同名引擎后登记的覆盖先登记的"""
+        with self.lock:
+            self.factories[name] = factory
+            old = self.instances.pop(name, None)
+        if old is not None:
+            old.close()
+
+    def names(self):
+        """所有已登记的引擎名称"""
+        self.discover()
+        with self.lock:
+            return list(self.factories)
+
+    def __contains__(self, name):
+        self.discover()
+        with self.lock:
+            return name in self.factories
+
+    def get(self, name):
+        """获取引擎实例，未登记或创建失败时返回 None"""
+        self.discover()
+        with self.lock:
+            engine = self.instances.get(name)
+            if engine is not None:
+                return engine
+            factory = self.factories.get(name)
+            if factory is None:
+                return None
+            try:
+                if isinstance(factory, metadata.EntryPoint):
+                    factory = factory.load()
+                    self.factories[name] = factory
+                engine = factory(self.context)
+            except Exception as e:
+                print(f"加载翻译引擎 {name} 出错: {str(e)}")
+                return None
+            if not engine.name:
+                engine.name = name
+            self.instances[name] = engine
+            return engine
+
+    def discover(self):
+        """查找插件目录和入口点中的引擎，只执行一次"""
+        with self.lock:
+            if self.discovered:
+                return
+            self.discovered = True
+        for directory in self.plugin_dirs:
+            self.load_plugin_dir(directory)
+        self.load_entry_points()
+
+    def load_plugin_dir(self, directory):
+        if not os.path.isdir(directory):
+            return
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".py") or filename.startswith("_"):
+                continue
+            module_name = f"translation_plugin_{filename[:-3]}"
+            try:
+                spec = importlib.util.spec_from_file_location(module_name, os.path.join(directory, filename))
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
+                module.register_engines(self)
+            except Exception as e:
+                print(f"加载翻译引擎插件 {filename} 出错: {str(e)}")
+
+    def load_entry_points(self):
+        try:
+            entry_points = metadata.entry_points(group=self.entry_point_group)
+        except Exception as e:
+            print(f"读取翻译引擎入口点出错: {str(e)}")
+            return
+        with self.lock:
+            for entry_point in entry_points:
+                # 入口点只登记名称，首次 get() 时才导入模块
+                self.factories.setdefault(entry_point.name, entry_point)
+
+    def close(self):
+        """关闭所有已创建的引擎实例"""
+        with self.lock:
+            instances = list(self.instances.values())
+            self.instances.clear()
+        for engine in instances:
+            try:
+                engine.close()
+            except Exception as e:
+                print(f"关闭翻译引擎出错: {str(e)}")
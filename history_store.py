@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""划词和翻译历史记录
+
+记录保存在 SQLite 中，并用 FTS5 的 trigram 分词建立全文索引，中文和英文都可以按任意
+子串搜索；SQLite 不支持 FTS5 时退回到逐行匹配。收藏的记录不会被自动清理。
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+HistoryEntry = namedtuple("HistoryEntry",
+                          ["id", "created_at", "text", "translation", "engine", "source_app", "favorite"])
+
+_COLUMNS = "id, created_at, text, translation, engine, source_app, favorite"
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS history (
+        id INTEGER PRIMARY KEY,
+        created_at REAL NOT NULL,
+        text TEXT NOT NULL,
+        translation TEXT NOT NULL DEFAULT '',
+        engine TEXT NOT NULL DEFAULT '',
+        source_app TEXT NOT NULL DEFAULT '',
+        favorite INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_history_text ON history (text);
+"""
+
+# 外部内容的全文索引，只保存索引不重复保存文本，由触发器随 history 表增量更新
+_FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+        text, translation, content='history', content_rowid='id', tokenize='trigram'
+    );
+    CREATE TRIGGER IF NOT EXISTS history_ai AFTER INSERT ON history BEGIN
+        INSERT INTO history_fts (rowid, text, translation) VALUES (new.id, new.text, new.translation);
+    END;
+    CREATE TRIGGER IF NOT EXISTS history_ad AFTER DELETE ON history BEGIN
+        INSERT INTO history_fts (history_fts, rowid, text, translation)
+        VALUES ('delete', old.id, old.text, old.translation);
+    END;
+    CREATE TRIGGER IF NOT EXISTS history_au AFTER UPDATE OF text, translation ON history BEGIN
+        INSERT INTO history_fts (history_fts, rowid, text, translation)
+        VALUES ('delete', old.id, old.text, old.translation);
+        INSERT INTO history_fts (rowid, text, translation) VALUES (new.id, new.text, new.translation);
+    END;
+"""
+
+# trigram 分词只能匹配至少 3 个字符的词
+_MIN_FTS_TERM = 3
+
+
+class HistoryStore:
+    """划词和翻译历史，按条数和保存天数自动清理
+
+    写入和查询可在界面线程中调用；清理和整理索引在后台线程中执行，每一步单独持有锁。
+    """
+
+    # 每写入多少条记录执行一次清理
+    COMPACT_EVERY = 500
+
+    def __init__(self, db_path, max_entries=20000, max_age_days=180):
+        self.db_path = db_path
+        self.max_entries = max(1, int(max_entries))
+        self.max_age = max(0, float(max_age_days)) * 86400
+        self.lock = threading.Lock()
+        self.adds_since_compact = 0
+        self.fts = False
+        self.conn = None
+        # 清理和整理索引在后台线程中执行
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history")
+
+        try:
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            # WAL 模式下写入只追加到日志文件，不阻塞读取
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(_SCHEMA)
+            try:
+                self.conn.executescript(_FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.Error as e:
+                print(f"历史记录全文索引不可用，使用逐行搜索: {str(e)}")
+            self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"打开历史记录出错: {str(e)}")
+            self.conn = None
+            return
+        self.executor.submit(self._run_locked, self._purge_locked)
+
+    def add(self, text, source_app=""):
+        """记录一次划词，返回记录编号；与最近一条记录相同时只更新时间"""
+        text = text.strip()
+        if not text:
+            return None
+        with self.lock:
+            if self.conn is None:
+                return None
+            try:
+                row = self.conn.execute("SELECT id, text FROM history ORDER BY id DESC LIMIT 1").fetchone()
+                if row is not None and row[1] == text:
+                    self.conn.execute("UPDATE history SET created_at = ? WHERE id = ?", (time.time(), row[0]))
+                    self.conn.commit()
+                    return row[0]
+                cursor = self.conn.execute(
+                    "INSERT INTO history (created_at, text, source_app) VALUES (?, ?, ?)",
+                    (time.time(), text, source_app or ""))
+                self.conn.commit()
+            except sqlite3.Error as e:
+                print(f"写入历史记录出错: {str(e)}")
+                return None
+            self.adds_since_compact += 1
+            if self.adds_since_compact >= self.COMPACT_EVERY:
+                self.schedule_compact()
+            return cursor.lastrowid
+
+    def set_translation(self, text, translation, engine=""):
+        """为最近一条相同原文的记录保存译文，没有记录时新增一条"""
+        text = text.strip()
+        if not text or not translation:
+            return
+        with self.lock:
+            if self.conn is None:
+                return
+            try:
+                entry_id = self._latest_id_locked(text)
+                if entry_id is None:
+                    self.conn.execute(
+                        "INSERT INTO history (created_at, text, translation, engine) VALUES (?, ?, ?, ?)",
+                        (time.time(), text, translation, engine))
+                else:
+                    self.conn.execute("UPDATE history SET translation = ?, engine = ? WHERE id = ?",
+                                      (translation, engine, entry_id))
+                self.conn.commit()
+            except sqlite3.Error as e:
+                print(f"写入历史记录出错: {str(e)}")
+
+    def set_favorite(self, text, favorite=True, entry_id=None):
+        """收藏或取消收藏记录，未指定 entry_id 时为最近一条相同原文的记录，没有记录时新增一条"""
+        text = text.strip()
+        if not text:
+            return
+        with self.lock:
+            if self.conn is None:
+                return
+            try:
+                if entry_id is None:
+                    entry_id = self._latest_id_locked(text)
+                if entry_id is None:
+                    self.conn.execute("INSERT INTO history (created_at, text, favorite) VALUES (?, ?, ?)",
+                                      (time.time(), text, int(favorite)))
+                else:
+                    self.conn.execute("UPDATE history SET favorite = ? WHERE id = ?", (int(favorite), entry_id))
+                self.conn.commit()
+            except sqlite3.Error as e:
+                print(f"写入历史记录出错: {str(e)}")
+
+    def delete(self, entry_id):
+        """删除一条记录"""
+        with self.lock:
+            if self.conn is None:
+                return
+            try:
+                self.conn.execute("DELETE FROM history WHERE id = ?", (entry_id,))
+                self.conn.commit()
+            except sqlite3.Error as e:
+                print(f"删除历史记录出错: {str(e)}")
+
+    def search(self, query="", limit=200, favorites_only=False):
+        """按原文或译文中的子串搜索，多个词之间为“与”关系，最新的记录在前；query 为空时返回最近的记录"""
+        conditions, params = [], []
+        fts_terms = []
+        for term in query.split():
+            if self.fts and len(term) >= _MIN_FTS_TERM:
+                fts_terms.append('"' + term.replace('"', '""') + '"')
+            else:
+                # 太短的词无法使用 trigram 索引，逐行匹配
+                pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                conditions.append("(text LIKE ? ESCAPE '\\' OR translation LIKE ? ESCAPE '\\')")
+                params += [pattern, pattern]
+        if fts_terms:
+            conditions.append("id IN (SELECT rowid FROM history_fts WHERE history_fts MATCH ?)")
+            params.append(" AND ".join(fts_terms))
+        if favorites_only:
+            conditions.append("favorite = 1")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self.lock:
+            if self.conn is None:
+                return []
+            try:
+                rows = self.conn.execute(
+                    f"SELECT {_COLUMNS} FROM history {where} ORDER BY id DESC LIMIT ?",
+                    params + [limit]).fetchall()
+            except sqlite3.Error as e:
+                print(f"搜索历史记录出错: {str(e)}")
+                return []
+        return [HistoryEntry(*row) for row in rows]
+
+    def count(self):
+        """记录总数"""
+        with self.lock:
+            if self.conn is None:
+                return 0
+            return self.conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def schedule_compact(self):
+        """在后台线程中整理记录，不阻塞调用方"""
+        self.adds_since_compact = 0
+        try:
+            self.executor.submit(self.compact)
+        except RuntimeError:
+            # 已经关闭
+            pass
+
+    def compact(self):
+        """清理过期和超出条数的记录，整理全文索引并回收空间
+
+        每一步单独持有锁，其他线程写入记录时最多等待一步完成。
+        """
+        for step in (self._purge_locked, self._optimize_locked, self._vacuum_locked):
+            if not self._run_locked(step):
+                return
+
+    def clear(self, keep_favorites=True):
+        """清空历史记录，默认保留收藏"""
+        with self.lock:
+            if self.conn is None:
+                return
+            try:
+                self.conn.execute("DELETE FROM history" + (" WHERE favorite = 0" if keep_favorites else ""))
+                self.conn.commit()
+            except sqlite3.Error as e:
+                print(f"清空历史记录出错: {str(e)}")
+                return
+        self.schedule_compact()
+
+    def close(self):
+        """关闭数据库，正在进行的整理在当前一步完成后停止"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def _latest_id_locked(self, text):
+        row = self.conn.execute("SELECT MAX(id) FROM history WHERE text = ?", (text,)).fetchone()
+        return row[0]
+
+    def _purge_locked(self):
+        """删除过期和超出条数的未收藏记录，返回删除的条数（调用方需持有锁）"""
+        deleted = 0
+        if self.max_age:
+            deleted += self.conn.execute("DELETE FROM history WHERE favorite = 0 AND created_at < ?",
+                                         (time.time() - self.max_age,)).rowcount
+        count = self.conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+        if count > self.max_entries:
+            deleted += self.conn.execute("""
+                DELETE FROM history WHERE id IN (
+                    SELECT id FROM history WHERE favorite = 0 ORDER BY id LIMIT ?
+                )
+            """, (count - self.max_entries,)).rowcount
+        self.conn.commit()
+        return deleted
+
+    def _run_locked(self, step):
+        """持有锁执行一步整理，数据库已关闭或出错时返回 False"""
+        with self.lock:
+            if self.conn is None:
+                return False
+            try:
+                step()
+            except sqlite3.Error as e:
+                print(f"整理历史记录出错: {str(e)}")
+                return False
+        return True
+
+    def _optimize_locked(self):
+        """把增量写入产生的多个索引段合并为一个（调用方需持有锁）"""
+        if self.fts:
+            self.conn.execute("INSERT INTO history_fts (history_fts) VALUES ('optimize')")
+            self.conn.commit()
+
+    def _vacuum_locked(self):
+        """空闲页超过四分之一时重建数据库文件，并截断 WAL 日志（调用方需持有锁）"""
+        free_pages = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        total_pages = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        if total_pages and free_pages * 4 > total_pages:
+            self.conn.execute("VACUUM")
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def create_history_store(settings):
+    """根据设置创建历史记录，未启用时返回 None"""
+    if not settings.get("history", "enabled", True):
+        return None
+    db_path = os.path.join(os.path.dirname(settings.settings_file), "history.db")
+    return HistoryStore(
+        db_path,
+        max_entries=settings.get("history", "max_entries", 20000),
+        max_age_days=settings.get("history", "max_age_days", 180),
+    )
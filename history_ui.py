@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit,
+                             QCheckBox, QTableWidget, QTableWidgetItem, QHeaderView, QApplication)
+
+
+class HistoryWindow(QDialog):
+    """历史记录窗口：搜索和浏览划词、翻译记录及收藏"""
+    translate_requested = pyqtSignal(str)
+
+    # 输入停止多久后开始搜索（毫秒）
+    SEARCH_DELAY_MS = 150
+    # 最多显示的记录数
+    MAX_RESULTS = 200
+
+    def __init__(self, history_store, parent=None):
+        super().__init__(parent)
+        self.history_store = history_store
+        self.entries = []
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.refresh)
+        self.setWindowTitle("历史记录")
+        self.setMinimumSize(600, 460)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """设置用户界面"""
+        layout = QVBoxLayout(self)
+
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("搜索原文或译文，多个词用空格分隔")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(lambda: self.search_timer.start(self.SEARCH_DELAY_MS))
+        self.favorites_check = QCheckBox("只看收藏")
+        self.favorites_check.toggled.connect(self.refresh)
+        search_layout.addWidget(self.search_edit)
+        search_layout.addWidget(self.favorites_check)
+        layout.addLayout(search_layout)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["时间", "原文", "译文", "收藏"])
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.table.cellDoubleClicked.connect(lambda row, column: self.translate_selected())
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        buttons_layout = QHBoxLayout()
+        translate_button = QPushButton("翻译")
+        translate_button.clicked.connect(self.translate_selected)
+        copy_button = QPushButton("复制")
+        copy_button.clicked.connect(self.copy_selected)
+        favorite_button = QPushButton("收藏/取消收藏")
+        favorite_button.clicked.connect(self.toggle_favorite)
+        delete_button = QPushButton("删除")
+        delete_button.clicked.connect(self.delete_selected)
+        clear_button = QPushButton("清空历史")
+        clear_button.clicked.connect(self.clear_history)
+        close_button = QPushButton("关闭")
+        close_button.clicked.connect(self.hide)
+        for button in (translate_button, copy_button, favorite_button, delete_button, clear_button):
+            buttons_layout.addWidget(button)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(close_button)
+        layout.addLayout(buttons_layout)
+
+    def showEvent(self, event):
+        """每次显示时刷新记录"""
+        super().showEvent(event)
+        self.refresh()
+        self.search_edit.setFocus()
+
+    def refresh(self):
+        """按当前搜索条件重新查询"""
+        start = time.perf_counter()
+        self.entries = self.history_store.search(self.search_edit.text(), self.MAX_RESULTS,
+                                                 self.favorites_check.isChecked())
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self.table.setRowCount(len(self.entries))
+        for row, entry in enumerate(self.entries):
+            values = [time.strftime("%m-%d %H:%M", time.localtime(entry.created_at)),
+                      entry.text, entry.translation, "★" if entry.favorite else ""]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(" ".join(value.split()))
+                if column in (1, 2):
+                    item.setToolTip(value)
+                if column == 3:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                self.table.setItem(row, column, item)
+
+        self.status_label.setText(
+            f"共 {self.history_store.count()} 条记录，显示 {len(self.entries)} 条，搜索耗时 {elapsed_ms:.1f} 毫秒")
+
+    def selected_entry(self):
+        row = self.table.currentRow()
+        if 0 <= row < len(self.entries):
+            return self.entries[row]
+        return None
+
+    def translate_selected(self):
+        entry = self.selected_entry()
+        if entry is not None:
+            self.translate_requested.emit(entry.text)
+
+    def copy_selected(self):
+        """复制原文，有译文时一并复制"""
+        entry = self.selected_entry()
+        if entry is None:
+            return
+        text = f"{entry.text}\n{entry.translation}" if entry.translation else entry.text
+        QApplication.clipboard().setText(text)
+
+    def toggle_favorite(self):
+        entry = self.selected_entry()
+        if entry is not None:
+            self.history_store.set_favorite(entry.text, not entry.favorite, entry.id)
+            self.refresh()
+
+    def delete_selected(self):
+        entry = self.selected_entry()
+        if entry is not None:
+            self.history_store.delete(entry.id)
+            self.refresh()
+
+    def clear_history(self):
+        """清空未收藏的历史记录"""
+        from PyQt6.QtWidgets import QMessageBox
+        reply = QMessageBox.question(self, "清空历史", "确定要清空历史记录吗？收藏的记录会保留。")
+        if reply == QMessageBox.StandardButton.Yes:
+            self.history_store.clear()
+            self.refresh()
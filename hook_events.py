@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+from collections import deque, namedtuple
+
+from PyQt6.QtCore import Qt, QObject, QTimer, pyqtSignal
+
+# 钩子事件记录：kind 为事件类型，timestamp 为 time.perf_counter() 时间戳，data 为附加数据
+HookEvent = namedtuple("HookEvent", ["kind", "timestamp", "data"])
+
+
+class HookEventQueue(QObject):
+    """键盘/鼠标钩子线程与主线程之间的事件队列
+
+    钩子线程只调用 post() 把事件记录放入队列，不直接操作 Qt 对象；
+    主线程通过排队连接被唤醒后批量取出事件，按类型分发给处理函数。
+    deque 的 append/popleft 本身是线程安全的，无需加锁。
+    """
+    # 通知主线程有新事件，只在队列从空闲变为待处理时发出一次
+    wakeup = pyqtSignal()
+
+    def __init__(self, parent=None, capacity=256, batch_size=32):
+        super().__init__(parent)
+        self.capacity = capacity
+        self.batch_size = batch_size
+        # 队列满时丢弃最早的事件
+        self.events = deque(maxlen=capacity)
+        self.handlers = {}
+        # 可以合并的事件类型：同一批中只保留最后一条
+        self.coalesce_kinds = set()
+        self.wake_pending = False
+
+        self.posted = 0
+        self.dispatched = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+        # 始终排队执行，即使在主线程中 post 也不会在调用处同步分发
+        self.wakeup.connect(self.drain, Qt.ConnectionType.QueuedConnection)
+
+    def register(self, kind, handler, coalesce=False):
+        """注册事件处理函数 handler(event)，在主线程中调用
+
+        coalesce 为 True 时，同一批中的多条该类事件只分发最后一条。
+        """
+        self.handlers[kind] = handler
+        if coalesce:
+            self.coalesce_kinds.add(kind)
+        else:
+            self.coalesce_kinds.discard(kind)
+
+    def post(self, kind, data=None):
+        """放入一条事件，可在任意线程中调用"""
+        if len(self.events) >= self.capacity:
+            self.dropped += 1
+        self.events.append(HookEvent(kind, time.perf_counter(), data))
+        self.posted += 1
+        if not self.wake_pending:
+            self.wake_pending = True
+            self.wakeup.emit()
+
+    def drain(self):
+        """在主线程中批量取出并分发事件"""
+        # 先清除标记，处理期间新到的事件会再次唤醒
+        self.wake_pending = False
+        batch = []
+        # {事件类型: 该类最后一条事件在 batch 中的位置}
+        last_index = {}
+        for _ in range(self.batch_size):
+            if not self.events:
+                break
+            event = self.events.popleft()
+            # 可合并的事件只保留最后一条，例如快速连续的鼠标松开
+            if event.kind in self.coalesce_kinds:
+                if event.kind in last_index:
+                    batch[last_index[event.kind]] = None
+                    self.coalesced += 1
+                last_index[event.kind] = len(batch)
+            batch.append(event)
+
+        for event in batch:
+            handler = self.handlers.get(event.kind) if event else None
+            if handler is None:
+                continue
+            self.dispatched += 1
+            try:
+                handler(event)
+            except Exception as e:
+                print(f"处理钩子事件出错({event.kind}): {str(e)}")
+
+        # 一批处理不完时让出事件循环，稍后继续
+        if self.events and not self.wake_pending:
+            self.wake_pending = True
+            QTimer.singleShot(0, self.drain)
+
+    def stats(self):
+        """获取事件计数"""
+        return {
+            "posted": self.posted,
+            "dispatched": self.dispatched,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "pending": len(self.events),
+        }
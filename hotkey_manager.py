@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+
+import keyboard
+
+
+def normalize_hotkey(combo):
+    """统一快捷键写法：小写并去掉多余空格，例如 "Ctrl + Shift+T" -> "ctrl+shift+t" """
+    if not combo:
+        return ""
+    return "+".join(part.strip() for part in str(combo).lower().split("+"))
+
+
+class HotkeyManager:
+    """全局快捷键注册表：记录每个动作的快捷键和注册句柄，只重新注册变化的快捷键
+
+    快捷键回调在 keyboard 库的钩子线程中执行，每次按键都会经过该钩子，
+    因此回调只调用 post(动作) 把事件交给界面线程，并记录回调耗时。
+    """
+
+    def __init__(self, post, backend=keyboard):
+        self.post = post
+        self.backend = backend
+        # {动作: (快捷键, 注册句柄)}
+        self.bindings = {}
+        # {名称: [调用次数, 累计耗时毫秒, 最大耗时毫秒]}
+        self.latency = {}
+        self.lock = threading.Lock()
+
+    def apply(self, hotkeys):
+        """按 {动作: 快捷键} 更新注册，未变化的快捷键保持不动，返回重新注册的动作"""
+        changed = []
+        for action in [action for action in self.bindings if action not in hotkeys]:
+            self.unbind(action)
+            changed.append(action)
+        for action, combo in hotkeys.items():
+            if self.bind(action, combo):
+                changed.append(action)
+        return changed
+
+    def bind(self, action, combo):
+        """为动作注册快捷键，快捷键未变化时不做任何事；返回是否发生了变化"""
+        combo = normalize_hotkey(combo)
+        current = self.bindings.get(action)
+        if current is not None and current[0] == combo:
+            return False
+        self.unbind(action)
+        if not combo:
+            return current is not None
+        try:
+            handle = self.backend.add_hotkey(combo, self.timed(action, self.post), args=(action,))
+        except Exception as e:
+            print(f"注册快捷键 {combo} 失败: {str(e)}")
+            return current is not None
+        self.bindings[action] = (combo, handle)
+        return True
+
+    def unbind(self, action):
+        binding = self.bindings.pop(action, None)
+        if binding is None:
+            return
+        try:
+            self.backend.remove_hotkey(binding[1])
+        except Exception as e:
+            print(f"移除快捷键 {binding[0]} 失败: {str(e)}")
+
+    def hotkey(self, action):
+        """动作当前注册的快捷键，未注册时返回空字符串"""
+        binding = self.bindings.get(action)
+        return binding[0] if binding else ""
+
+    def timed(self, name, callback):
+        """包装钩子回调，记录每次调用的耗时"""
+        def wrapper(*args):
+            start = time.perf_counter()
+            try:
+                return callback(*args)
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                with self.lock:
+                    record = self.latency.setdefault(name, [0, 0.0, 0.0])
+                    record[0] += 1
+                    record[1] += elapsed_ms
+                    record[2] = max(record[2], elapsed_ms)
+        return wrapper
+
+    def latency_stats(self):
+        """{名称: {"calls": 调用次数, "avg_ms": 平均耗时, "max_ms": 最大耗时}}"""
+        with self.lock:
+            return {name: {"calls": calls, "avg_ms": total / calls if calls else 0.0, "max_ms": peak}
+                    for name, (calls, total, peak) in self.latency.items()}
+
+    def clear(self):
+        """移除所有快捷键"""
+        for action in list(self.bindings):
+            self.unbind(action)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import random
+import threading
+from collections import deque
+
+
+class TranslationError(Exception):
+    """翻译请求失败"""
+
+
+class EngineUnavailableError(TranslationError):
+    """翻译引擎熔断中，暂时不可用"""
+
+
+# 可以重试的HTTP状态码
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """熔断器：连续失败达到阈值后，在冷却时间内直接拒绝请求"""
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """是否允许发起请求；冷却结束后放行一次试探请求"""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # 半开状态：放行一次，失败后重新计时
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+    @property
+    def is_open(self):
+        with self.lock:
+            return self.opened_at is not None
+
+
+class EngineStats:
+    """单个翻译引擎的请求延迟和成功率统计"""
+
+    def __init__(self, window=100):
+        self.latencies = deque(maxlen=window)
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def record(self, latency_ms, ok):
+        with self.lock:
+            self.latencies.append(latency_ms)
+            if ok:
+                self.successes += 1
+            else:
+                self.failures += 1
+
+    def record_retry(self):
+        with self.lock:
+            self.retries += 1
+
+    def record_rejected(self):
+        with self.lock:
+            self.rejected += 1
+
+    def snapshot(self):
+        """获取统计快照"""
+        with self.lock:
+            latencies = sorted(self.latencies)
+            total = self.successes + self.failures
+            return {
+                "requests": total,
+                "successes": self.successes,
+                "failures": self.failures,
+                "retries": self.retries,
+                "rejected": self.rejected,
+                "success_rate": self.successes / total if total else 0.0,
+                "avg_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+                "p50_ms": percentile(latencies, 50),
+                "p95_ms": percentile(latencies, 95),
+            }
+
+
+class RetryBudget:
+    """重试预算：一段时间内的重试次数不超过请求数的一定比例，避免故障时放大请求量"""
+
+    def __init__(self, ratio=0.2, min_retries=3, window=60.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self.requests = deque()
+        self.retries = deque()
+        self.lock = threading.Lock()
+
+    def record_request(self):
+        with self.lock:
+            self._trim(self.requests).append(time.monotonic())
+
+    def try_acquire(self):
+        """申请一次重试机会"""
+        with self.lock:
+            retries = self._trim(self.retries)
+            allowed = max(self.min_retries, int(len(self._trim(self.requests)) * self.ratio))
+            if len(retries) >= allowed:
+                return False
+            retries.append(time.monotonic())
+            return True
+
+    def _trim(self, times):
+        now = time.monotonic()
+        while times and now - times[0] > self.window:
+            times.popleft()
+        return times
+
+
+class HttpClient:
+    """翻译引擎共享的HTTP客户端：连接池复用、超时、带抖动的有限重试和熔断"""
+
+    def __init__(self, pool_size=8, connect_timeout=3.05, read_timeout=5.0, max_retries=2,
+                 backoff=0.2, engine_timeouts=None):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        # 各引擎单独的超时设置 {引擎名称: [连接超时, 读取超时]}
+        self.engine_timeouts = dict(engine_timeouts or {})
+
+        self.pool_size = pool_size
+        # 首次请求时才创建，见 get_session
+        self.session = None
+        # requests 模块，创建会话时导入
+        self.requests = None
+
+        self.breakers = {}
+        self.stats = {}
+        self.retry_budget = RetryBudget()
+        self.lock = threading.Lock()
+
+    def get_session(self):
+        """获取连接池会话；requests 的导入耗时较长，推迟到第一次请求时再导入"""
+        with self.lock:
+            if self.session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+                                      max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self.session = session
+                self.requests = requests
+            return self.session
+
+    def get_timeouts(self, engine):
+        """获取引擎的 (连接超时, 读取超时)"""
+        timeouts = self.engine_timeouts.get(engine)
+        if timeouts:
+            return tuple(timeouts)
+        return (self.connect_timeout, self.read_timeout)
+
+    def get_breaker(self, engine):
+        with self.lock:
+            if engine not in self.breakers:
+                self.breakers[engine] = CircuitBreaker()
+            return self.breakers[engine]
+
+    def get_stats(self, engine):
+        with self.lock:
+            if engine not in self.stats:
+                self.stats[engine] = EngineStats()
+            return self.stats[engine]
+
+    def get(self, engine, url, cancel_event=None, **kwargs):
+        """发起GET请求，失败时按退避策略重试；引擎熔断时抛出 EngineUnavailableError
+
+        cancel_event 被设置后不再重试，退避等待也会立即结束，用于取消已过期的请求。
+        返回时响应体已经读完；需要边下载边处理时在 kwargs 中传入 stream=True。
+        """
+        session = self.get_session()
+        requests = self.requests
+        breaker = self.get_breaker(engine)
+        stats = self.get_stats(engine)
+        if not breaker.allow():
+            stats.record_rejected()
+            raise EngineUnavailableError(f"{engine}连续请求失败，暂时停止使用")
+
+        kwargs.setdefault("timeout", self.get_timeouts(engine))
+        self.retry_budget.record_request()
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = session.get(url, **kwargs)
+                if response.status_code in RETRY_STATUS_CODES:
+                    raise requests.HTTPError(f"HTTP {response.status_code}", response=response)
+                response.raise_for_status()
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                stats.record((time.perf_counter() - start) * 1000, False)
+                retryable = not isinstance(e, requests.HTTPError) or \
+                    e.response is None or e.response.status_code in RETRY_STATUS_CODES
+                if not retryable:
+                    raise TranslationError(str(e)) from e
+                breaker.record_failure()
+                if cancel_event is not None and cancel_event.is_set():
+                    raise TranslationError("请求已取消") from e
+                if attempt >= self.max_retries or breaker.is_open or not self.retry_budget.try_acquire():
+                    raise TranslationError(str(e)) from e
+                attempt += 1
+                stats.record_retry()
+                # 指数退避加全抖动，避免多个请求同时重试
+                delay = random.uniform(0, self.backoff * (2 ** attempt))
+                if cancel_event is None:
+                    time.sleep(delay)
+                elif cancel_event.wait(delay):
+                    raise TranslationError("请求已取消") from e
+                continue
+
+            stats.record((time.perf_counter() - start) * 1000, True)
+            breaker.record_success()
+            return response
+
+    def all_stats(self):
+        """获取所有引擎的统计快照"""
+        with self.lock:
+            engines = list(self.stats.items())
+        return {engine: stats.snapshot() for engine, stats in engines}
+
+    def close(self):
+        """关闭连接池"""
+        if self.session is not None:
+            self.session.close()
+
+
+def percentile(sorted_values, percent):
+    """计算已排序列表的百分位数"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(percent / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def create_http_client(settings):
+    """根据设置创建HTTP客户端"""
+    return HttpClient(
+        connect_timeout=settings.get("translation", "http_connect_timeout", 3.05),
+        read_timeout=settings.get("translation", "http_read_timeout", 5.0),
+        max_retries=settings.get("translation", "http_max_retries", 2),
+        engine_timeouts=settings.get("translation", "engine_timeouts", {}),
+    )
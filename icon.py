@@ -1,32 +1,90 @@
+import os
 import sys
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QIcon, QPixmap, QPainter, QColor, QFont
-from PyQt6.QtCore import Qt, QSize
 
-def create_icon():
-    # 创建一个32x32的图标
-    pixmap = QPixmap(32, 32)
+# 修改图标绘制方式后递增版本号，旧版本的缓存文件会被忽略
+ICON_VERSION = 1
+ICON_SIZE = 32
+ICON_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon_cache")
+
+# 已加载的图标，避免重复读取文件
+_loaded_icons = {}
+
+
+def icon_cache_path(size=ICON_SIZE):
+    """当前版本图标的缓存文件路径"""
+    return os.path.join(ICON_CACHE_DIR, f"icon-v{ICON_VERSION}-{size}.png")
+
+
+def is_cache_current(size=ICON_SIZE):
+    """缓存中是否已有当前版本的图标"""
+    return os.path.exists(icon_cache_path(size))
+
+
+def draw_icon(size=ICON_SIZE):
+    """在当前进程中绘制图标，需要已创建 QGuiApplication"""
+    from PyQt6.QtGui import QPixmap, QPainter, QColor, QFont
+    from PyQt6.QtCore import Qt
+
+    pixmap = QPixmap(size, size)
     pixmap.fill(Qt.GlobalColor.transparent)
-    
+
     painter = QPainter(pixmap)
     painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-    
+
     # 绘制圆形背景
     painter.setBrush(QColor("#2C3E50"))
     painter.setPen(Qt.PenStyle.NoPen)
-    painter.drawEllipse(0, 0, 32, 32)
-    
+    painter.drawEllipse(0, 0, size, size)
+
     # 绘制"T"字母
     painter.setPen(QColor("white"))
-    painter.setFont(QFont("Arial", 16, QFont.Weight.Bold))
-    painter.drawText(8, 24, "T")
-    
+    painter.setFont(QFont("Arial", size // 2, QFont.Weight.Bold))
+    painter.drawText(size // 4, size * 3 // 4, "T")
+
     painter.end()
-    
-    return QIcon(pixmap)
+    return pixmap
+
+
+def save_icon_cache(pixmap, size=ICON_SIZE):
+    """把图标写入缓存，写入失败时不影响使用"""
+    try:
+        os.makedirs(ICON_CACHE_DIR, exist_ok=True)
+        return pixmap.save(icon_cache_path(size))
+    except OSError as e:
+        print(f"保存图标缓存出错: {str(e)}")
+        return False
+
+
+def load_icon(size=ICON_SIZE):
+    """获取应用图标：优先读取缓存，缓存缺失时在当前进程中绘制并写入缓存"""
+    from PyQt6.QtGui import QIcon
+
+    icon = _loaded_icons.get(size)
+    if icon is not None:
+        return icon
+
+    path = icon_cache_path(size)
+    if os.path.exists(path):
+        icon = QIcon(path)
+    else:
+        pixmap = draw_icon(size)
+        save_icon_cache(pixmap, size)
+        icon = QIcon(pixmap)
+    _loaded_icons[size] = icon
+    return icon
+
+
+def create_icon():
+    """兼容旧接口，返回应用图标"""
+    return load_icon()
+
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    icon = create_icon()
-    icon.pixmap(QSize(32, 32)).save("icon.png")
-    sys.exit(0) 
\ No newline at end of file
+    # 启动脚本调用：缓存已是当前版本时直接退出，不导入 Qt
+    if is_cache_current() and "--force" not in sys.argv:
+        sys.exit(0)
+
+    from PyQt6.QtGui import QGuiApplication
+
+    app = QGuiApplication(sys.argv)
+    sys.exit(0 if save_icon_cache(draw_icon()) else 1)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import time
+import threading
+from collections import deque
+
+from http_client import percentile
+
+# 一次划词翻译经过的各个阶段，按通常发生的先后顺序排列
+STAGES = [
+    ("mouse_up", "鼠标松开"),
+    ("hotkey", "按下快捷键"),
+    ("copy_sent", "发送复制按键"),
+    ("clipboard_read", "读取到选中文本"),
+    ("toolbar_shown", "显示工具栏"),
+    ("translate_requested", "请求翻译"),
+    ("window_painted", "翻译窗口绘制"),
+    ("response_received", "收到翻译结果"),
+]
+STAGE_NAMES = dict(STAGES)
+
+
+class LatencyTracer:
+    """记录从鼠标松开到显示翻译结果各阶段的时间戳，保存最近若干次记录"""
+
+    def __init__(self, capacity=200):
+        self.traces = deque(maxlen=capacity)
+        self.current = None
+        self.next_id = 1
+        self.lock = threading.Lock()
+
+    def begin(self, stage, timestamp=None):
+        """开始一次新的记录，stage 为触发阶段（鼠标松开或快捷键）
+
+        timestamp 为触发时的 time.perf_counter() 时间戳，默认为当前时间。
+        """
+        now = time.perf_counter() if timestamp is None else timestamp
+        with self.lock:
+            self.current = {
+                "id": self.next_id,
+                "started_at": time.time(),
+                "start": now,
+                "stages": {stage: 0.0},
+            }
+            self.next_id += 1
+            self.traces.append(self.current)
+
+    def mark(self, stage):
+        """记录当前这次记录到达某个阶段的时间，每个阶段只记录第一次"""
+        now = time.perf_counter()
+        with self.lock:
+            if self.current is None or stage in self.current["stages"]:
+                return
+            self.current["stages"][stage] = (now - self.current["start"]) * 1000
+
+    def snapshot(self):
+        """获取所有记录的副本，每条记录的阶段按发生时间排序"""
+        with self.lock:
+            traces = [(trace["id"], trace["started_at"], dict(trace["stages"])) for trace in self.traces]
+        return [
+            {
+                "id": trace_id,
+                "started_at": started_at,
+                "stages": dict(sorted(stages.items(), key=lambda item: item[1])),
+            }
+            for trace_id, started_at, stages in traces
+        ]
+
+    def stage_percentiles(self):
+        """统计各阶段距离上一个阶段的耗时 {阶段: {"count", "p50_ms", "p95_ms", "max_ms"}}
+
+        "请求翻译" 距上一阶段的耗时包含用户点击按钮前的停留时间。
+        """
+        deltas = {}
+        for trace in self.snapshot():
+            previous = 0.0
+            for stage, offset in trace["stages"].items():
+                if offset:
+                    deltas.setdefault(stage, []).append(offset - previous)
+                previous = offset
+
+        result = {}
+        for stage, _ in STAGES:
+            values = sorted(deltas.get(stage, []))
+            if values:
+                result[stage] = {
+                    "count": len(values),
+                    "p50_ms": percentile(values, 50),
+                    "p95_ms": percentile(values, 95),
+                    "max_ms": values[-1],
+                }
+        return result
+
+    def export_jsonl(self, path):
+        """以每行一条 JSON 记录的格式导出，返回导出的记录数"""
+        traces = self.snapshot()
+        with open(path, "w", encoding="utf-8") as f:
+            for trace in traces:
+                f.write(json.dumps(trace, ensure_ascii=False) + "\n")
+        return len(traces)
+
+    def clear(self):
+        with self.lock:
+            self.traces.clear()
+            self.current = None
+
+
+# 全局延迟记录器
+latency_tracer = LatencyTracer()
@@ -1,121 +1,49 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+# 最先导入启动计时器，以便统计后续模块的导入耗时
+from startup_profile import startup_profiler
+
 import sys
 import os
 import time
 import threading
-import requests
+import urllib.parse
 import pyperclip
 import keyboard
 import mouse
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QPushButton, QLabel, QSystemTrayIcon,
-                           QMenu, QDialog, QTextEdit, QComboBox, QCheckBox)
+                           QMenu, QDialog, QTextEdit, QComboBox, QCheckBox, QProgressBar)
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject, QPoint, QSize
-from PyQt6.QtGui import QIcon, QPixmap, QFont, QAction, QCursor
+from PyQt6.QtGui import QIcon, QPixmap, QFont, QAction, QCursor, QTextCursor
+startup_profiler.mark("导入 PyQt6 等模块")
 
 # 导入设置模块
 from settings import app_settings
+startup_profiler.mark("加载设置")
+from translation_pipeline import TranslationPipeline
+from translation_cache import create_translation_cache
+from clipboard_watcher import ClipboardWatcher
+from selection_source import create_selection_sources
+from translation_engine import TranslationEngine
+from engine_race import FASTEST_ENGINE
+from styles import TOOLBAR_STYLE
+from paint_timing import FirstPaintProbe
+from lang_detect import choose_languages
+from latency_trace import latency_tracer
+from settle_scheduler import SettleScheduler, foreground_app
+from hook_events import HookEventQueue
+from offline_dict import create_offline_dictionary
+from history_store import create_history_store
+from prefetch import SelectionPrefetcher
+from popup_placement import PopupPlacer
+from settings_watcher import SettingsWatcher
+from hotkey_manager import HotkeyManager, normalize_hotkey
+startup_profiler.mark("导入应用模块")
 
-# 导入图标生成模块
-try:
-    from icon import create_icon
-except ImportError:
-    # 创建简单图标的函数
-    def create_icon():
-        """创建一个简单的图标"""
-        from PIL import Image, ImageDraw
-        
-        # 创建一个32x32的RGBA图像（带透明度）
-        icon = Image.new('RGBA', (32, 32), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(icon)
-        
-        # 绘制圆形背景
-        draw.ellipse((2, 2, 30, 30), fill=(66, 133, 244, 255))
-        
-        # 绘制 "T" 字母（白色）
-        draw.text((12, 6), "T", fill=(255, 255, 255, 255))
-        
-        # 保存图标
-        icon_path = os.path.join(os.path.dirname(__file__), "icon.png")
-        icon.save(icon_path)
-        return icon_path
-
-
-class TranslationEngine:
-    """翻译引擎接口类"""
-    
-    def __init__(self):
-        # 支持的翻译引擎及其API配置
-        self.engines = {
-            "百度翻译": {
-                "url": "https://fanyi.baidu.com/#{lang_from}/{lang_to}/{query}",
-                "direct": False  # 默认不直接跳转到网页
-            },
-            "谷歌翻译": {
-                "url": "https://translate.google.com/?sl={lang_from}&tl={lang_to}&text={query}",
-                "direct": False
-            },
-            "有道翻译": {
-                "url": "https://fanyi.youdao.com/",
-                "api_url": "https://fanyi.youdao.com/translate?&doctype=json&type={lang_from}2{lang_to}&i={query}",
-                "direct": False
-            }
-        }
-        self.current_engine = app_settings.get("translation", "default_engine", "百度翻译")
-        
-    def translate(self, text, from_lang="auto", to_lang="zh"):
-        """进行文本翻译"""
-        if not text or text.isspace():
-            return "没有选中文本或文本为空"
-            
-        engine = self.engines.get(self.current_engine)
-        if not engine:
-            return "翻译引擎未配置"
-        
-        # 使用API进行翻译
-        try:
-            if self.current_engine == "有道翻译":
-                api_url = engine["api_url"].format(lang_from=from_lang, lang_to=to_lang, query=text)
-                response = requests.get(api_url)
-                result = response.json()
-                if "translateResult" in result and result["translateResult"]:
-                    return result["translateResult"][0][0]["tgt"]
-            
-            # 如果没有API或API调用失败，返回一个模拟的翻译结果
-            if self.current_engine == "百度翻译":
-                return f"[百度翻译] {text} → {'英文翻译结果' if from_lang == 'zh' else '中文翻译结果'}"
-            elif self.current_engine == "谷歌翻译":
-                return f"[谷歌翻译] {text} → {'英文翻译结果' if from_lang == 'zh' else '中文翻译结果'}"
-            
-            return '正在翻译中...\n\n请稍候，或点击"打开网页"在浏览器中查看完整翻译。'
-            
-        except Exception as e:
-            return f'翻译出错: {str(e)}\n\n您可以点击"打开网页"在浏览器中查看翻译。'
-    
-    def get_translation_url(self, text, from_lang="auto", to_lang="zh"):
-        """获取翻译网页URL"""
-        engine = self.engines.get(self.current_engine)
-        if not engine:
-            return ""
-            
-        # 编码查询参数
-        import urllib.parse
-        query = urllib.parse.quote(text)
-        return engine["url"].format(lang_from=from_lang, lang_to=to_lang, query=query)
-    
-    def get_engines(self):
-        """获取所有支持的翻译引擎名称"""
-        return app_settings.get("translation", "available_engines", list(self.engines.keys()))
-    
-    def set_engine(self, engine_name):
-        """设置当前使用的翻译引擎"""
-        if engine_name in self.engines:
-            self.current_engine = engine_name
-            app_settings.set("translation", "default_engine", engine_name)
-            return True
-        return False
+# 导入图标模块
+from icon import load_icon
 
 
 class ClipboardMonitor(QObject):
@@ -124,22 +52,18 @@ class ClipboardMonitor(QObject):
     
     def __init__(self):
         super().__init__()
-        self.last_text = ""
-        self.timer = QTimer()
-        
-        # 直接设置检查间隔
-        self.timer.timeout.connect(self.check_clipboard)
-        self.timer.start(500)  # 固定500毫秒间隔
-        
-    def check_clipboard(self):
-        """检查剪贴板变化"""
-        try:
-            current_text = pyperclip.paste()
-            if current_text and current_text != self.last_text:
-                self.last_text = current_text
-                self.text_selected.emit(current_text)
-        except Exception as e:
-            print(f"剪贴板检查错误: {str(e)}")
+        # 基于 QClipboard 变化信号，不支持的平台上退化为自适应轮询
+        interval = app_settings.get("clipboard", "check_interval_ms", 500)
+        self.watcher = ClipboardWatcher(self, poll_interval_ms=interval)
+        self.watcher.clipboard_changed.connect(self.text_selected)
+        
+    def reads_per_minute(self):
+        """最近一分钟内的剪贴板读取次数"""
+        return self.watcher.reads_per_minute()
+        
+    def stop(self):
+        """停止监视剪贴板"""
+        self.watcher.stop()
 
 
 class SelectionDetector(QObject):
@@ -147,56 +71,108 @@ class SelectionDetector(QObject):
     text_selected = pyqtSignal(str, QPoint)
     hide_toolbar = pyqtSignal()
     
+    # 设置中的快捷键: (钩子事件, 默认快捷键)
+    HOTKEYS = {
+        "translate": ("translate_hotkey", "ctrl+shift+t"),
+        "copy": ("copy_hotkey", "ctrl+shift+c"),
+        "hide": ("escape_hotkey", "esc"),
+    }
+    
     def __init__(self):
         super().__init__()
         self.last_text = ""
         self.is_selecting = False
         self.check_enabled = True
-        self.last_check_time = time.time()
-        self.min_check_interval = 1.0  # 最小检查间隔，秒
         self.stored_clipboard = ""
         
+        # 鼠标松开后按前台应用学习到的时间等待选区更新，没取到文本时退避重试
+        self.settle_scheduler = SettleScheduler(
+            self,
+            initial_delay_ms=app_settings.get("clipboard", "settle_initial_ms", 100),
+            deadline_ms=app_settings.get("clipboard", "settle_deadline_ms", 800),
+            max_attempts=app_settings.get("clipboard", "settle_max_attempts", 3))
+        self.settle_scheduler.check_requested.connect(self.check_selection)
+        
+        # 选中文本获取策略链（Linux 下优先读取主选区，避免模拟 Ctrl+C）
+        strategy = app_settings.get("clipboard", "selection_strategy", "auto")
+        self.selection_sources = create_selection_sources(strategy)
+        # 最近一次选中文本的来源策略和耗时，以及各策略的累计统计
+        self.last_selection_strategy = ""
+        self.last_selection_ms = 0.0
+        self.selection_stats = {}
+        
         # 在启动时保存剪贴板内容
         try:
             self.stored_clipboard = pyperclip.paste()
         except:
             pass
             
-        # 使用直接定义的热键，避免依赖设置
+        # 钩子回调在键盘/鼠标库的线程中执行，只把事件放入队列，由主线程批量处理
+        self.hook_events = HookEventQueue(self)
+        self.hook_events.register("translate_hotkey", self.on_translate_hotkey)
+        self.hook_events.register("copy_hotkey", self.on_copy_hotkey)
+        self.hook_events.register("escape_hotkey", self.on_escape_hotkey)
+        self.hook_events.register("system_copy", self.on_system_copy)
+        # 快速连续的鼠标事件只处理最后一条
+        self.hook_events.register("mouse_click", self.on_mouse_click, coalesce=True)
+        self.hook_events.register("mouse_up", self.on_mouse_button, coalesce=True)
+        post = self.hook_events.post
+        
+        # 快捷键按设置注册，设置变化时只重新注册变化的快捷键
+        self.hotkeys = HotkeyManager(post)
+        print("注册热键和鼠标事件...")
+        self.apply_hotkeys()
         try:
-            print("注册热键和鼠标事件...")
-            # 热键注册
-            keyboard.add_hotkey("ctrl+shift+t", self.on_translate_hotkey)
-            keyboard.add_hotkey("ctrl+shift+c", self.on_copy_hotkey)
-            keyboard.add_hotkey("esc", self.on_escape_hotkey)
-            
-            # 阻止注册重复的组合键
-            if not hasattr(keyboard, '_hotkeys') or 'ctrl+c' not in str(keyboard._hotkeys):
-                keyboard.add_hotkey("ctrl+c", self.on_system_copy)
-            
             # 鼠标事件注册 - 这里使用库的事件而不是定时器
-            mouse.on_click(self.on_mouse_click)
-            mouse.on_button(self.on_mouse_button, buttons=('left',), types=('up',))
+            mouse.on_click(self.hotkeys.timed("mouse_click", post), args=("mouse_click",))
+            mouse.on_button(self.hotkeys.timed("mouse_up", post), args=("mouse_up",),
+                            buttons=('left',), types=('up',))
             
             print("热键和鼠标事件注册成功")
         except Exception as e:
             print(f"注册热键或鼠标事件失败: {str(e)}")
     
-    def on_mouse_click(self):
+    def hotkey_bindings(self):
+        """从设置读取快捷键，返回 {钩子事件: 快捷键}"""
+        bindings = {event: app_settings.get("hotkeys", key, default)
+                    for key, (event, default) in self.HOTKEYS.items()}
+        # 监听系统复制快捷键，与设置的快捷键相同时不重复注册
+        if "ctrl+c" not in {normalize_hotkey(combo) for combo in bindings.values()}:
+            bindings["system_copy"] = "ctrl+c"
+        return bindings
+    
+    def apply_hotkeys(self, *args):
+        """按设置更新快捷键注册"""
+        changed = self.hotkeys.apply(self.hotkey_bindings())
+        if changed:
+            print(f"已更新快捷键: {', '.join(f'{event}={self.hotkeys.hotkey(event) or None}' for event in changed)}")
+    
+    def hook_stats(self):
+        """钩子事件计数、各钩子回调的耗时和各选中文本获取策略的耗时"""
+        stats = self.hook_events.stats()
+        stats["callbacks"] = self.hotkeys.latency_stats()
+        stats["selection"] = {
+            strategy: {"count": record["count"], "avg_ms": record["total_ms"] / record["count"],
+                       "max_ms": record["max_ms"]}
+            for strategy, record in self.selection_stats.items()
+        }
+        stats["last_selection"] = (self.last_selection_strategy, self.last_selection_ms)
+        return stats
+    
+    def on_mouse_click(self, event=None):
         """处理鼠标点击事件，隐藏工具栏"""
         # 如果点击时没有正在选择文本，则隐藏工具栏
         if not self.is_selecting:
             self.hide_toolbar.emit()
     
     def on_mouse_button(self, event):
-        """处理鼠标按钮事件"""
-        # 鼠标左键释放时检查是否有选中文本
-        if event == mouse.ButtonEvent.up and time.time() - self.last_check_time >= self.min_check_interval:
-            self.last_check_time = time.time()
-            # 延迟一小段时间再检查，确保系统有时间完成选择
-            QTimer.singleShot(100, self.check_selection)
-    
-    def on_system_copy(self):
+        """鼠标左键释放时检查是否有选中文本"""
+        latency_tracer.begin("mouse_up", event.timestamp)
+        # 前台应用名称在主线程中读取，不占用钩子线程
+        # 由调度器等待应用完成选择后再检查，连续的松开事件只检查一次
+        self.settle_scheduler.on_mouse_released(foreground_app())
+    
+    def on_system_copy(self, event=None):
         """系统复制事件的处理器"""
         # 当用户按下Ctrl+C时，我们等待一小段时间然后检查剪贴板变化
         QTimer.singleShot(100, self.check_clipboard_change)
@@ -214,62 +190,77 @@ class SelectionDetector(QObject):
             print(f"检查剪贴板变化错误: {str(e)}")
     
     def check_selection(self):
-        """检查是否有文本被选中，使用单次操作"""
+        """检查是否有文本被选中，按策略链依次尝试"""
         if not self.check_enabled:
+            # 有检查正在进行，由调度器稍后重试
+            self.settle_scheduler.skip()
             return
             
+        # 暂时禁用检查以避免递归
+        self.check_enabled = False
+        self.fetch_selection(0, time.perf_counter())
+    
+    def fetch_selection(self, index, start_time):
+        """使用第 index 个策略获取选中文本"""
+        source = self.selection_sources[index]
         try:
-            # 暂时禁用检查以避免递归
-            self.check_enabled = False
-            
-            # 保存原始剪贴板内容
-            original_text = pyperclip.paste()
-            self.stored_clipboard = original_text
-            
-            # 模拟一次复制操作
-            keyboard.press_and_release('ctrl+c')
-            
-            # 使用QTimer延迟获取剪贴板，而不是阻塞线程
-            QTimer.singleShot(100, lambda: self.finish_check_selection(original_text))
+            source.fetch(lambda text: self.finish_check_selection(text, index, start_time))
         except Exception as e:
-            print(f"开始检查选中文本错误: {str(e)}")
-            self.check_enabled = True
+            print(f"获取选中文本错误({source.name}): {str(e)}")
+            self.finish_check_selection("", index, start_time)
     
-    def finish_check_selection(self, original_text):
+    def finish_check_selection(self, new_text, index, start_time):
         """完成文本选择检查过程"""
         try:
-            # 获取新的剪贴板内容
-            new_text = pyperclip.paste()
+            # 当前策略没有取到文本时尝试下一个策略
+            if not new_text and index + 1 < len(self.selection_sources):
+                self.fetch_selection(index + 1, start_time)
+                return
+            
+            self.record_selection_timing(self.selection_sources[index].name, start_time)
+            if new_text:
+                latency_tracer.mark("clipboard_read")
             
             # 如果有新的文本被选中
-            if new_text and new_text != self.last_text and not new_text.isspace() and new_text != original_text:
+            found = bool(new_text and new_text != self.last_text and not new_text.isspace())
+            if found:
                 self.last_text = new_text
                 cursor_pos = QCursor().pos()
                 self.text_selected.emit(new_text, cursor_pos)
                 self.is_selecting = True
             else:
                 self.is_selecting = False
-                
-            # 如果剪贴板内容被更改，恢复原始内容
-            if original_text != new_text:
-                pyperclip.copy(original_text)
         except Exception as e:
+            found = False
             print(f"完成检查选中文本错误: {str(e)}")
-        finally:
-            # 重新启用检查
-            self.check_enabled = True
+        
+        # 重新启用检查；没取到文本时由调度器退避重试，但不反复模拟 Ctrl+C
+        self.check_enabled = True
+        retry = not any(source.sends_keys for source in self.selection_sources)
+        self.settle_scheduler.report(found, retry=retry)
     
-    def on_translate_hotkey(self):
+    def record_selection_timing(self, strategy, start_time):
+        """记录获取选中文本所用的策略和耗时"""
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        self.last_selection_strategy = strategy
+        self.last_selection_ms = elapsed_ms
+        stats = self.selection_stats.setdefault(strategy, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["count"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+    
+    def on_translate_hotkey(self, event=None):
         """翻译快捷键响应"""
+        latency_tracer.begin("hotkey", event.timestamp if event else None)
         self.check_selection()
     
-    def on_copy_hotkey(self):
+    def on_copy_hotkey(self, event=None):
         """复制快捷键响应"""
         # 暂时标记为正在选择
         self.is_selecting = True
         QTimer.singleShot(300, lambda: setattr(self, 'is_selecting', False))
     
-    def on_escape_hotkey(self):
+    def on_escape_hotkey(self, event=None):
         """ESC快捷键响应，发送空文本信号隐藏工具栏"""
         self.hide_toolbar.emit()
         self.text_selected.emit("", QPoint(0, 0))
@@ -282,9 +273,12 @@ class TranslationToolbar(QWidget):
     explain_requested = pyqtSignal(str)
     copy_requested = pyqtSignal(str)
     color_requested = pyqtSignal(str)
+    favorite_requested = pyqtSignal(str)
+    hidden = pyqtSignal()
     
-    def __init__(self):
+    def __init__(self, popup_placer=None):
         super().__init__()
+        self.popup_placer = popup_placer or PopupPlacer(self)
         self.selected_text = ""
         self.last_pos = QPoint(0, 0)
         self.hide_timer = QTimer(self)
@@ -307,80 +301,46 @@ class TranslationToolbar(QWidget):
         main_layout.setContentsMargins(8, 8, 8, 8)
         main_layout.setSpacing(6)
         
-        # 圆形按钮样式
-        circle_button_style = """
-            QPushButton {
-                background-color: white;
-                border: 1px solid rgba(0, 0, 0, 0.1);
-                border-radius: 16px;
-                padding: 2px;
-                font-size: 14px;
-                color: #333;
-                min-width: 32px;
-                min-height: 32px;
-                max-width: 32px;
-                max-height: 32px;
-                text-align: center;
-            }
-            QPushButton:hover {
-                background-color: #f0f0f0;
-                border: 1px solid rgba(0, 0, 0, 0.2);
-            }
-            QPushButton:pressed {
-                background-color: #e0e0e0;
-            }
-        """
-        
-        # 创建按钮容器
+        # 创建按钮容器，按钮样式通过容器上的共享样式表统一设置
         buttons_widget = QWidget()
-        buttons_widget.setStyleSheet("""
-            background-color: white;
-            border-radius: 20px;
-            border: 1px solid rgba(0, 0, 0, 0.1);
-        """)
+        buttons_widget.setObjectName("toolbarButtons")
+        buttons_widget.setStyleSheet(TOOLBAR_STYLE)
         buttons_layout = QHBoxLayout(buttons_widget)
         buttons_layout.setContentsMargins(10, 5, 10, 5)
         buttons_layout.setSpacing(8)
         
         # AI搜索按钮
         self.ai_search_btn = QPushButton("AI搜索")
-        self.ai_search_btn.setStyleSheet(circle_button_style)
         self.ai_search_btn.setIcon(self.get_icon_for_button("ai"))
         self.ai_search_btn.clicked.connect(self.on_search_clicked)
         
         # 解读按钮
         self.explain_btn = QPushButton("解读")
-        self.explain_btn.setStyleSheet(circle_button_style)
         self.explain_btn.setIcon(self.get_icon_for_button("explain"))
         self.explain_btn.clicked.connect(self.on_explain_clicked)
         
         # 翻译按钮
         self.translate_btn = QPushButton("翻译")
-        self.translate_btn.setStyleSheet(circle_button_style)
         self.translate_btn.setIcon(self.get_icon_for_button("translate"))
         self.translate_btn.clicked.connect(self.on_translate_clicked)
         
         # 润色按钮
         self.color_btn = QPushButton("润色")
-        self.color_btn.setStyleSheet(circle_button_style)
         self.color_btn.setIcon(self.get_icon_for_button("color"))
         self.color_btn.clicked.connect(self.on_color_clicked)
         
         # 复制按钮
         self.copy_btn = QPushButton("复制")
-        self.copy_btn.setStyleSheet(circle_button_style)
         self.copy_btn.setIcon(self.get_icon_for_button("copy"))
         self.copy_btn.clicked.connect(self.on_copy_clicked)
         
         # 发送到手机按钮
         self.send_btn = QPushButton("发送")
-        self.send_btn.setStyleSheet(circle_button_style)
         self.send_btn.setIcon(self.get_icon_for_button("send"))
         self.send_btn.clicked.connect(self.on_send_clicked)
         
         # 收藏按钮
         self.favorite_btn = QPushButton("收藏")
-        self.favorite_btn.setStyleSheet(circle_button_style)
         self.favorite_btn.setIcon(self.get_icon_for_button("favorite"))
         self.favorite_btn.clicked.connect(self.on_favorite_clicked)
         
@@ -395,7 +355,6 @@ class TranslationToolbar(QWidget):
         
         # 添加更多选项按钮
         self.more_btn = QPushButton("...")
-        self.more_btn.setStyleSheet(circle_button_style)
         self.more_btn.clicked.connect(self.on_more_clicked)
         buttons_layout.addWidget(self.more_btn)
         
@@ -415,6 +374,8 @@ class TranslationToolbar(QWidget):
             self.hide()
             return
             
+        if text != self.selected_text:
+            self.favorite_btn.setText("收藏")
         self.selected_text = text
         
         # 如果位置接近上次显示位置，不移动工具栏
@@ -422,12 +383,8 @@ class TranslationToolbar(QWidget):
             # 从设置中获取工具栏位置偏移量
             offset_y = app_settings.get("ui", "toolbar_position_offset_y", 20)
             
-            # 调整窗口位置，确保在屏幕内
-            screen_geometry = QApplication.primaryScreen().geometry()
-            x = min(position.x(), screen_geometry.width() - self.width())
-            y = min(position.y() + offset_y, screen_geometry.height() - self.height())
-            
-            self.move(x, y)
+            # 调整窗口位置，确保在选中文本所在的屏幕内
+            self.popup_placer.place(self, position, offset_y)
             self.last_pos = position
         
         # 如果已经可见，不需要重新显示
@@ -478,9 +435,9 @@ class TranslationToolbar(QWidget):
     
     def on_favorite_clicked(self):
         """处理收藏按钮点击事件"""
-        # 提示功能未实现
-        from PyQt6.QtWidgets import QMessageBox
-        QMessageBox.information(self, "功能提示", "收藏功能尚未实现")
+        if self.selected_text:
+            self.favorite_requested.emit(self.selected_text)
+            self.favorite_btn.setText("已收藏")
     
     def on_more_clicked(self):
         """处理更多按钮点击事件"""
@@ -499,13 +456,20 @@ class TranslationToolbar(QWidget):
         # 启动隐藏计时器
         self.hide_timer.start(2000)  # 2秒后检查是否应该隐藏
         super().leaveEvent(event)
+    
+    def hideEvent(self, event):
+        """工具栏隐藏事件"""
+        super().hideEvent(event)
+        self.hidden.emit()
 
 
 class TranslationWindow(QDialog):
     """翻译结果窗口"""
     
-    def __init__(self):
+    def __init__(self, translation_engine=None):
         super().__init__()
+        # 与托盘应用共享的翻译引擎，用于列出引擎和生成网页翻译地址
+        self.translation_engine = translation_engine
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Tool | Qt.WindowType.WindowStaysOnTopHint)
         self.source_text_content = ""
         self.from_lang = "auto"
@@ -514,7 +478,17 @@ class TranslationWindow(QDialog):
         self.search_url = ""
         self.hide_timer = QTimer(self)
         self.hide_timer.setSingleShot(True)
+        # 测量从点击到窗口首次绘制的耗时
+        self.paint_probe = FirstPaintProbe(self, "翻译窗口")
         self.hide_timer.timeout.connect(self.check_should_hide)
+        
+        # 流式结果缓冲，合并到每帧最多刷新一次
+        self.pending_chunks = []
+        self.stream_started = False
+        self.chunk_timer = QTimer(self)
+        self.chunk_timer.setSingleShot(True)
+        self.chunk_timer.setInterval(16)
+        self.chunk_timer.timeout.connect(self.flush_result_chunks)
         self.initUI()
         
     def initUI(self):
@@ -596,13 +570,35 @@ class TranslationWindow(QDialog):
             }
         """)
         
+        # 长文本分段翻译进度
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setFixedHeight(4)
+        self.progress_bar.setStyleSheet("""
+            QProgressBar {
+                background-color: rgba(0, 0, 0, 0.05);
+                border: none;
+                border-radius: 2px;
+            }
+            QProgressBar::chunk {
+                background-color: #4285F4;
+                border-radius: 2px;
+            }
+        """)
+        self.progress_bar.hide()
+        
         # 翻译引擎选择
         engine_layout = QHBoxLayout()
         
         self.engine_combo = QComboBox()
-        # 从设置中获取可用的翻译引擎
-        engines = app_settings.get("translation", "available_engines", ["百度翻译", "谷歌翻译", "有道翻译"])
+        # 获取可用的翻译引擎，包括插件提供的引擎
+        if self.translation_engine is not None:
+            engines = self.translation_engine.get_engines()
+        else:
+            engines = app_settings.get("translation", "available_engines", ["百度翻译", "谷歌翻译", "有道翻译"])
         self.engine_combo.addItems(engines)
+        # 同时请求所有引擎，使用最先返回的结果
+        self.engine_combo.addItem(FASTEST_ENGINE)
         # 设置默认引擎
         default_engine = app_settings.get("translation", "default_engine", "百度翻译")
         index = self.engine_combo.findText(default_engine)
@@ -660,6 +656,7 @@ class TranslationWindow(QDialog):
         layout.addWidget(self.source_text)
         layout.addWidget(self.result_label)
         layout.addWidget(self.result_text)
+        layout.addWidget(self.progress_bar)
         layout.addLayout(engine_layout)
         layout.addWidget(self.open_web_btn)
         
@@ -683,6 +680,67 @@ class TranslationWindow(QDialog):
         self.from_lang = from_lang
         self.to_lang = to_lang
         
+    def set_pending_translation(self, source_text, from_lang="auto", to_lang="zh"):
+        """显示等待中的翻译状态，结果返回后通过 set_translation_result 填充"""
+        self.set_translation(source_text, "", from_lang, to_lang)
+        self.begin_result_stream("正在翻译...")
+        
+    def begin_result_stream(self, placeholder):
+        """显示占位文本，等待流式结果"""
+        self.chunk_timer.stop()
+        self.pending_chunks = []
+        self.stream_started = False
+        self.progress_bar.hide()
+        self.result_text.setText(placeholder)
+        
+    def set_progress(self, done, total):
+        """显示分段翻译进度，全部完成后隐藏"""
+        if total <= 1 or done >= total:
+            self.progress_bar.hide()
+            return
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        self.progress_bar.show()
+        
+    def append_result_chunk(self, chunk):
+        """追加一段流式结果，实际刷新合并到下一帧"""
+        self.pending_chunks.append(chunk)
+        if not self.chunk_timer.isActive():
+            self.chunk_timer.start()
+            
+    def flush_result_chunks(self):
+        """把缓冲的结果一次性追加到结果框末尾"""
+        self.chunk_timer.stop()
+        if not self.pending_chunks:
+            return
+        if not self.stream_started:
+            # 第一段结果到达时清除占位文本
+            self.stream_started = True
+            self.result_text.clear()
+        text = "".join(self.pending_chunks)
+        self.pending_chunks = []
+        cursor = self.result_text.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+        
+    def set_translation_result(self, translated_text):
+        """填充完整结果；已流式显示的内容只需补齐缓冲"""
+        self.progress_bar.hide()
+        if self.stream_started or self.pending_chunks:
+            self.flush_result_chunks()
+        else:
+            self.result_text.setText(translated_text)
+        
+    def update_engine_stats(self, engine_stats):
+        """在引擎下拉框的提示中显示各引擎的延迟统计"""
+        for index in range(self.engine_combo.count()):
+            stats = engine_stats.get(self.engine_combo.itemText(index))
+            if not stats or not stats["requests"]:
+                continue
+            tooltip = (f"平均 {stats['avg_ms']:.0f} 毫秒，P95 {stats['p95_ms']:.0f} 毫秒，"
+                       f"成功率 {stats['success_rate'] * 100:.0f}%")
+            self.engine_combo.setItemData(index, tooltip, Qt.ItemDataRole.ToolTipRole)
+        
     def on_engine_changed(self, engine_name):
         """处理翻译引擎更改事件"""
         # 保存用户选择的翻译引擎
@@ -708,10 +766,11 @@ class TranslationWindow(QDialog):
         if not self.source_text_content:
             return
             
+        if self.translation_engine is None:
+            return
         engine_name = self.engine_combo.currentText()
-        translation_engine = TranslationEngine()
-        translation_engine.set_engine(engine_name)
-        url = translation_engine.get_translation_url(self.source_text_content, self.from_lang, self.to_lang)
+        url = self.translation_engine.get_translation_url(self.source_text_content, self.from_lang,
+                                                          self.to_lang, engine_name)
         
         if url:
             import webbrowser
@@ -727,7 +786,6 @@ class TranslationWindow(QDialog):
         self.source_text.setText(query)
         
         # 构建搜索URL
-        import urllib.parse
         encoded_query = urllib.parse.quote(query)
         search_engines = app_settings.get("search", "available_search_engines", {
             "百度": "https://www.baidu.com/s?wd={query}",
@@ -805,18 +863,94 @@ class TranslationWindow(QDialog):
 class SystemTrayApp(QMainWindow):
     """系统托盘应用程序"""
     
+    # 启动后延迟创建弹出窗口的时间（毫秒）
+    PREWARM_DELAY_MS = 1000
+    
     def __init__(self):
         super().__init__()
         # 注意：移除了可能会干扰的剪贴板监视器
         # self.clipboard_monitor = ClipboardMonitor()
-        self.selection_detector = SelectionDetector()
-        self.translation_engine = TranslationEngine()
-        self.toolbar = TranslationToolbar()
-        self.translation_window = TranslationWindow()
+        # 钩子、翻译缓存、离线词典和历史记录在托盘图标显示后才创建，见 start_services()
+        self.selection_detector = None
+        self.translation_engine = None
+        self.translation_pipeline = None
+        # 选中短文本后在后台预先翻译，未启用时为 None
+        self.prefetcher = None
+        # 划词和翻译历史，未启用时为 None
+        self.history_store = None
+        # 当前翻译请求的原文和引擎，翻译完成后写入历史记录
+        self.history_request = None
+        self.settings_watcher = None
+        # 弹出窗口定位，缓存各屏幕的可用区域
+        self.popup_placer = PopupPlacer(self)
+        # 工具栏和翻译窗口在首次使用时才创建，先让托盘图标尽快显示
+        self._toolbar = None
+        self._translation_window = None
+        self._history_window = None
         
         self.initUI()
+        self.tray_icon.activated.connect(self.on_tray_icon_activated)
+        
+        # 事件循环开始后再打开磁盘缓存、注册钩子等，不推迟托盘图标的显示
+        QTimer.singleShot(0, self.start_services)
+    
+    def start_services(self):
+        """创建划词检测、翻译引擎和历史记录等后台服务"""
+        self.selection_detector = SelectionDetector()
+        self.translation_engine = TranslationEngine(create_translation_cache(app_settings),
+                                                    offline_dict=create_offline_dictionary(app_settings))
+        self.translation_pipeline = TranslationPipeline(
+            self.translation_engine,
+            chunk_max_chars=app_settings.get("translation", "chunk_max_chars", 500),
+            chunk_concurrency=app_settings.get("translation", "chunk_concurrency", 3))
+        if app_settings.get("translation", "prefetch_enabled", False):
+            self.prefetcher = SelectionPrefetcher(
+                self.translation_engine,
+                max_chars=app_settings.get("translation", "prefetch_max_chars", 200),
+                budget_per_minute=app_settings.get("translation", "prefetch_budget_per_minute", 20))
+        self.history_store = create_history_store(app_settings)
+        self.history_action.setEnabled(self.history_store is not None)
+        self.settings_action.setEnabled(True)
+        self.diagnostics_action.setEnabled(True)
+        
         self.connectSignals()
         
+        # 设置文件或设置项变化时只更新受影响的组件
+        self.settings_watcher = SettingsWatcher(app_settings, self)
+        self.watch_settings()
+        startup_profiler.mark("启动后台服务")
+        
+        # 在空闲时预先创建弹出窗口，避免首次使用时再等待创建
+        QTimer.singleShot(self.PREWARM_DELAY_MS, self.prewarm_windows)
+    
+    @property
+    def toolbar(self):
+        """翻译工具栏，首次访问时创建"""
+        if self._toolbar is None:
+            self._toolbar = TranslationToolbar(self.popup_placer)
+            self._toolbar.translate_requested.connect(self.show_translation)
+            self._toolbar.search_requested.connect(self.show_search_result)
+            self._toolbar.explain_requested.connect(self.show_explanation)
+            self._toolbar.color_requested.connect(self.show_polished)
+            self._toolbar.favorite_requested.connect(self.add_favorite)
+            self._toolbar.hidden.connect(self.cancel_prefetch)
+        return self._toolbar
+    
+    @property
+    def translation_window(self):
+        """翻译结果窗口，首次访问时创建"""
+        if self._translation_window is None:
+            self._translation_window = TranslationWindow(self.translation_engine)
+        return self._translation_window
+    
+    def prewarm_windows(self):
+        """预先创建弹出窗口"""
+        start = time.perf_counter()
+        self.toolbar
+        self.translation_window
+        if startup_profiler.enabled:
+            print(f"预创建弹出窗口耗时: {(time.perf_counter() - start) * 1000:.1f} 毫秒")
+        
     def initUI(self):
         """初始化用户界面"""
         self.setWindowTitle("划词翻译工具")
@@ -831,6 +965,15 @@ class SystemTrayApp(QMainWindow):
         
         self.settings_action = QAction("设置", self)
         self.settings_action.triggered.connect(self.show_settings)
+        self.settings_action.setEnabled(False)
+        
+        self.history_action = QAction("历史记录", self)
+        self.history_action.triggered.connect(self.show_history)
+        self.history_action.setEnabled(False)
+        
+        self.diagnostics_action = QAction("诊断", self)
+        self.diagnostics_action.triggered.connect(self.show_diagnostics)
+        self.diagnostics_action.setEnabled(False)
         
         self.about_action = QAction("关于", self)
         self.about_action.triggered.connect(self.show_about)
@@ -838,7 +981,9 @@ class SystemTrayApp(QMainWindow):
         self.exit_action = QAction("退出", self)
         self.exit_action.triggered.connect(self.close_application)
         
+        tray_menu.addAction(self.history_action)
         tray_menu.addAction(self.settings_action)
+        tray_menu.addAction(self.diagnostics_action)
         tray_menu.addAction(self.about_action)
         tray_menu.addSeparator()
         tray_menu.addAction(self.exit_action)
@@ -856,38 +1001,33 @@ class SystemTrayApp(QMainWindow):
         
     def set_tray_icon(self):
         """设置系统托盘图标"""
-        # 创建一个简单的图标
-        icon_path = os.path.join(os.path.dirname(__file__), "icon.png")
-        
-        # 如果图标不存在，创建一个
-        if not os.path.exists(icon_path):
-            try:
-                icon_path = create_icon()
-            except Exception as e:
-                print(f"创建图标出错: {str(e)}")
-                # 使用默认图标
-                self.tray_icon.setIcon(QIcon.fromTheme("accessories-dictionary"))
-                return
-                
-        # 设置图标
-        self.tray_icon.setIcon(QIcon(icon_path))
+        startup_profiler.mark("创建托盘应用")
+        # 从缓存读取图标，缓存缺失时在当前进程中绘制
+        try:
+            icon = load_icon()
+        except Exception as e:
+            print(f"加载图标出错: {str(e)}")
+            # 使用默认图标
+            icon = QIcon.fromTheme("accessories-dictionary")
+        self.tray_icon.setIcon(icon)
+        startup_profiler.mark("加载托盘图标")
     
     def connectSignals(self):
         """连接信号和槽"""
         # 连接文本选择信号到工具栏显示
-        self.selection_detector.text_selected.connect(self.toolbar.show_at_position)
+        self.selection_detector.text_selected.connect(self.show_toolbar)
+        self.selection_detector.text_selected.connect(self.record_selection)
         
-        # 连接隐藏工具栏信号
-        self.selection_detector.hide_toolbar.connect(self.hide_toolbar)
+        # 选中新文本时取消正在进行的翻译请求
+        self.selection_detector.text_selected.connect(self.translation_pipeline.cancel)
         
-        # 连接翻译和搜索请求信号
-        self.toolbar.translate_requested.connect(self.show_translation)
-        self.toolbar.search_requested.connect(self.show_search_result)
-        self.toolbar.explain_requested.connect(self.show_explanation)
-        self.toolbar.color_requested.connect(self.show_polished)
+        # 连接后台翻译的流式结果和完成信号
+        self.translation_pipeline.translation_chunk.connect(self.on_translation_chunk)
+        self.translation_pipeline.translation_progress.connect(self.on_translation_progress)
+        self.translation_pipeline.translation_finished.connect(self.on_translation_finished)
         
-        # 连接系统托盘图标的事件
-        self.tray_icon.activated.connect(self.on_tray_icon_activated)
+        # 连接隐藏工具栏信号
+        self.selection_detector.hide_toolbar.connect(self.hide_toolbar)
         
     def on_tray_icon_activated(self, reason):
         """处理系统托盘图标激活事件"""
@@ -900,127 +1040,209 @@ class SystemTrayApp(QMainWindow):
                 self.raise_()
                 self.activateWindow()
         
+    def show_toolbar(self, text, position):
+        """在选中文本位置显示工具栏"""
+        self.toolbar.show_at_position(text, position)
+        if self.toolbar.isVisible():
+            latency_tracer.mark("toolbar_shown")
+            if self.prefetcher is not None:
+                from_lang, to_lang = self.choose_translation_languages(text)
+                self.prefetcher.prefetch(text, from_lang, to_lang, self.translation_engine.current_engine)
+    
+    def cancel_prefetch(self):
+        """工具栏隐藏时放弃预取的翻译"""
+        if self.prefetcher is not None:
+            self.prefetcher.cancel()
+    
+    def choose_translation_languages(self, text):
+        """确定源语言和目标语言"""
+        if app_settings.get("translation", "auto_detect_language", True):
+            # 按文字系统检测源语言，中文翻译为英文，其他语言翻译为中文
+            return choose_languages(text, target_lang="zh", fallback_lang="en")
+        # 使用默认语言设置
+        return (app_settings.get("translation", "default_source_lang", "auto"),
+                app_settings.get("translation", "default_target_lang", "zh"))
+        
     def hide_toolbar(self):
         """隐藏工具栏"""
-        self.toolbar.hide()
+        if self._toolbar is not None:
+            self._toolbar.hide()
         
     def show_translation(self, text):
         """显示翻译结果窗口"""
         if not text:
             return
+        
+        latency_tracer.mark("translate_requested")
+        self.translation_window.paint_probe.start()
             
-        # 自动检测源语言
-        if app_settings.get("translation", "auto_detect_language", True):
-            # 简单判断是否为中文
-            is_chinese = any('\u4e00' <= char <= '\u9fff' for char in text)
-            from_lang = "zh" if is_chinese else "en"
-            to_lang = "en" if is_chinese else "zh"
-        else:
-            # 使用默认语言设置
-            from_lang = app_settings.get("translation", "default_source_lang", "auto")
-            to_lang = app_settings.get("translation", "default_target_lang", "zh")
+        from_lang, to_lang = self.choose_translation_languages(text)
         
         # 调用翻译引擎
         engine_name = self.translation_window.engine_combo.currentText()
         self.translation_engine.set_engine(engine_name)
         
-        # 获取翻译结果
-        translation_result = self.translation_engine.translate(text, from_lang, to_lang)
-        
-        # 显示翻译结果在浮动窗口中
-        self.translation_window.set_translation(text, translation_result, from_lang, to_lang)
-        
-        # 定位窗口位置
-        cursor_pos = QCursor().pos()
-        screen_geometry = QApplication.primaryScreen().geometry()
-        window_x = min(cursor_pos.x(), screen_geometry.width() - self.translation_window.width())
-        window_y = min(cursor_pos.y() + 30, screen_geometry.height() - self.translation_window.height())
-        self.translation_window.move(window_x, window_y)
+        # 先显示等待状态，翻译结果在后台线程返回后再填充
+        self.translation_window.set_pending_translation(text, from_lang, to_lang)
+        # 缓存命中时翻译完成信号在 submit() 中同步发出，此时还没有请求编号
+        self.history_request = (None, text, engine_name)
+        # 预取已完成时直接显示结果；仍在进行时，下面的请求会合并到预取请求上
+        prefetched = self.prefetcher.take(text, from_lang, to_lang, engine_name) if self.prefetcher else None
+        if prefetched is not None:
+            self.translation_pipeline.cancel()
+            self.on_translation_finished(None, prefetched)
+        else:
+            request_id = self.translation_pipeline.submit(text, from_lang, to_lang, engine_name=engine_name)
+            if self.history_request is not None:
+                self.history_request = (request_id, text, engine_name)
         
-        self.translation_window.show()
-        self.translation_window.raise_()
+        # 在光标所在屏幕上显示窗口
+        self.popup_placer.show_popup(self.translation_window)
+    
+    def on_translation_chunk(self, request_id, chunk):
+        """后台返回部分结果，追加显示"""
+        self.translation_window.append_result_chunk(chunk)
+        
+    def on_translation_progress(self, request_id, done, total):
+        """长文本分段翻译进度"""
+        self.translation_window.set_progress(done, total)
+        
+    def on_translation_finished(self, request_id, translation_result):
+        """后台翻译完成，显示翻译结果"""
+        latency_tracer.mark("response_received")
+        self.translation_window.set_translation_result(translation_result)
+        self.translation_window.update_engine_stats(self.translation_engine.engine_stats())
+        if self.history_store is not None and self.history_request and \
+                self.history_request[0] in (None, request_id):
+            _, text, engine_name = self.history_request
+            self.history_store.set_translation(text, translation_result, engine_name)
+            self.history_request = None
+    
+    def record_selection(self, text, position):
+        """把选中的文本写入历史记录"""
+        if self.history_store is not None:
+            self.history_store.add(text, self.selection_detector.settle_scheduler.app)
+    
+    def add_favorite(self, text):
+        """收藏选中的文本"""
+        if self.history_store is not None:
+            self.history_store.set_favorite(text)
+    
+    def show_history(self):
+        """显示历史记录窗口"""
+        if self.history_store is None:
+            return
+        if self._history_window is None:
+            from history_ui import HistoryWindow
+            self._history_window = HistoryWindow(self.history_store)
+            self._history_window.translate_requested.connect(self.show_translation)
+        self._history_window.show()
+        self._history_window.raise_()
+        self._history_window.activateWindow()
     
     def show_search_result(self, query):
         """显示搜索结果窗口"""
         if not query:
             return
         
+        self.translation_window.paint_probe.start()
+        
+        # 取消尚未返回的翻译，避免覆盖搜索内容
+        self.translation_pipeline.cancel()
+        
         # 获取默认搜索引擎
         default_engine = app_settings.get("search", "default_search_engine", "百度")
         
         # 设置搜索结果
         self.translation_window.set_search_result(query, default_engine)
         
-        # 定位窗口位置
-        cursor_pos = QCursor().pos()
-        screen_geometry = QApplication.primaryScreen().geometry()
-        window_x = min(cursor_pos.x(), screen_geometry.width() - self.translation_window.width())
-        window_y = min(cursor_pos.y() + 30, screen_geometry.height() - self.translation_window.height())
-        self.translation_window.move(window_x, window_y)
-        
-        self.translation_window.show()
-        self.translation_window.raise_()
+        # 在光标所在屏幕上显示窗口
+        self.popup_placer.show_popup(self.translation_window)
     
     def show_explanation(self, text):
         """显示文本解释窗口"""
         if not text:
             return
-            
+        
+        self.translation_window.paint_probe.start()
+        # 丢弃尚未完成的翻译及尚未刷新的片段，避免其结果覆盖解释内容
+        self.translation_pipeline.cancel()
+        self.translation_window.begin_result_stream("")
+        
         # 设置解释结果
         explanation = f'解释"{text}"\n\n这是一段自动生成的解释内容，用于演示功能。实际应用中可以接入AI解释API。'
         self.translation_window.set_explanation(text, explanation)
         
-        # 定位窗口位置
-        cursor_pos = QCursor().pos()
-        screen_geometry = QApplication.primaryScreen().geometry()
-        window_x = min(cursor_pos.x(), screen_geometry.width() - self.translation_window.width())
-        window_y = min(cursor_pos.y() + 30, screen_geometry.height() - self.translation_window.height())
-        self.translation_window.move(window_x, window_y)
-        
-        self.translation_window.show()
-        self.translation_window.raise_()
+        # 在光标所在屏幕上显示窗口
+        self.popup_placer.show_popup(self.translation_window)
     
     def show_polished(self, text):
         """显示润色结果窗口"""
         if not text:
             return
-            
+        
+        self.translation_window.paint_probe.start()
+        # 丢弃尚未完成的翻译及尚未刷新的片段，避免其结果覆盖润色内容
+        self.translation_pipeline.cancel()
+        self.translation_window.begin_result_stream("")
+        
         # 设置润色结果
         polished = f'润色"{text}"\n\n这是润色后的内容，用于演示功能。实际应用中可以接入AI润色API。'
         self.translation_window.set_polished(text, polished)
         
-        # 定位窗口位置
-        cursor_pos = QCursor().pos()
-        screen_geometry = QApplication.primaryScreen().geometry()
-        window_x = min(cursor_pos.x(), screen_geometry.width() - self.translation_window.width())
-        window_y = min(cursor_pos.y() + 30, screen_geometry.height() - self.translation_window.height())
-        self.translation_window.move(window_x, window_y)
-        
-        self.translation_window.show()
-        self.translation_window.raise_()
+        # 在光标所在屏幕上显示窗口
+        self.popup_placer.show_popup(self.translation_window)
     
     def show_settings(self):
         """显示设置窗口"""
         from settings_ui import SettingsDialog
         settings_dialog = SettingsDialog(self)
-        if settings_dialog.exec():
-            # 如果用户保存了设置，应用一些可以即时生效的设置
-            
-            # 更新工具栏不透明度
-            opacity = app_settings.get("ui", "toolbar_opacity", 0.9)
-            self.toolbar.setWindowOpacity(opacity)
-            
-            # 更新翻译窗口不透明度
-            opacity = app_settings.get("ui", "translation_window_opacity", 0.95)
-            self.translation_window.setWindowOpacity(opacity)
-            
-            # 更新翻译窗口大小
-            size = app_settings.get("ui", "translation_window_size", [400, 350])
-            self.translation_window.resize(size[0], size[1])
-            
-            # 更新翻译引擎
-            engine = app_settings.get("translation", "default_engine", "百度翻译")
-            self.translation_engine.set_engine(engine)
+        # 保存的设置通过设置变化通知即时生效
+        settings_dialog.exec()
+    
+    def watch_settings(self):
+        """注册可以即时生效的设置项"""
+        watch = self.settings_watcher.watch
+        watch("ui", "toolbar_opacity", self.apply_toolbar_opacity)
+        watch("ui", "translation_window_opacity", self.apply_translation_window_opacity)
+        watch("ui", "translation_window_size", self.apply_translation_window_size)
+        watch("translation", "default_engine", self.apply_default_engine)
+        for key in SelectionDetector.HOTKEYS:
+            watch("hotkeys", key, self.selection_detector.apply_hotkeys)
+    
+    def apply_toolbar_opacity(self, opacity):
+        # 尚未创建的窗口在创建时读取设置
+        if self._toolbar is not None and opacity is not None:
+            self._toolbar.setWindowOpacity(opacity)
+    
+    def apply_translation_window_opacity(self, opacity):
+        if self._translation_window is not None and opacity is not None:
+            self._translation_window.setWindowOpacity(opacity)
+    
+    def apply_translation_window_size(self, size):
+        if self._translation_window is not None and size:
+            if (self._translation_window.width(), self._translation_window.height()) != tuple(size):
+                self._translation_window.resize(size[0], size[1])
+    
+    def apply_default_engine(self, engine):
+        if not engine or engine == self.translation_engine.current_engine:
+            return
+        if self.translation_engine.set_engine(engine) and self._translation_window is not None:
+            self._translation_window.engine_combo.setCurrentText(engine)
+    
+    def show_diagnostics(self):
+        """显示各阶段延迟统计"""
+        from diagnostics_ui import DiagnosticsDialog
+        DiagnosticsDialog(self.translation_engine.engine_stats,
+                          self.selection_detector.hook_stats,
+                          self.request_stats, self).exec()
+    
+    def request_stats(self):
+        """翻译请求的合并、限流和预取统计"""
+        stats = self.translation_engine.request_stats()
+        if self.prefetcher is not None:
+            stats["prefetch"] = self.prefetcher.stats()
+        return stats
     
     def show_about(self):
         """显示关于窗口"""
@@ -1036,13 +1258,31 @@ class SystemTrayApp(QMainWindow):
         try:
             # 停止所有线程和监听器
             print("正在关闭应用...")
+            app_settings.flush()
             keyboard.unhook_all()
             mouse.unhook_all()
             
-            # 确保清理所有资源
-            self.selection_detector.check_enabled = False
-            self.toolbar.hide()
-            self.translation_window.close()
+            # 确保清理所有资源，后台服务尚未启动时跳过
+            if self.selection_detector is not None:
+                self.selection_detector.hotkeys.clear()
+                self.selection_detector.check_enabled = False
+                self.selection_detector.settle_scheduler.stop()
+            if self.settings_watcher is not None:
+                self.settings_watcher.stop()
+            if self.translation_pipeline is not None:
+                self.translation_pipeline.shutdown()
+            if self.prefetcher is not None:
+                self.prefetcher.shutdown()
+            if self.translation_engine is not None:
+                self.translation_engine.close()
+            if self.history_store is not None:
+                self.history_store.close()
+            if self._history_window is not None:
+                self._history_window.close()
+            if self._toolbar is not None:
+                self._toolbar.hide()
+            if self._translation_window is not None:
+                self._translation_window.close()
             
             # 关闭应用
             QApplication.quit()
@@ -1067,6 +1307,7 @@ def main():
         # 检查是否已有实例在运行
         app = QApplication(sys.argv)
         app.setQuitOnLastWindowClosed(False)
+        startup_profiler.mark("创建 QApplication")
         
         # 在PyQt6中，高DPI缩放属性名称已更改，这里移除不兼容的属性设置
         # app.setAttribute(Qt.ApplicationAttribute.AA_DisableHighDpiScaling, True)
@@ -1075,16 +1316,10 @@ def main():
         print("创建应用窗口...")
         # 创建并显示应用
         app_window = SystemTrayApp()
+        startup_profiler.mark("显示托盘图标")
         
-        # 设置应用图标
-        icon_path = os.path.join(os.path.dirname(__file__), "icon.png")
-        if os.path.exists(icon_path):
-            print(f"加载图标: {icon_path}")
-            app.setWindowIcon(QIcon(icon_path))
-        else:
-            print("创建默认图标...")
-            icon_path = create_icon()
-            app.setWindowIcon(QIcon(icon_path))
+        # 设置应用图标，与托盘图标共用同一个已加载的图标
+        app.setWindowIcon(app_window.tray_icon.icon())
         
         # 显示一个欢迎消息
         print("显示欢迎消息...")
@@ -1094,6 +1329,13 @@ def main():
             QSystemTrayIcon.MessageIcon.Information,
             3000
         )
+        startup_profiler.mark("显示欢迎消息")
+        
+        # 事件循环开始处理第一个事件时打印启动耗时明细
+        def on_event_loop_started():
+            startup_profiler.mark("进入事件循环")
+            startup_profiler.report()
+        QTimer.singleShot(0, on_event_loop_started)
         
         print("启动应用主循环...")
         # 执行应用
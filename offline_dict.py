@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""本地离线词典
+
+索引文件格式（小端）：
+    文件头     magic(8) 词条数 n(4) 源语言(4) 目标语言(4)
+    键偏移表   (n + 1) 个 uint32，指向键数据区
+    值偏移表   (n + 1) 个 uint32，指向值数据区
+    键数据区   按 UTF-8 字节序排序后依次拼接的词条
+    值数据区   与键一一对应的译文
+
+查询时通过 mmap 只读映射文件，在键偏移表上二分查找，不需要把词典读入内存。
+
+生成索引：
+    python offline_dict.py build dict.txt offline_dict.idx --from en --to zh
+纯文本词典每行一个词条，词条和译文之间用制表符分隔，以 # 开头的行为注释。
+"""
+
+import os
+import re
+import sys
+import mmap
+import array
+import struct
+import argparse
+import threading
+
+# 本地词典在翻译引擎列表中的名称
+LOCAL_DICT_ENGINE = "本地词典"
+
+MAGIC = b"TDICT1\0\0"
+HEADER = struct.Struct("<8sI4s4s")
+OFFSET = struct.Struct("<I")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_key(text):
+    """词条规范化：去掉首尾空白，合并连续空白并转为小写"""
+    return _WHITESPACE.sub(" ", text.strip()).lower()
+
+
+def offset_table(view):
+    """把小端 uint32 偏移表转换为可按下标读取的数组
+
+    小端平台上直接映射为 uint32 数组，不复制数据；大端平台上复制一份并转换字节序。
+    """
+    if sys.byteorder == "little":
+        return view.cast("I")
+    table = array.array("I")
+    table.frombytes(view)
+    view.release()
+    table.byteswap()
+    return memoryview(table)
+
+
+class OfflineDictionary:
+    """通过 mmap 读取的只读词典索引，首次查询时才打开文件"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.mm = None
+        self.count = 0
+        self.from_lang = ""
+        self.to_lang = ""
+        self.key_offsets = None
+        self.value_offsets = None
+        self.keys_start = 0
+        self.values_start = 0
+        self.opened = False
+        self.lock = threading.Lock()
+
+    def open(self):
+        """打开索引文件，文件不存在或格式错误时返回 False"""
+        with self.lock:
+            if self.opened:
+                return self.mm is not None
+            self.opened = True
+            if not os.path.exists(self.path):
+                return False
+            try:
+                self.file = open(self.path, "rb")
+                self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, count, from_lang, to_lang = HEADER.unpack_from(self.mm, 0)
+                if magic != MAGIC:
+                    raise ValueError("不是有效的词典索引文件")
+                self.count = count
+                self.from_lang = from_lang.rstrip(b"\0").decode("ascii")
+                self.to_lang = to_lang.rstrip(b"\0").decode("ascii")
+
+                table_size = (count + 1) * OFFSET.size
+                view = memoryview(self.mm)
+                self.key_offsets = offset_table(view[HEADER.size:HEADER.size + table_size])
+                self.value_offsets = offset_table(view[HEADER.size + table_size:HEADER.size + 2 * table_size])
+                self.keys_start = HEADER.size + 2 * table_size
+                self.values_start = self.keys_start + self.key_offsets[count]
+            except (OSError, ValueError, struct.error) as e:
+                print(f"打开本地词典出错: {str(e)}")
+                self.release()
+                return False
+            return True
+
+    def supports(self, from_lang, to_lang):
+        """词典是否支持该翻译方向，auto 视为匹配"""
+        return (from_lang in ("auto", self.from_lang)) and to_lang == self.to_lang
+
+    def lookup(self, text, from_lang="auto", to_lang="zh"):
+        """查询词条，未找到时返回 None"""
+        if not self.open() or not self.supports(from_lang, to_lang):
+            return None
+        key = normalize_key(text).encode("utf-8")
+        if not key:
+            return None
+
+        # 持有锁查询，避免 close() 在查询过程中关闭映射
+        with self.lock:
+            if self.mm is None:
+                return None
+            mm, key_offsets, keys_start = self.mm, self.key_offsets, self.keys_start
+            low, high = 0, self.count
+            while low < high:
+                mid = (low + high) // 2
+                candidate = mm[keys_start + key_offsets[mid]:keys_start + key_offsets[mid + 1]]
+                if candidate < key:
+                    low = mid + 1
+                elif candidate > key:
+                    high = mid
+                else:
+                    start = self.values_start + self.value_offsets[mid]
+                    end = self.values_start + self.value_offsets[mid + 1]
+                    return mm[start:end].decode("utf-8")
+            return None
+
+    def release(self):
+        # 先释放 memoryview，否则无法关闭 mmap
+        for view in (self.key_offsets, self.value_offsets):
+            if view is not None:
+                view.release()
+        self.key_offsets = self.value_offsets = None
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def close(self):
+        with self.lock:
+            self.release()
+
+
+def read_plain_dictionary(path):
+    """读取纯文本词典，返回 {规范化词条: 译文}；同一词条的多条译文以分号合并"""
+    entries = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line or line.startswith("#") or "\t" not in line:
+                continue
+            word, translation = line.split("\t", 1)
+            key = normalize_key(word)
+            translation = translation.strip()
+            if not key or not translation:
+                continue
+            if key in entries:
+                entries[key] += "；" + translation
+            else:
+                entries[key] = translation
+    return entries
+
+
+def build_index(entries, path, from_lang="en", to_lang="zh"):
+    """把 {词条: 译文} 写成索引文件，返回词条数"""
+    items = sorted((normalize_key(key).encode("utf-8"), value.encode("utf-8"))
+                   for key, value in entries.items())
+
+    key_offsets, value_offsets = [0], [0]
+    for key, value in items:
+        key_offsets.append(key_offsets[-1] + len(key))
+        value_offsets.append(value_offsets[-1] + len(value))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(items), from_lang.encode("ascii"), to_lang.encode("ascii")))
+        f.write(struct.pack(f"<{len(key_offsets)}I", *key_offsets))
+        f.write(struct.pack(f"<{len(value_offsets)}I", *value_offsets))
+        for key, _ in items:
+            f.write(key)
+        for _, value in items:
+            f.write(value)
+    os.replace(tmp_path, path)
+    return len(items)
+
+
+def default_index_path(settings):
+    """索引文件路径：未设置时使用设置文件同目录下的 offline_dict.idx"""
+    path = settings.get("translation", "offline_dict_path", "")
+    return path or os.path.join(os.path.dirname(settings.settings_file), "offline_dict.idx")
+
+
+def create_offline_dictionary(settings):
+    """根据设置创建本地词典，未启用时返回 None"""
+    if not settings.get("translation", "offline_dict_enabled", True):
+        return None
+    return OfflineDictionary(default_index_path(settings))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="本地离线词典工具")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="把纯文本词典转换为索引文件")
+    build.add_argument("source", help="纯文本词典，每行“词条<制表符>译文”")
+    build.add_argument("output", help="输出的索引文件")
+    build.add_argument("--from", dest="from_lang", default="en", help="源语言，默认 en")
+    build.add_argument("--to", dest="to_lang", default="zh", help="目标语言，默认 zh")
+
+    lookup = commands.add_parser("lookup", help="在索引文件中查询词条")
+    lookup.add_argument("index", help="索引文件")
+    lookup.add_argument("words", nargs="+", help="要查询的词条")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        count = build_index(read_plain_dictionary(args.source), args.output, args.from_lang, args.to_lang)
+        print(f"已生成 {args.output}，共 {count} 个词条")
+        return 0
+
+    dictionary = OfflineDictionary(args.index)
+    if not dictionary.open():
+        print(f"无法打开词典索引: {args.index}")
+        return 1
+    for word in args.words:
+        print(f"{word}\t{dictionary.lookup(word, dictionary.from_lang, dictionary.to_lang)}")
+    dictionary.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
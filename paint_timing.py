@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+
+from PyQt6.QtCore import QObject, QEvent
+
+from latency_trace import latency_tracer
+
+
+class FirstPaintProbe(QObject):
+    """测量从用户点击到窗口首次绘制的耗时，记录到延迟记录器的“翻译窗口绘制”阶段"""
+
+    def __init__(self, widget, label=""):
+        super().__init__(widget)
+        self.label = label
+        self.started_at = None
+        widget.installEventFilter(self)
+
+    def start(self):
+        """在用户点击时调用，开始计时"""
+        self.started_at = time.perf_counter()
+
+    def eventFilter(self, obj, event):
+        if self.started_at is not None and event.type() == QEvent.Type.Paint:
+            self.started_at = None
+            latency_tracer.mark("window_painted")
+        return False
@@ -0,0 +1,22 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""翻译引擎插件示例
+
+去掉文件名开头的下划线即可加载（以下划线开头的文件会被忽略）。
+"""
+
+from engine_registry import TranslationEngineBase
+
+
+class UpperCaseEngine(TranslationEngineBase):
+    """把文本转为大写的演示引擎"""
+    name = "示例引擎"
+    capabilities = {"streaming": False, "local": True, "languages": None}
+
+    def translate(self, text, from_lang="auto", to_lang="zh", cancel_event=None):
+        return text.upper()
+
+
+def register_engines(registry):
+    registry.register(UpperCaseEngine.name, UpperCaseEngine)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from PyQt6.QtCore import QObject, QPoint
+from PyQt6.QtGui import QGuiApplication, QCursor
+
+
+class PopupPlacer(QObject):
+    """弹出窗口定位：放在光标所在屏幕的可用区域内
+
+    各屏幕的可用区域在创建时读取并缓存，屏幕增减或分辨率、任务栏变化时才刷新，
+    显示窗口时不再查询屏幕。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.app = QGuiApplication.instance()
+        # 各屏幕的可用区域，主屏幕在最前
+        self.geometries = []
+        self.app.screenAdded.connect(self.on_screen_added)
+        self.app.screenRemoved.connect(self.refresh)
+        self.app.primaryScreenChanged.connect(self.refresh)
+        for screen in self.app.screens():
+            self.watch(screen)
+        self.refresh()
+
+    def watch(self, screen):
+        screen.geometryChanged.connect(self.refresh)
+        screen.availableGeometryChanged.connect(self.refresh)
+
+    def on_screen_added(self, screen):
+        self.watch(screen)
+        self.refresh()
+
+    def refresh(self, *args):
+        """重新读取各屏幕的可用区域"""
+        primary = self.app.primaryScreen()
+        screens = sorted(self.app.screens(), key=lambda screen: screen is not primary)
+        self.geometries = [screen.availableGeometry() for screen in screens]
+
+    def screen_geometry_at(self, point):
+        """包含 point 的屏幕可用区域；point 不在任何屏幕上时使用最近的屏幕"""
+        for rect in self.geometries:
+            if rect.contains(point):
+                return rect
+        if not self.geometries:
+            return None
+
+        def distance(rect):
+            dx = max(rect.left() - point.x(), 0, point.x() - rect.right())
+            dy = max(rect.top() - point.y(), 0, point.y() - rect.bottom())
+            return dx * dx + dy * dy
+        return min(self.geometries, key=distance)
+
+    def place(self, widget, anchor=None, offset_y=30):
+        """把窗口放在 anchor（默认为光标位置）下方 offset_y 处，下方空间不足时放在上方"""
+        if anchor is None:
+            anchor = QCursor.pos()
+        rect = self.screen_geometry_at(anchor)
+        if rect is None:
+            widget.move(anchor.x(), anchor.y() + offset_y)
+            return
+
+        width, height = widget.width(), widget.height()
+        x = min(max(anchor.x(), rect.left()), rect.right() + 1 - width)
+        y = anchor.y() + offset_y
+        if y + height > rect.bottom() + 1:
+            y = anchor.y() - offset_y - height
+        y = min(max(y, rect.top()), rect.bottom() + 1 - height)
+        widget.move(QPoint(max(x, rect.left()), max(y, rect.top())))
+
+    def show_popup(self, widget, anchor=None, offset_y=30):
+        """定位并显示窗口"""
+        self.place(widget, anchor, offset_y)
+        widget.show()
+        widget.raise_()
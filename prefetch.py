@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from engine_race import FASTEST_ENGINE
+from request_control import TokenBucket
+
+
+class SelectionPrefetcher:
+    """选中文本后在后台预先翻译，用户点击“翻译”时直接使用结果
+
+    同一时间只保留一个预取请求，新的选区或工具栏隐藏时取消旧的请求。
+    预取请求受每分钟预算限制，超出预算时不预取。
+    """
+
+    def __init__(self, translation_engine, max_chars=200, budget_per_minute=20):
+        self.engine = translation_engine
+        self.max_chars = max_chars
+        self.budget = TokenBucket(budget_per_minute / 60.0, max(1, budget_per_minute // 4)) \
+            if budget_per_minute > 0 else None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        # 当前预取请求：(原文, 源语言, 目标语言, 引擎)、future 和取消事件
+        self.key = None
+        self.future = None
+        self.cancel_event = threading.Event()
+        # 预取请求已被正式的翻译请求接管，隐藏工具栏时不再取消
+        self.claimed = False
+        self.started = 0
+        self.hits = 0
+        self.joined = 0
+        self.cancelled = 0
+        self.skipped = 0
+
+    def prefetch(self, text, from_lang, to_lang, engine_name):
+        """开始预取，返回是否发出了请求"""
+        self.cancel()
+        if not text or text.isspace() or len(text) > self.max_chars or engine_name == FASTEST_ENGINE:
+            return False
+        engine = self.engine.registry.get(engine_name)
+        # 本地引擎不需要预取，只能在网页中翻译的引擎没有结果可取
+        if engine is None or engine.capabilities.get("local", False) or not engine.has_api():
+            return False
+        # 缓存或本地词典中已有结果时不需要预取
+        if self.engine.lookup_cached(text, from_lang, to_lang, engine_name, memory_only=True) is not None or \
+                self.engine.lookup_local(text, from_lang, to_lang) is not None:
+            return False
+        if self.budget is not None and not self.budget.try_acquire():
+            self.skipped += 1
+            return False
+
+        self.key = (text, from_lang, to_lang, engine_name)
+        self.cancel_event = threading.Event()
+        self.claimed = False
+        self.future = self.executor.submit(self.engine.request_translation, text, from_lang, to_lang,
+                                           engine_name, self.cancel_event)
+        self.started += 1
+        return True
+
+    def take(self, text, from_lang, to_lang, engine_name):
+        """取出已完成的预取结果，没有可用结果时返回 None
+
+        预取请求仍在进行时返回 None，并保留该请求：随后相同的翻译请求会合并到它上面。
+        """
+        if self.future is None or self.key != (text, from_lang, to_lang, engine_name):
+            return None
+        if not self.future.done():
+            self.claimed = True
+            self.joined += 1
+            return None
+        future, self.future, self.key = self.future, None, None
+        try:
+            result = future.result()
+        except Exception:
+            return None
+        if result is not None:
+            self.hits += 1
+        return result
+
+    def cancel(self):
+        """放弃当前的预取请求"""
+        if self.future is None:
+            return
+        if not self.claimed:
+            if not self.future.done():
+                self.cancel_event.set()
+            self.cancelled += 1
+        self.future = None
+        self.key = None
+
+    def stats(self):
+        return {"started": self.started, "hits": self.hits, "joined": self.joined,
+                "cancelled": self.cancelled, "skipped": self.skipped}
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
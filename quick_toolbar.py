@@ -7,50 +7,52 @@ import mouse
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                            QPushButton, QLabel, QHBoxLayout, QMenu, QSystemTrayIcon,
                            QScrollArea)
-from PyQt6.QtCore import Qt, QPoint, QTimer, QPropertyAnimation, QEasingCurve
-from PyQt6.QtGui import QIcon, QAction, QFont, QColor, QPainter, QPainterPath
+from PyQt6.QtCore import Qt, QPoint, QPropertyAnimation, QEasingCurve
+from PyQt6.QtGui import QAction, QFont, QColor, QPainter, QPainterPath
 from translate import Translator
+from clipboard_watcher import ClipboardWatcher
+from paint_timing import FirstPaintProbe
+from icon import load_icon
+from styles import QUICK_TOOLBAR_STYLE, QUICK_TRANSLATION_STYLE
 
 class TranslationWindow(QWidget):
-    def __init__(self, parent=None, text="", translation=""):
+    """翻译结果弹窗，只创建一次，之后原地更新内容"""
+    
+    def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.initUI(text, translation)
+        self.initUI()
         
-    def initUI(self, text, translation):
+        # 预热：提前完成样式解析和原生窗口创建，首次显示时无需再做
+        self.ensurePolished()
+        self.winId()
+        
+    def initUI(self):
         self.setFixedSize(300, 120)  # 更小的窗口尺寸
         
-        # 创建主容器
+        # 创建主容器，样式表只在容器上设置一次
         container = QWidget()
-        container.setStyleSheet("""
-            QWidget {
-                background-color: white;
-                border-radius: 8px;
-                border: 1px solid #E0E0E0;
-            }
-        """)
+        container.setObjectName("translationContainer")
+        container.setStyleSheet(QUICK_TRANSLATION_STYLE)
         
         layout = QVBoxLayout(container)
         layout.setContentsMargins(12, 12, 12, 12)
         layout.setSpacing(8)
         
         # 翻译结果
-        translation_text = QLabel(translation)
-        translation_text.setWordWrap(True)
-        translation_text.setStyleSheet("""
-            QLabel {
-                color: #333;
-                font-size: 14px;
-                line-height: 1.5;
-            }
-        """)
-        layout.addWidget(translation_text)
+        self.translation_text = QLabel()
+        self.translation_text.setWordWrap(True)
+        layout.addWidget(self.translation_text)
         
         # 设置主布局
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.addWidget(container)
+        
+    def set_translation(self, translation):
+        """原地更新翻译内容"""
+        self.translation_text.setText(translation)
 
 class QuickToolbar(QMainWindow):
     def __init__(self):
@@ -65,18 +67,20 @@ class QuickToolbar(QMainWindow):
         self.is_visible = False
         self.is_dragging = False
         self.drag_start_pos = None
-        self.translation_window = None
         
         # 初始化UI
         self.initUI()
         
+        # 翻译弹窗只创建一次，之后复用
+        self.translation_window = TranslationWindow(self)
+        self.paint_probe = FirstPaintProbe(self.translation_window, "翻译弹窗")
+        
         # 创建系统托盘图标
         self.setup_tray_icon()
         
-        # 初始化鼠标定时器
-        self.mouse_timer = QTimer(self)
-        self.mouse_timer.timeout.connect(self.check_clipboard)
-        self.mouse_timer.start(500)  # 每500毫秒检查一次
+        # 监听剪贴板变化（不支持变化信号的平台上自动退化为自适应轮询）
+        self.clipboard_watcher = ClipboardWatcher(self)
+        self.clipboard_watcher.clipboard_changed.connect(self.check_clipboard)
         
         # 监听鼠标事件
         mouse.on_click(self.on_mouse_click)
@@ -84,9 +88,6 @@ class QuickToolbar(QMainWindow):
         # 初始隐藏窗口
         self.hide()
         
-        # 保存上一次剪贴板内容
-        self.last_clipboard = ""
-        
     def initUI(self):
         self.setFixedSize(180, 36)  # 更小的窗口尺寸
         
@@ -117,47 +118,25 @@ class QuickToolbar(QMainWindow):
         self.copy_btn.clicked.connect(self.copy_text)
         layout.addWidget(self.copy_btn)
         
-        # 设置按钮样式
-        button_style = """
-            QPushButton {
-                background-color: #2C3E50;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                font-size: 12px;
-                padding: 4px;
-            }
-            QPushButton:hover {
-                background-color: #34495E;
-            }
-            QPushButton:pressed {
-                background-color: #1A252F;
-            }
-        """
-        self.translate_btn.setStyleSheet(button_style)
-        self.search_btn.setStyleSheet(button_style)
-        self.copy_btn.setStyleSheet(button_style)
-        
-        # 设置窗口样式
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #2C3E50;
-                border-radius: 4px;
-                border: 1px solid #34495E;
-            }
-        """)
+        # 设置窗口和按钮样式，整个窗口只解析一次样式表
+        self.setStyleSheet(QUICK_TOOLBAR_STYLE)
         
     def setup_tray_icon(self):
         self.tray_icon = QSystemTrayIcon(self)
-        self.tray_icon.setIcon(QIcon("icon.png"))
+        self.tray_icon.setIcon(load_icon())
         
         # 创建托盘菜单
         tray_menu = QMenu()
+        # 剪贴板读取频率，打开菜单时刷新
+        self.clipboard_rate_action = QAction(self)
+        self.clipboard_rate_action.setEnabled(False)
+        tray_menu.aboutToShow.connect(self.update_clipboard_rate)
         show_action = QAction("显示", self)
         show_action.triggered.connect(self.show)
         quit_action = QAction("退出", self)
         quit_action.triggered.connect(self.close)
         
+        tray_menu.addAction(self.clipboard_rate_action)
         tray_menu.addAction(show_action)
         tray_menu.addSeparator()
         tray_menu.addAction(quit_action)
@@ -165,15 +144,14 @@ class QuickToolbar(QMainWindow):
         self.tray_icon.setContextMenu(tray_menu)
         self.tray_icon.show()
     
-    def check_clipboard(self):
+    def update_clipboard_rate(self):
+        """在托盘菜单中显示最近一分钟的剪贴板读取次数"""
+        self.clipboard_rate_action.setText(f"剪贴板读取: {self.clipboard_watcher.reads_per_minute()} 次/分钟")
+    
+    def check_clipboard(self, current_clipboard):
         try:
-            # 获取当前剪贴板内容
-            current_clipboard = pyperclip.paste()
-            
-            # 如果剪贴板内容变化且不为空
-            if current_clipboard and current_clipboard != self.last_clipboard:
-                self.last_clipboard = current_clipboard
-                
+            # 剪贴板内容变化且不为空时才会收到通知
+            if current_clipboard:
                 # 检查是否是用户选中的文本
                 if keyboard.is_pressed('ctrl') or keyboard.is_pressed('shift'):
                     self.selected_text = current_clipboard
@@ -190,6 +168,8 @@ class QuickToolbar(QMainWindow):
             print(f"Error checking clipboard: {str(e)}")
         
     def on_mouse_click(self, event):
+        # 用户有操作，剪贴板轮询恢复初始间隔
+        self.clipboard_watcher.notify_activity()
         try:
             # 获取鼠标位置
             x, y = event.x, event.y
@@ -211,7 +191,7 @@ class QuickToolbar(QMainWindow):
             else:
                 # 检查点击是否在工具栏外部
                 if self.is_visible and not self.geometry().contains(QPoint(x, y)):
-                    if self.translation_window and not self.translation_window.geometry().contains(QPoint(x, y)):
+                    if not self.translation_window.geometry().contains(QPoint(x, y)):
                         self.hide()  # 如果点击在工具栏和翻译窗口外部，隐藏工具栏
                         print("Toolbar hidden (clicked outside).")  # Debug
                 
@@ -247,15 +227,15 @@ class QuickToolbar(QMainWindow):
             return
             
         try:
+            # 开始测量点击到翻译弹窗首次绘制的耗时
+            self.paint_probe.start()
+            
             # 翻译文本
             translation = self.translator.translate(self.selected_text)
             print(f"Translation result: {translation}")  # Debug
             
-            # 创建翻译结果窗口
-            if self.translation_window:
-                self.translation_window.close()
-                
-            self.translation_window = TranslationWindow(self, self.selected_text, translation)
+            # 复用翻译结果窗口，原地更新内容
+            self.translation_window.set_translation(translation)
             self.translation_window.move(self.x(), self.y() + self.height() + 5)
             self.translation_window.show()
             
@@ -298,13 +278,12 @@ class QuickToolbar(QMainWindow):
             
     def hide(self):
         self.is_visible = False
-        if self.translation_window:
-            self.translation_window.close()
+        self.translation_window.hide()
         super().hide()
         print("Toolbar hidden.")  # Debug
         
     def closeEvent(self, event):
-        self.mouse_timer.stop()
+        self.clipboard_watcher.stop()
         event.accept()
         print("Application closed.")  # Debug
 
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+
+
+class Flight:
+    """一次正在进行的请求，其他相同请求等待它的结果"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        # 执行请求的调用方在得到结果前放弃了请求，等待者需要重新发起
+        self.abandoned = False
+
+    def set_result(self, result):
+        self.result = result
+        self.done.set()
+
+    def set_error(self, error):
+        self.error = error
+        self.done.set()
+
+    def abandon(self):
+        self.abandoned = True
+        self.done.set()
+
+    def wait(self, cancel_event=None, poll_interval=0.05):
+        """等待结果；请求失败时抛出相同的异常，cancel_event 被设置或请求被放弃时返回 None"""
+        while not self.done.wait(poll_interval):
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """合并相同的并发请求：同一时间相同的请求只有一个真正执行，其余等待共享结果"""
+
+    def __init__(self):
+        self.flights = {}
+        self.requests = 0
+        self.coalesced = 0
+        self.lock = threading.Lock()
+
+    def join(self, key):
+        """返回 (是否由调用方执行请求, Flight)；调用方执行完成后必须调用 leave(key, flight)"""
+        with self.lock:
+            self.requests += 1
+            flight = self.flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return False, flight
+            flight = self.flights[key] = Flight()
+            return True, flight
+
+    def leave(self, key, flight=None):
+        with self.lock:
+            # 请求被放弃后可能已有新的调用方接替，不能移除它的 Flight
+            if flight is None or self.flights.get(key) is flight:
+                self.flights.pop(key, None)
+
+    def abandon(self, key, flight):
+        """执行请求的调用方在得到结果前放弃，等待同一结果的调用方中的一个接替执行"""
+        self.leave(key, flight)
+        flight.abandon()
+
+    def stats(self):
+        with self.lock:
+            return {"requests": self.requests, "coalesced": self.coalesced, "in_flight": len(self.flights)}
+
+
+class TokenBucket:
+    """令牌桶：每秒补充 rate 个令牌，最多积累 burst 个"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst else max(1.0, self.rate))
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+        self.throttled = 0
+        self.wait_ms = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """取一个令牌，返回需要等待的秒数；令牌不足时预支，等待结束后即可发出请求"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            delay = -self.tokens / self.rate
+            self.throttled += 1
+            self.wait_ms += delay * 1000
+            return delay
+
+    def try_acquire(self):
+        """有令牌时取走一个并返回 True，否则不等待直接返回 False"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens < 1:
+                self.throttled += 1
+                return False
+            self.tokens -= 1
+            return True
+
+    def acquire(self, cancel_event=None):
+        """等待取得令牌，cancel_event 被设置时返回 False"""
+        delay = self.reserve()
+        if delay <= 0:
+            return True
+        if cancel_event is None:
+            time.sleep(delay)
+            return True
+        deadline = time.monotonic() + delay
+        while time.monotonic() < deadline:
+            if cancel_event.is_set():
+                # 退还预支的令牌
+                with self.lock:
+                    self.tokens = min(self.burst, self.tokens + 1)
+                return False
+            time.sleep(min(0.05, max(0.0, deadline - time.monotonic())))
+        return True
+
+
+class RateLimiter:
+    """按引擎限制请求频率
+
+    limits 为 {引擎名称: [每秒请求数, 突发请求数]}，没有设置的引擎使用引擎自身声明的
+    rate_limit，两者都没有时不限制。
+    """
+
+    def __init__(self, limits=None):
+        self.limits = dict(limits or {})
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def get_bucket(self, engine_name, default_rate=None):
+        with self.lock:
+            if engine_name not in self.buckets:
+                limit = self.limits.get(engine_name)
+                if limit:
+                    rate, burst = (list(limit) + [None])[:2]
+                else:
+                    rate, burst = default_rate, None
+                self.buckets[engine_name] = TokenBucket(rate, burst) if rate else None
+            return self.buckets[engine_name]
+
+    def acquire(self, engine_name, default_rate=None, cancel_event=None):
+        """等待引擎的请求配额，cancel_event 被设置时返回 False"""
+        bucket = self.get_bucket(engine_name, default_rate)
+        return bucket is None or bucket.acquire(cancel_event)
+
+    def stats(self):
+        """{引擎名称: {"throttled": 被限流次数, "wait_ms": 累计等待毫秒}}"""
+        with self.lock:
+            buckets = [(name, bucket) for name, bucket in self.buckets.items() if bucket is not None]
+        return {name: {"throttled": bucket.throttled, "wait_ms": bucket.wait_ms} for name, bucket in buckets}
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import keyboard
+import pyperclip
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QClipboard, QGuiApplication
+
+from latency_trace import latency_tracer
+
+
+class SelectionSource:
+    """选中文本获取策略基类"""
+    name = ""
+    # 获取时是否会模拟按键，这类策略没取到文本时不应反复重试
+    sends_keys = False
+
+    def is_available(self):
+        """当前平台是否支持该策略"""
+        return True
+
+    def fetch(self, callback):
+        """获取选中文本，完成后调用 callback(text)，没有选中文本时传入空字符串
+
+        子类覆盖此方法；默认视为没有选中文本。
+        """
+        callback("")
+
+
+class PrimarySelectionSource(SelectionSource):
+    """读取 X11 主选区（PRIMARY），无需模拟按键也不会修改剪贴板"""
+    name = "primary"
+
+    def is_available(self):
+        return QGuiApplication.clipboard().supportsSelection()
+
+    def fetch(self, callback):
+        callback(QGuiApplication.clipboard().text(QClipboard.Mode.Selection))
+
+
+class CopySelectionSource(SelectionSource):
+    """模拟 Ctrl+C 复制选中文本，读取后恢复原剪贴板内容"""
+    name = "copy"
+    sends_keys = True
+
+    def __init__(self, delay_ms=100):
+        self.delay_ms = delay_ms
+
+    def fetch(self, callback):
+        # 保存原始剪贴板内容
+        original_text = pyperclip.paste()
+
+        # 模拟一次复制操作
+        keyboard.press_and_release('ctrl+c')
+        latency_tracer.mark("copy_sent")
+
+        # 使用QTimer延迟获取剪贴板，而不是阻塞线程
+        QTimer.singleShot(self.delay_ms, lambda: self.finish_fetch(original_text, callback))
+
+    def finish_fetch(self, original_text, callback):
+        """读取复制结果并恢复剪贴板"""
+        new_text = ""
+        try:
+            new_text = pyperclip.paste()
+            # 如果剪贴板内容被更改，恢复原始内容
+            if original_text != new_text:
+                pyperclip.copy(original_text)
+            else:
+                new_text = ""
+        finally:
+            callback(new_text)
+
+
+# 可用的选中文本获取策略
+SELECTION_SOURCES = {
+    PrimarySelectionSource.name: PrimarySelectionSource,
+    CopySelectionSource.name: CopySelectionSource,
+}
+
+
+def create_selection_sources(strategy="auto"):
+    """按设置创建策略链，前一个策略没有取到文本时依次尝试后一个
+
+    strategy 可以是 "auto"、单个策略名称，或以逗号分隔的策略链（如 "primary,copy"）。
+    "auto" 在支持主选区的平台上只使用主选区，否则退回模拟复制。
+    """
+    if strategy == "auto":
+        names = ["primary", "copy"]
+    else:
+        names = [name.strip() for name in strategy.split(",") if name.strip() in SELECTION_SOURCES]
+
+    sources = [SELECTION_SOURCES[name]() for name in names]
+    sources = [source for source in sources if source.is_available()]
+    if strategy == "auto":
+        sources = sources[:1]
+    return sources or [CopySelectionSource()]
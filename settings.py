@@ -3,24 +3,83 @@
 
 import os
 import json
+import atexit
+import tempfile
+import threading
+from contextlib import contextmanager
+
+
+def flatten_settings(settings):
+    """把嵌套的设置展开为 {(分组, 键): 值}"""
+    flat = {}
+    for section, values in settings.items():
+        if isinstance(values, dict):
+            for key, value in values.items():
+                flat[(section, key)] = value
+    return flat
+
+
+def diff_settings(old_flat, new_flat):
+    """比较两份展开的设置，返回 [(分组, 键, 旧值, 新值)]，删除的键新值为 None"""
+    changes = []
+    for path, value in new_flat.items():
+        old = old_flat.get(path)
+        if path not in old_flat or old != value:
+            changes.append(path + (old, value))
+    for path, old in old_flat.items():
+        if path not in new_flat:
+            changes.append(path + (old, None))
+    return changes
+
 
 class Settings:
-    """应用程序设置类"""
+    """应用程序设置类，修改会延迟合并写入文件"""
+    
+    # 合并写入的时间窗口（秒）
+    FLUSH_DELAY = 0.5
     
     def __init__(self):
         """初始化设置"""
         self.settings_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "settings.json")
+        self.lock = threading.RLock()
+        self.dirty = False
+        self.batch_depth = 0
+        self.flush_timer = None
+        # 设置变化的回调 callback(changes)，changes 为 diff_settings() 的结果
+        self.listeners = []
         self.settings = self.load_settings()
+        # 展开的设置，get() 直接按 (分组, 键) 查找
+        self.flat = flatten_settings(self.settings)
+        # 退出时写入尚未保存的修改
+        atexit.register(self.flush)
         
-    def load_settings(self):
-        """从文件加载设置"""
-        default_settings = {
+    @staticmethod
+    def default_settings():
+        """默认设置"""
+        return {
             "translation": {
                 "default_engine": "百度翻译",
-                "available_engines": ["百度翻译", "谷歌翻译", "有道翻译"],
+                "available_engines": ["百度翻译", "谷歌翻译", "有道翻译", "本地词典"],
                 "auto_detect_language": True,
                 "default_source_lang": "auto",
-                "default_target_lang": "zh"
+                "default_target_lang": "zh",
+                "cache_enabled": True,
+                "cache_memory_entries": 256,
+                "cache_max_entries": 10000,
+                "cache_max_age_days": 30,
+                "http_connect_timeout": 3.05,
+                "http_read_timeout": 5.0,
+                "http_max_retries": 2,
+                "engine_timeouts": {},
+                "engine_rate_limits": {},
+                "chunk_max_chars": 500,
+                "chunk_concurrency": 3,
+                "offline_dict_enabled": True,
+                "offline_dict_path": "",
+                "offline_dict_max_chars": 40,
+                "prefetch_enabled": False,
+                "prefetch_max_chars": 200,
+                "prefetch_budget_per_minute": 20
             },
             "ui": {
                 "toolbar_opacity": 0.9,
@@ -36,7 +95,16 @@ class Settings:
             },
             "clipboard": {
                 "check_interval_ms": 500,
-                "use_clipboard_for_detection": True
+                "use_clipboard_for_detection": True,
+                "selection_strategy": "auto",
+                "settle_initial_ms": 100,
+                "settle_deadline_ms": 800,
+                "settle_max_attempts": 3
+            },
+            "history": {
+                "enabled": True,
+                "max_entries": 20000,
+                "max_age_days": 180
             },
             "search": {
                 "default_search_engine": "百度",
@@ -48,13 +116,25 @@ class Settings:
             }
         }
         
+    def read_settings_file(self):
+        """读取设置文件并与默认设置合并，文件不存在或无法解析时返回 None"""
         try:
+            with open(self.settings_file, 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+        except (OSError, ValueError) as e:
             if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                # 合并设置，确保所有默认设置都存在
-                self.update_nested_dict(default_settings, settings)
-                return default_settings
+                print(f"读取设置文件出错: {str(e)}")
+            return None
+        # 合并设置，确保所有默认设置都存在
+        return self.update_nested_dict(self.default_settings(), settings)
+    
+    def load_settings(self):
+        """从文件加载设置"""
+        default_settings = self.default_settings()
+        try:
+            if os.path.exists(self.settings_file):
+                settings = self.read_settings_file()
+                return settings if settings is not None else default_settings
             else:
                 # 如果设置文件不存在，创建默认设置文件
                 self.save_settings(default_settings)
@@ -74,35 +154,148 @@ class Settings:
         return d
     
     def save_settings(self, settings=None):
-        """保存设置到文件"""
-        if settings is None:
-            settings = self.settings
-            
+        """立即保存设置到文件，先写临时文件再原子替换"""
+        with self.lock:
+            if settings is None:
+                settings = self.settings
+                
+            tmp_path = None
+            try:
+                data = json.dumps(settings, ensure_ascii=False, indent=4)
+                fd, tmp_path = tempfile.mkstemp(prefix=".settings-", suffix=".tmp",
+                                                dir=os.path.dirname(self.settings_file))
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.settings_file)
+                return True
+            except Exception as e:
+                print(f"保存设置出错: {str(e)}")
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return False
+    
+    def flush(self):
+        """写入所有尚未保存的修改"""
+        with self.lock:
+            self.cancel_pending_flush()
+            if not self.dirty:
+                return True
+            self.dirty = False
+            return self.save_settings()
+    
+    def cancel_pending_flush(self):
+        """取消已计划的延迟写入"""
+        with self.lock:
+            if self.flush_timer is not None:
+                self.flush_timer.cancel()
+                self.flush_timer = None
+    
+    def mark_dirty(self):
+        """标记设置已修改，并在合并窗口结束时写入文件"""
+        with self.lock:
+            self.dirty = True
+            # 批量修改期间不计划写入，由 transaction 结束时统一写入
+            if self.batch_depth > 0 or self.flush_timer is not None:
+                return
+            self.flush_timer = threading.Timer(self.FLUSH_DELAY, self.flush)
+            self.flush_timer.daemon = True
+            self.flush_timer.start()
+    
+    @contextmanager
+    def transaction(self):
+        """批量修改设置，结束时只写入一次文件"""
+        with self.lock:
+            self.batch_depth += 1
         try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, ensure_ascii=False, indent=4)
-            return True
-        except Exception as e:
-            print(f"保存设置出错: {str(e)}")
-            return False
+            yield self
+        finally:
+            with self.lock:
+                self.batch_depth -= 1
+                if self.batch_depth == 0 and self.dirty:
+                    self.flush()
+    
+    def reset_to_defaults(self):
+        """删除设置文件并恢复默认设置"""
+        with self.lock:
+            self.cancel_pending_flush()
+            self.dirty = False
+            if os.path.exists(self.settings_file):
+                os.remove(self.settings_file)
+            changes = self.replace_settings(self.load_settings())
+        self.notify(changes)
+    
+    def reload(self):
+        """重新读取设置文件，返回变化的设置项并通知监听者
+        
+        有尚未写入的修改时以内存中的设置为准，随后的写入会覆盖文件。
+        """
+        with self.lock:
+            if self.dirty:
+                return []
+            try:
+                settings = self.read_settings_file()
+            except Exception as e:
+                print(f"读取设置文件出错: {str(e)}")
+                settings = None
+            if settings is None:
+                return []
+            changes = self.replace_settings(settings)
+        self.notify(changes)
+        return changes
+    
+    def replace_settings(self, settings):
+        """替换全部设置，返回变化的设置项（调用方需持有锁）"""
+        flat = flatten_settings(settings)
+        changes = diff_settings(self.flat, flat)
+        self.settings = settings
+        self.flat = flat
+        return changes
+    
+    def add_listener(self, callback):
+        """注册设置变化的回调，回调在修改设置的线程中执行"""
+        with self.lock:
+            self.listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        with self.lock:
+            if callback in self.listeners:
+                self.listeners.remove(callback)
+    
+    def notify(self, changes):
+        """通知监听者，不持有锁以免回调中读写设置时死锁"""
+        if not changes:
+            return
+        with self.lock:
+            listeners = list(self.listeners)
+        for callback in listeners:
+            try:
+                callback(changes)
+            except Exception as e:
+                print(f"处理设置变化出错: {str(e)}")
     
     def get(self, section, key, default=None):
         """获取设置值"""
-        try:
-            return self.settings[section][key]
-        except (KeyError, TypeError):
-            return default
+        return self.flat.get((section, key), default)
     
     def set(self, section, key, value):
-        """设置值"""
+        """设置值，文件写入会延迟合并"""
         try:
-            if section not in self.settings:
-                self.settings[section] = {}
-            self.settings[section][key] = value
-            return self.save_settings()
+            with self.lock:
+                old = self.flat.get((section, key))
+                changed = (section, key) not in self.flat or old != value
+                if section not in self.settings:
+                    self.settings[section] = {}
+                self.settings[section][key] = value
+                self.flat[(section, key)] = value
+                self.mark_dirty()
         except Exception as e:
             print(f"设置值出错: {str(e)}")
             return False
+        if changed:
+            self.notify([(section, key, old, value)])
+        return True
 
 
 # 创建全局设置实例
@@ -1,15 +1,16 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import os
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTabWidget, 
                            QLabel, QComboBox, QCheckBox, QSpinBox, QDoubleSpinBox,
                            QPushButton, QGroupBox, QFormLayout, QSlider, QLineEdit,
-                           QListWidget, QListWidgetItem, QMessageBox)
+                           QListWidget, QListWidgetItem, QMessageBox, QWidget)
 from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtGui import QIcon
 
 from settings import app_settings
+from engine_race import FASTEST_ENGINE
+from offline_dict import LOCAL_DICT_ENGINE
 
 class SettingsDialog(QDialog):
     """设置对话框"""
@@ -85,6 +86,14 @@ class SettingsDialog(QDialog):
         self.clipboard_interval.setSuffix(" 毫秒")
         clipboard_layout.addRow("剪贴板检查间隔:", self.clipboard_interval)
         
+        self.selection_strategy_combo = QComboBox()
+        self.selection_strategy_combo.addItems(["auto", "primary", "copy", "primary,copy"])
+        strategy = app_settings.get("clipboard", "selection_strategy", "auto")
+        index = self.selection_strategy_combo.findText(strategy)
+        if index >= 0:
+            self.selection_strategy_combo.setCurrentIndex(index)
+        clipboard_layout.addRow("选中文本获取方式:", self.selection_strategy_combo)
+        
         clipboard_group.setLayout(clipboard_layout)
         
         # 启动设置
@@ -115,8 +124,9 @@ class SettingsDialog(QDialog):
         engine_layout = QFormLayout()
         
         self.engine_combo = QComboBox()
-        engines = app_settings.get("translation", "available_engines", ["百度翻译", "谷歌翻译", "有道翻译"])
+        engines = app_settings.get("translation", "available_engines", ["百度翻译", "谷歌翻译", "有道翻译", LOCAL_DICT_ENGINE])
         self.engine_combo.addItems(engines)
+        self.engine_combo.addItem(FASTEST_ENGINE)
         default_engine = app_settings.get("translation", "default_engine", "百度翻译")
         index = self.engine_combo.findText(default_engine)
         if index >= 0:
@@ -309,9 +319,19 @@ class SettingsDialog(QDialog):
     
     def save_settings(self):
         """保存设置"""
+        # 批量修改，结束时只写入一次设置文件
+        with app_settings.transaction():
+            self._save_settings_values()
+        
+        QMessageBox.information(self, "设置已保存", "设置已保存，部分设置可能需要重启应用程序才能生效。")
+        self.accept()
+        
+    def _save_settings_values(self):
+        """将界面中的值写入设置"""
         # 保存剪贴板设置
         app_settings.set("clipboard", "use_clipboard_for_detection", self.use_clipboard_check.isChecked())
         app_settings.set("clipboard", "check_interval_ms", self.clipboard_interval.value())
+        app_settings.set("clipboard", "selection_strategy", self.selection_strategy_combo.currentText())
         
         # 保存翻译引擎设置
         app_settings.set("translation", "default_engine", self.engine_combo.currentText())
@@ -334,9 +354,6 @@ class SettingsDialog(QDialog):
         # 保存搜索引擎设置
         app_settings.set("search", "default_search_engine", self.search_engine_combo.currentText())
         
-        QMessageBox.information(self, "设置已保存", "设置已保存，部分设置可能需要重启应用程序才能生效。")
-        self.accept()
-        
     def reset_settings(self):
         """重置设置为默认值"""
         confirm = QMessageBox.question(
@@ -348,14 +365,9 @@ class SettingsDialog(QDialog):
         )
         
         if confirm == QMessageBox.StandardButton.Yes:
-            # 删除设置文件并重新加载
-            settings_file = app_settings.settings_file
-            if os.path.exists(settings_file):
-                os.remove(settings_file)
-            
-            # 重新加载默认设置
-            app_settings.settings = app_settings.load_settings()
+            # 删除设置文件并重新加载默认设置，同时丢弃尚未写入的修改
+            app_settings.reset_to_defaults()
             
             # 更新界面
-            QMessageBox.information(self, "设置已重置", "所有设置已重置为默认值，请重新启动应用程序以应用更改。")
+            QMessageBox.information(self, "设置已重置", "所有设置已重置为默认值，部分设置需要重新启动应用程序才能生效。")
             self.accept() 
\ No newline at end of file
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+
+from PyQt6.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+
+
+class SettingsWatcher(QObject):
+    """监视设置文件和设置修改，按设置项通知关心它的组件
+
+    设置文件被外部修改时重新读取并只通知变化的设置项；程序内调用 Settings.set()
+    修改的设置项同样会通知。回调总是在界面线程中执行。
+    """
+    # 分组、键、新值
+    setting_changed = pyqtSignal(str, str, object)
+
+    # 文件变化后等待写入完成再读取的时间（毫秒）
+    RELOAD_DELAY_MS = 100
+
+    def __init__(self, settings, parent=None):
+        super().__init__(parent)
+        self.settings = settings
+        # {(分组, 键): [callback(value)]}
+        self.handlers = {}
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.timeout.connect(self.reload)
+
+        # 设置文件通过临时文件原子替换写入，替换后需要重新监视文件，因此同时监视所在目录；
+        # 目录中其他文件（如翻译缓存的日志文件）频繁变化，只有设置文件本身变化时才重新读取
+        self.file_state = self.settings_file_state()
+        self.watcher = QFileSystemWatcher(self)
+        self.watch_paths()
+        self.watcher.fileChanged.connect(self.schedule_reload)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+
+        # 监听者可能在其他线程中被调用，信号会排队到界面线程
+        self.setting_changed.connect(self.dispatch)
+        self.settings.add_listener(self.on_settings_changed)
+
+    def watch_paths(self):
+        settings_file = self.settings.settings_file
+        for path in (settings_file, os.path.dirname(settings_file)):
+            if os.path.exists(path) and path not in self.watcher.files() + self.watcher.directories():
+                self.watcher.addPath(path)
+
+    def settings_file_state(self):
+        """设置文件的 (inode, 修改时间, 大小)，文件不存在时为 None"""
+        try:
+            stat = os.stat(self.settings.settings_file)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def watch(self, section, key, callback):
+        """设置项变化时调用 callback(新值)"""
+        self.handlers.setdefault((section, key), []).append(callback)
+
+    def schedule_reload(self, path=""):
+        self.reload_timer.start(self.RELOAD_DELAY_MS)
+
+    def on_directory_changed(self, path=""):
+        if self.settings_file_state() != self.file_state:
+            self.schedule_reload(path)
+
+    def reload(self):
+        """重新监视设置文件并读取变化"""
+        self.file_state = self.settings_file_state()
+        self.watch_paths()
+        self.settings.reload()
+
+    def on_settings_changed(self, changes):
+        for section, key, old, new in changes:
+            self.setting_changed.emit(section, key, new)
+
+    def dispatch(self, section, key, value):
+        for callback in self.handlers.get((section, key), ()):
+            try:
+                callback(value)
+            except Exception as e:
+                print(f"应用设置 {section}.{key} 出错: {str(e)}")
+
+    def stop(self):
+        self.settings.remove_listener(self.on_settings_changed)
+        self.reload_timer.stop()
+        paths = self.watcher.files() + self.watcher.directories()
+        if paths:
+            self.watcher.removePaths(paths)
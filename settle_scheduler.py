@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import sys
+import time
+import shutil
+import threading
+import subprocess
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+_XPROP = shutil.which("xprop") if sys.platform.startswith("linux") else None
+_WINDOW_ID = re.compile(r"0x[0-9a-fA-F]+")
+_WM_CLASS = re.compile(r'"([^"]*)"')
+
+
+def foreground_app():
+    """获取前台应用名称，无法获取时返回空字符串
+
+    在主线程处理鼠标事件时调用：X11 下只读取活动窗口监视器缓存的名称，不启动子进程。
+    """
+    try:
+        if sys.platform == "win32":
+            return _foreground_app_windows()
+        if _active_window_watcher is not None:
+            _active_window_watcher.start()
+            return _active_window_watcher.app
+    except Exception:
+        pass
+    return ""
+
+
+def start_foreground_app_watch():
+    """开始监视前台应用的变化，不支持的平台上不做任何事"""
+    if _active_window_watcher is not None:
+        _active_window_watcher.start()
+
+
+def stop_foreground_app_watch():
+    if _active_window_watcher is not None:
+        _active_window_watcher.stop()
+
+
+def _foreground_app_windows():
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    kernel32 = ctypes.windll.kernel32
+    pid = wintypes.DWORD()
+    user32.GetWindowThreadProcessId(user32.GetForegroundWindow(), ctypes.byref(pid))
+    # PROCESS_QUERY_LIMITED_INFORMATION
+    handle = kernel32.OpenProcess(0x1000, False, pid.value)
+    if not handle:
+        return ""
+    try:
+        size = wintypes.DWORD(260)
+        buffer = ctypes.create_unicode_buffer(size.value)
+        if not kernel32.QueryFullProcessImageNameW(handle, 0, buffer, ctypes.byref(size)):
+            return ""
+        return os.path.basename(buffer.value).lower()
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+class ActiveWindowWatcher:
+    """监视 X11 活动窗口，缓存前台应用名称
+
+    使用一个常驻的 xprop -spy 进程接收 _NET_ACTIVE_WINDOW 的变化，只在活动窗口切换时
+    查询一次窗口的 WM_CLASS，读取前台应用名称时不再启动子进程。
+    """
+    # 缓存的窗口数量上限
+    MAX_WINDOWS = 256
+
+    def __init__(self, xprop):
+        self.xprop = xprop
+        self.app = ""
+        self.process = None
+        # {窗口 id: 应用名称}
+        self.names = {}
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.process is not None or not os.environ.get("DISPLAY"):
+                return
+            self.process = subprocess.Popen([self.xprop, "-root", "-spy", "_NET_ACTIVE_WINDOW"],
+                                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        threading.Thread(target=self.run, args=(self.process,), name="active-window", daemon=True).start()
+
+    def run(self, process):
+        try:
+            for line in process.stdout:
+                match = _WINDOW_ID.search(line.partition("#")[2])
+                window = match.group() if match else ""
+                self.app = self.window_app(window) if window and int(window, 16) else ""
+        except Exception as e:
+            print(f"监视活动窗口出错: {str(e)}")
+
+    def window_app(self, window):
+        app = self.names.get(window)
+        if app is None:
+            output = subprocess.run([self.xprop, "-id", window, "WM_CLASS"], capture_output=True,
+                                    text=True, timeout=0.5).stdout
+            names = _WM_CLASS.findall(output)
+            app = names[-1].lower() if names else ""
+            if len(self.names) >= self.MAX_WINDOWS:
+                self.names.clear()
+            self.names[window] = app
+        return app
+
+    def stop(self):
+        with self.lock:
+            process, self.process = self.process, None
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+_active_window_watcher = ActiveWindowWatcher(_XPROP) if _XPROP else None
+
+
+class SettleScheduler(QObject):
+    """选中文本检查调度器
+
+    鼠标松开后等待前台应用更新选区再检查。取到的选区为空或没有变化、或检查因上一次检查
+    尚未结束而被跳过时，按指数退避重试，直到超过次数或截止时间。
+    等待时间按应用分别学习：第一次就取到文本时逐步缩短，重试后才取到时向实际用时延长；
+    始终没有取到文本多半只是点击而没有选择，不调整等待时间。
+    连续多次松开鼠标只在最后一次之后检查一次。
+    """
+    # 需要执行一次检查
+    check_requested = pyqtSignal()
+
+    def __init__(self, parent=None, initial_delay_ms=100, min_delay_ms=20, max_delay_ms=400,
+                 deadline_ms=800, max_attempts=3, alpha=0.3):
+        super().__init__(parent)
+        self.initial_delay_ms = initial_delay_ms
+        self.min_delay_ms = min_delay_ms
+        self.max_delay_ms = max_delay_ms
+        self.deadline_ms = deadline_ms
+        self.max_attempts = max_attempts
+        self.alpha = alpha
+        # 各应用学习到的等待时间（毫秒）{应用名称: 等待时间}
+        self.delays = {}
+
+        self.app = ""
+        self.released_at = 0.0
+        self.attempt = 0
+        # 本轮是否有检查没有取到文本
+        self.missed = False
+        self.checking = False
+        # 检查进行中又松开了鼠标，检查结束后需要重新开始
+        self.restart_pending = False
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.on_timeout)
+        start_foreground_app_watch()
+
+    def settle_delay(self, app):
+        """应用 app 的等待时间（毫秒）"""
+        return self.delays.get(app, self.initial_delay_ms)
+
+    def on_mouse_released(self, app):
+        """鼠标松开，app 为当时的前台应用名称"""
+        if self.checking:
+            self.restart_pending = True
+            self.app = app
+            return
+        self.start(app)
+
+    def start(self, app):
+        """从头开始一轮检查；已在等待中的检查被推迟，相当于合并连续的松开事件"""
+        self.app = app
+        self.released_at = time.perf_counter()
+        self.attempt = 0
+        self.missed = False
+        self.timer.start(int(self.settle_delay(app)))
+
+    def on_timeout(self):
+        self.attempt += 1
+        self.checking = True
+        self.check_requested.emit()
+
+    def report(self, found, retry=True):
+        """检查完成后调用，found 表示是否取到了新的选中文本
+
+        没有取到时退避后重试；retry 为 False 时不重试（如模拟复制的策略每次检查都会发送 Ctrl+C）。
+        """
+        elapsed_ms = self.finish_check()
+        if elapsed_ms is None:
+            return
+        if found:
+            self.learn(self.app, elapsed_ms)
+        elif retry:
+            self.missed = True
+            self.retry(elapsed_ms)
+
+    def skip(self):
+        """检查因上一次检查尚未结束而被跳过时调用，退避后重试"""
+        elapsed_ms = self.finish_check()
+        if elapsed_ms is not None:
+            self.retry(elapsed_ms)
+
+    def finish_check(self):
+        """结束当前检查，返回距松开鼠标的毫秒数；不在检查中或需要重新开始时返回 None"""
+        if not self.checking:
+            return None
+        self.checking = False
+        if self.restart_pending:
+            self.restart_pending = False
+            self.start(self.app)
+            return None
+        return (time.perf_counter() - self.released_at) * 1000
+
+    def retry(self, elapsed_ms):
+        """按指数退避安排下一次检查，超过次数或截止时间后放弃"""
+        delay = self.settle_delay(self.app) * (2 ** self.attempt)
+        if self.attempt < self.max_attempts and elapsed_ms + delay <= self.deadline_ms:
+            self.timer.start(int(delay))
+
+    def learn(self, app, elapsed_ms):
+        """根据本次取到文本所用的时间调整应用的等待时间"""
+        current = self.settle_delay(app)
+        if self.missed:
+            # 之前的检查没有取到文本，等待时间不够，向实际用时延长
+            target = elapsed_ms
+        elif self.attempt == 1:
+            # 第一次就成功，尝试逐步缩短等待时间
+            target = current * 0.9
+        else:
+            # 只是因为检查忙被推迟，与应用无关
+            return
+        delay = current + self.alpha * (target - current)
+        self.delays[app] = max(self.min_delay_ms, min(self.max_delay_ms, delay))
+
+    def stop(self):
+        self.timer.stop()
+        self.checking = False
+        self.restart_pending = False
+        stop_foreground_app_watch()
@@ -22,10 +22,6 @@ if %errorlevel% neq 0 (
     )
 )
 
-rem 生成图标
-echo 正在准备应用资源...
-python icon.py
-
 rem 启动应用
 echo 启动应用程序...
 start pythonw main.py
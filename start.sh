@@ -21,10 +21,6 @@ if ! python3 -c "import PyQt6, keyboard, mouse, pyperclip" &> /dev/null; then
     fi
 fi
 
-# 生成图标
-echo "正在准备应用资源..."
-python3 icon.py
-
 # 启动应用
 echo "启动应用程序..."
 python3 main.py &
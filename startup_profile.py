@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import sys
+import time
+
+
+class StartupProfiler:
+    """记录启动各阶段的耗时，使用 --profile-startup 参数启动时打印明细"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started_at = time.perf_counter()
+        self.last_mark = self.started_at
+        # [(阶段名称, 阶段耗时(毫秒), 累计耗时(毫秒))]
+        self.phases = []
+        self.reported = False
+
+    def mark(self, phase):
+        """记录上一个标记点到现在的耗时"""
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last_mark) * 1000, (now - self.started_at) * 1000))
+        self.last_mark = now
+
+    def total_ms(self):
+        return (self.last_mark - self.started_at) * 1000
+
+    def report(self):
+        """打印各阶段耗时，只打印一次"""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        print("启动耗时明细:")
+        for phase, elapsed_ms, total_ms in self.phases:
+            print(f"  {phase:<16} {elapsed_ms:8.1f} 毫秒  (累计 {total_ms:8.1f} 毫秒)")
+
+
+# 全局启动计时器，应在 main.py 中最先导入以便覆盖模块导入时间
+startup_profiler = StartupProfiler("--profile-startup" in sys.argv)
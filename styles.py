@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# 共享样式表：每个窗口只在根部件上设置一次，由子部件通过选择器继承，
+# 避免在每个按钮上重复设置并重复解析同样的样式表
+
+# 主程序划词工具栏（TranslationToolbar）的按钮容器及圆形按钮
+TOOLBAR_STYLE = """
+    #toolbarButtons {
+        background-color: white;
+        border-radius: 20px;
+        border: 1px solid rgba(0, 0, 0, 0.1);
+    }
+    #toolbarButtons QPushButton {
+        background-color: white;
+        border: 1px solid rgba(0, 0, 0, 0.1);
+        border-radius: 16px;
+        padding: 2px;
+        font-size: 14px;
+        color: #333;
+        min-width: 32px;
+        min-height: 32px;
+        max-width: 32px;
+        max-height: 32px;
+        text-align: center;
+    }
+    #toolbarButtons QPushButton:hover {
+        background-color: #f0f0f0;
+        border: 1px solid rgba(0, 0, 0, 0.2);
+    }
+    #toolbarButtons QPushButton:pressed {
+        background-color: #e0e0e0;
+    }
+"""
+
+# quick_toolbar 工具栏窗口及按钮
+QUICK_TOOLBAR_STYLE = """
+    QMainWindow {
+        background-color: #2C3E50;
+        border-radius: 4px;
+        border: 1px solid #34495E;
+    }
+    QPushButton {
+        background-color: #2C3E50;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        font-size: 12px;
+        padding: 4px;
+    }
+    QPushButton:hover {
+        background-color: #34495E;
+    }
+    QPushButton:pressed {
+        background-color: #1A252F;
+    }
+"""
+
+# quick_toolbar 翻译结果弹窗
+QUICK_TRANSLATION_STYLE = """
+    #translationContainer {
+        background-color: white;
+        border-radius: 8px;
+        border: 1px solid #E0E0E0;
+    }
+    #translationContainer QLabel {
+        color: #333;
+        font-size: 14px;
+        line-height: 1.5;
+    }
+"""
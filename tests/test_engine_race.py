@@ -0,0 +1,56 @@
+import time
+
+from engine_race import EngineRacer, EngineScoreboard
+
+
+class FakeEngine:
+    """按引擎名称返回预设结果，delays 中的引擎在返回前等待"""
+
+    def __init__(self, results, delays=None):
+        self.results = results
+        self.delays = delays or {}
+        self.calls = []
+
+    def request_translation(self, text, from_lang, to_lang, engine_name, cancel_event=None):
+        self.calls.append(engine_name)
+        time.sleep(self.delays.get(engine_name, 0))
+        result = self.results[engine_name]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_fastest_engine_wins():
+    engine = FakeEngine({"快": "fast", "慢": "slow"}, delays={"慢": 0.3})
+    racer = EngineRacer(engine)
+    try:
+        assert racer.race("hello", "en", "zh", ["慢", "快"]) == ("快", "fast")
+    finally:
+        racer.shutdown()
+
+
+def test_failed_engine_does_not_win():
+    engine = FakeEngine({"坏": RuntimeError("boom"), "好": "ok"}, delays={"好": 0.05})
+    racer = EngineRacer(engine)
+    try:
+        assert racer.race("hello", "en", "zh", ["坏", "好"]) == ("好", "ok")
+        assert racer.scoreboard.snapshot()["坏"]["success_rate"] == 0.0
+    finally:
+        racer.shutdown()
+
+
+def test_no_result_returns_none():
+    engine = FakeEngine({"甲": None, "乙": RuntimeError("boom")})
+    racer = EngineRacer(engine)
+    try:
+        assert racer.race("hello", "en", "zh", ["甲", "乙"]) == (None, None)
+    finally:
+        racer.shutdown()
+
+
+def test_scoreboard_ranks_by_expected_latency():
+    scoreboard = EngineScoreboard(default_latency_ms=500, failure_penalty_ms=3000)
+    scoreboard.record("快", 100, True)
+    scoreboard.record("不稳定", 50, False)
+    # 没有样本的引擎使用默认延迟，失败率高的引擎排在最后
+    assert scoreboard.ranked(["不稳定", "新", "快"]) == ["快", "新", "不稳定"]
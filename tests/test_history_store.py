@@ -0,0 +1,67 @@
+from history_store import HistoryStore
+
+
+def create_store(tmp_path, **kwargs):
+    return HistoryStore(str(tmp_path / "history.db"), **kwargs)
+
+
+def test_add_search_and_favorite(tmp_path):
+    store = create_store(tmp_path)
+    try:
+        store.add("hello world", "firefox")
+        store.add("goodbye")
+        store.set_translation("hello world", "你好世界", "有道翻译")
+        store.set_favorite("goodbye")
+
+        assert store.count() == 2
+        entries = store.search("world")
+        assert [entry.text for entry in entries] == ["hello world"]
+        assert entries[0].translation == "你好世界"
+        assert [entry.text for entry in store.search("你好")] == ["hello world"]
+        assert [entry.text for entry in store.search(favorites_only=True)] == ["goodbye"]
+    finally:
+        store.close()
+
+
+def test_repeated_selection_updates_latest_entry(tmp_path):
+    store = create_store(tmp_path)
+    try:
+        first = store.add("same text")
+        assert store.add("same text") == first
+        assert store.count() == 1
+    finally:
+        store.close()
+
+
+def test_compact_keeps_favorites_within_limit(tmp_path):
+    store = create_store(tmp_path, max_entries=3)
+    try:
+        store.set_favorite("keep me")
+        for index in range(5):
+            store.add(f"entry {index}")
+        store.compact()
+        texts = {entry.text for entry in store.search()}
+        assert "keep me" in texts
+        assert store.count() == 3
+    finally:
+        store.close()
+
+
+def test_closed_store_is_harmless(tmp_path):
+    store = create_store(tmp_path)
+    store.close()
+    assert store.add("text") is None
+    assert store.search("text") == []
+    assert store.count() == 0
+
+
+def test_compaction_runs_in_background(tmp_path):
+    store = create_store(tmp_path, max_entries=2)
+    store.COMPACT_EVERY = 4
+    try:
+        for index in range(4):
+            store.add(f"entry {index}")
+        store.executor.shutdown(wait=True)
+        assert store.count() == 2
+    finally:
+        store.close()
@@ -0,0 +1,63 @@
+from PyQt6.QtCore import QCoreApplication
+
+from hook_events import HookEventQueue
+
+# 排队连接和计时器需要应用对象
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+def create_queue(**kwargs):
+    queue = HookEventQueue(**kwargs)
+    received = []
+    queue.register("key", lambda event: received.append(event))
+    queue.register("mouse_up", lambda event: received.append(event), coalesce=True)
+    return queue, received
+
+
+def test_events_are_not_coalesced_by_default():
+    queue, received = create_queue()
+    for index in range(3):
+        queue.post("key", index)
+    queue.drain()
+    assert [event.data for event in received] == [0, 1, 2]
+    assert queue.stats()["coalesced"] == 0
+
+
+def test_coalesced_kind_keeps_last_event():
+    queue, received = create_queue()
+    queue.post("mouse_up", 1)
+    queue.post("key", "a")
+    queue.post("mouse_up", 2)
+    queue.drain()
+    assert [(event.kind, event.data) for event in received] == [("key", "a"), ("mouse_up", 2)]
+    assert queue.stats()["coalesced"] == 1
+
+
+def test_full_queue_drops_oldest_events():
+    queue, received = create_queue(capacity=2)
+    for index in range(4):
+        queue.post("key", index)
+    queue.drain()
+    assert [event.data for event in received] == [2, 3]
+    assert queue.stats()["dropped"] == 2
+
+
+def test_handler_error_does_not_stop_batch():
+    queue, received = create_queue()
+    queue.register("bad", lambda event: 1 / 0)
+    queue.post("bad")
+    queue.post("key", "after")
+    queue.drain()
+    assert [event.data for event in received] == ["after"]
+    assert queue.stats()["dispatched"] == 2
+
+
+def test_large_backlog_is_drained_in_batches():
+    queue, received = create_queue(batch_size=2)
+    for index in range(5):
+        queue.post("key", index)
+    queue.drain()
+    assert len(received) == 2 and queue.stats()["pending"] == 3
+    for _ in range(10):
+        app.processEvents()
+    assert [event.data for event in received] == [0, 1, 2, 3, 4]
@@ -0,0 +1,48 @@
+from hotkey_manager import HotkeyManager, normalize_hotkey
+
+
+class FakeBackend:
+    def __init__(self):
+        self.hotkeys = {}
+        self.next_handle = 0
+
+    def add_hotkey(self, combo, callback, args=()):
+        self.next_handle += 1
+        self.hotkeys[self.next_handle] = (combo, callback, args)
+        return self.next_handle
+
+    def remove_hotkey(self, handle):
+        del self.hotkeys[handle]
+
+
+def test_normalize_hotkey():
+    assert normalize_hotkey("Ctrl + Shift+T") == "ctrl+shift+t"
+    assert normalize_hotkey("") == ""
+    assert normalize_hotkey(None) == ""
+
+
+def test_apply_only_rebinds_changed_hotkeys():
+    backend = FakeBackend()
+    manager = HotkeyManager(lambda action: None, backend)
+    assert sorted(manager.apply({"translate": "ctrl+shift+t", "escape": "esc"})) == ["escape", "translate"]
+    handles = dict(manager.bindings)
+
+    assert manager.apply({"translate": "Ctrl+Shift+T", "escape": "esc"}) == []
+    assert manager.bindings == handles
+
+    assert manager.apply({"translate": "ctrl+alt+t"}) == ["escape", "translate"]
+    assert [combo for combo, _, _ in backend.hotkeys.values()] == ["ctrl+alt+t"]
+
+
+def test_callbacks_post_action_and_record_latency():
+    posted = []
+    backend = FakeBackend()
+    manager = HotkeyManager(posted.append, backend)
+    manager.bind("translate", "ctrl+shift+t")
+    _, callback, args = backend.hotkeys[1]
+    callback(*args)
+
+    assert posted == ["translate"]
+    assert manager.latency_stats()["translate"]["calls"] == 1
+    manager.clear()
+    assert backend.hotkeys == {}
@@ -0,0 +1,95 @@
+import time
+import threading
+
+import pytest
+
+from http_client import CircuitBreaker, EngineUnavailableError, HttpClient, RetryBudget, TranslationError
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """按顺序返回给定状态码的响应"""
+
+    def __init__(self, status_codes):
+        self.status_codes = list(status_codes)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return FakeResponse(self.status_codes.pop(0))
+
+    def close(self):
+        pass
+
+
+def create_client(status_codes, **kwargs):
+    client = HttpClient(**kwargs)
+    client.get_session()
+    client.session = FakeSession(status_codes)
+    return client
+
+
+def test_retries_retryable_status_then_succeeds():
+    client = create_client([503, 200], backoff=0)
+    assert client.get("引擎", "http://example.invalid").status_code == 200
+    assert client.session.calls == 2
+    stats = client.all_stats()["引擎"]
+    assert (stats["retries"], stats["successes"], stats["failures"]) == (1, 1, 1)
+
+
+def test_retry_budget_limits_retries():
+    client = create_client([503] * 10, backoff=0, max_retries=5)
+    client.retry_budget = RetryBudget(ratio=0, min_retries=1)
+    with pytest.raises(TranslationError):
+        client.get("引擎", "http://example.invalid")
+    assert client.session.calls == 2
+
+
+def test_retry_budget_refills_after_window():
+    budget = RetryBudget(ratio=0, min_retries=1, window=0.05)
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+    time.sleep(0.1)
+    assert budget.try_acquire()
+
+
+def test_cancel_interrupts_backoff():
+    client = create_client([503] * 3, backoff=10, max_retries=2)
+    cancel_event = threading.Event()
+    threading.Timer(0.05, cancel_event.set).start()
+    start = time.monotonic()
+    with pytest.raises(TranslationError, match="取消"):
+        client.get("引擎", "http://example.invalid", cancel_event=cancel_event)
+    assert time.monotonic() - start < 5
+
+
+def test_circuit_breaker_half_open_allows_one_probe():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open and not breaker.allow()
+
+    time.sleep(0.08)
+    # 冷却结束后只放行一次试探请求
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open and breaker.allow()
+
+
+def test_open_breaker_rejects_requests():
+    client = create_client([503] * 10, backoff=0, max_retries=0)
+    for _ in range(3):
+        with pytest.raises(TranslationError):
+            client.get("引擎", "http://example.invalid")
+    with pytest.raises(EngineUnavailableError):
+        client.get("引擎", "http://example.invalid")
+    assert client.all_stats()["引擎"]["rejected"] == 1
@@ -0,0 +1,36 @@
+from lang_detect import choose_languages, detect_language
+
+
+def test_detects_scripts():
+    assert detect_language("你好，世界").language == "zh"
+    assert detect_language("こんにちは世界").language == "ja"
+    assert detect_language("안녕하세요").language == "ko"
+    assert detect_language("Привет, мир").language == "ru"
+
+
+def test_detects_latin_languages_by_stopwords():
+    assert detect_language("Hello world").language == "en"
+    assert detect_language("Le chat est dans la maison").language == "fr"
+    assert detect_language("Der Hund ist nicht hier und das Haus").language == "de"
+
+
+def test_text_without_letters_has_no_language():
+    assert detect_language("").language is None
+    assert detect_language("123 + 456 = ?").language is None
+
+
+def test_confidence_is_share_of_main_script():
+    result = detect_language("Hello world 你好")
+    assert result.language == "en"
+    assert 0 < result.confidence < 1
+    assert set(result.scripts) == {"latin", "han"}
+
+
+def test_long_text_uses_sample_after_first_cjk_hit():
+    text = "中文文本。" * 5000
+    assert detect_language(text) == detect_language(text[:4000])
+
+
+def test_choose_languages_falls_back_when_source_is_target():
+    assert choose_languages("你好", "zh") == ("zh", "en")
+    assert choose_languages("Hello", "zh") == ("en", "zh")
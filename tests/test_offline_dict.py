@@ -0,0 +1,37 @@
+import struct
+
+from offline_dict import OfflineDictionary, build_index, normalize_key, offset_table, read_plain_dictionary
+
+
+def test_normalize_key():
+    assert normalize_key("  Hello   World ") == "hello world"
+
+
+def test_read_plain_dictionary_merges_duplicates(tmp_path):
+    source = tmp_path / "dict.txt"
+    source.write_text("# 注释\nhello\t你好\nHello\t喂\nno tab here\nworld\t世界\n", encoding="utf-8")
+    assert read_plain_dictionary(str(source)) == {"hello": "你好；喂", "world": "世界"}
+
+
+def test_build_and_lookup(tmp_path):
+    path = str(tmp_path / "dict.idx")
+    assert build_index({"apple": "苹果", "Banana": "香蕉", "ice cream": "冰淇淋"}, path, "en", "zh") == 3
+
+    dictionary = OfflineDictionary(path)
+    assert dictionary.lookup("apple", "en", "zh") == "苹果"
+    assert dictionary.lookup(" BANANA ", "auto", "zh") == "香蕉"
+    assert dictionary.lookup("ice  cream", "en", "zh") == "冰淇淋"
+    assert dictionary.lookup("cherry", "en", "zh") is None
+    # 不支持的翻译方向不查询
+    assert dictionary.lookup("apple", "en", "ja") is None
+
+    dictionary.close()
+    assert dictionary.lookup("apple", "en", "zh") is None
+
+
+def test_missing_index_file(tmp_path):
+    assert OfflineDictionary(str(tmp_path / "missing.idx")).lookup("apple", "en", "zh") is None
+
+
+def test_offset_table_reads_little_endian():
+    assert list(offset_table(memoryview(struct.pack("<3I", 0, 5, 70000)))) == [0, 5, 70000]
@@ -0,0 +1,46 @@
+from engine_registry import EngineContext, EngineRegistry, TranslationEngineBase
+from prefetch import SelectionPrefetcher
+from translation_engine import TranslationEngine
+
+
+class WebOnly(TranslationEngineBase):
+    name = "网页引擎"
+
+
+class Echo(TranslationEngineBase):
+    name = "接口引擎"
+
+    def translate(self, text, from_lang="auto", to_lang="zh", cancel_event=None):
+        return text
+
+
+def create_prefetcher():
+    registry = EngineRegistry(EngineContext(), plugin_dirs=(), entry_point_group="translation_tool.tests")
+    registry.register(WebOnly.name, WebOnly)
+    registry.register(Echo.name, Echo)
+    engine = TranslationEngine(registry=registry)
+    return engine, SelectionPrefetcher(engine, budget_per_minute=4)
+
+
+def test_web_only_engine_is_not_prefetched():
+    engine, prefetcher = create_prefetcher()
+    try:
+        assert not prefetcher.prefetch("hello", "en", "zh", WebOnly.name)
+        assert prefetcher.stats()["started"] == 0
+        # 没有花费预算
+        assert prefetcher.budget.tokens == prefetcher.budget.burst
+    finally:
+        prefetcher.shutdown()
+        engine.close()
+
+
+def test_prefetch_result_is_taken():
+    engine, prefetcher = create_prefetcher()
+    try:
+        assert prefetcher.prefetch("hello", "en", "zh", Echo.name)
+        prefetcher.future.result(5)
+        assert prefetcher.take("hello", "en", "zh", Echo.name) == "hello"
+        assert prefetcher.stats()["hits"] == 1
+    finally:
+        prefetcher.shutdown()
+        engine.close()
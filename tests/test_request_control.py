@@ -0,0 +1,115 @@
+import time
+import threading
+
+from engine_registry import EngineContext, EngineRegistry, TranslationEngineBase
+from request_control import SingleFlight, TokenBucket
+from translation_engine import TranslationEngine
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "等待超时"
+        time.sleep(0.01)
+
+
+def test_single_flight_coalesces_same_key():
+    flights = SingleFlight()
+    leader, flight = flights.join("key")
+    follower, same = flights.join("key")
+    assert leader and not follower
+    assert same is flight
+
+    flight.set_result("译文")
+    flights.leave("key", flight)
+    assert same.wait() == "译文"
+    assert flights.stats() == {"requests": 2, "coalesced": 1, "in_flight": 0}
+
+
+def test_single_flight_abandon_wakes_followers_and_keeps_new_leader():
+    flights = SingleFlight()
+    _, flight = flights.join("key")
+    flights.abandon("key", flight)
+    assert flight.wait() is None
+    assert flight.abandoned
+
+    # 接替执行的调用方的 Flight 不会被原调用方的 leave() 移除
+    leader, replacement = flights.join("key")
+    assert leader and replacement is not flight
+    flights.leave("key", flight)
+    assert flights.stats()["in_flight"] == 1
+
+
+def test_flight_wait_returns_none_when_cancelled():
+    flights = SingleFlight()
+    _, flight = flights.join("key")
+    cancel_event = threading.Event()
+    cancel_event.set()
+    assert flight.wait(cancel_event) is None
+
+
+def test_token_bucket_try_acquire_respects_burst():
+    bucket = TokenBucket(rate=0.001, burst=2)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert bucket.throttled == 1
+
+
+def test_token_bucket_refunds_token_on_cancel():
+    bucket = TokenBucket(rate=10, burst=1)
+    assert bucket.try_acquire()
+    cancel_event = threading.Event()
+    cancel_event.set()
+    assert bucket.acquire(cancel_event) is False
+    # 退还预支的令牌后，下一个请求只需等待一个令牌的时间
+    assert bucket.reserve() <= 0.11
+
+
+class UpperEngine(TranslationEngineBase):
+    name = "测试引擎"
+    capabilities = {"streaming": False, "local": False, "languages": None}
+    rate_limit = 1
+
+    def __init__(self, context):
+        super().__init__(context)
+        self.calls = 0
+
+    def translate(self, text, from_lang="auto", to_lang="zh", cancel_event=None):
+        self.calls += 1
+        return text.upper()
+
+
+def create_engine():
+    registry = EngineRegistry(EngineContext(), plugin_dirs=(), entry_point_group="translation_tool.tests")
+    registry.register(UpperEngine.name, UpperEngine)
+    return TranslationEngine(registry=registry)
+
+
+def test_cancelled_leader_hands_request_to_follower():
+    engine = create_engine()
+    try:
+        # 用掉唯一的令牌，之后的请求需要等待配额
+        assert engine.request_translation("warm up", "en", "zh", UpperEngine.name) == "WARM UP"
+
+        results = {}
+        leader_cancel = threading.Event()
+
+        def request(name, cancel_event=None):
+            results[name] = engine.request_translation("hello", "en", "zh", UpperEngine.name, cancel_event)
+
+        leader = threading.Thread(target=request, args=("leader", leader_cancel))
+        leader.start()
+        wait_until(lambda: engine.single_flight.stats()["in_flight"] == 1)
+        follower = threading.Thread(target=request, args=("follower",))
+        follower.start()
+        wait_until(lambda: engine.single_flight.stats()["coalesced"] == 1)
+
+        leader_cancel.set()
+        leader.join(5)
+        follower.join(5)
+        assert results["leader"] is None
+        assert results["follower"] == "HELLO"
+        assert engine.registry.get(UpperEngine.name).calls == 2
+    finally:
+        engine.close()
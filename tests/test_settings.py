@@ -0,0 +1,110 @@
+import json
+import os
+import time
+
+import pytest
+
+from settings import Settings, diff_settings, flatten_settings
+
+
+@pytest.fixture
+def settings(tmp_path):
+    instance = Settings()
+    instance.settings_file = str(tmp_path / "settings.json")
+    instance.FLUSH_DELAY = 0.05
+    instance.writes = 0
+    save_settings = instance.save_settings
+
+    def counting_save(*args):
+        instance.writes += 1
+        return save_settings(*args)
+    instance.save_settings = counting_save
+    yield instance
+    instance.cancel_pending_flush()
+    instance.dirty = False
+
+
+def read_file(settings):
+    with open(settings.settings_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_writes_are_debounced(settings):
+    for opacity in (0.5, 0.6, 0.7):
+        settings.set("ui", "toolbar_opacity", opacity)
+    assert settings.writes == 0
+    time.sleep(0.3)
+    assert settings.writes == 1
+    assert read_file(settings)["ui"]["toolbar_opacity"] == 0.7
+
+
+def test_transaction_writes_once_on_exit(settings):
+    with settings.transaction():
+        settings.set("ui", "toolbar_opacity", 0.5)
+        settings.set("ui", "font_size", 12)
+        assert settings.flush_timer is None
+    assert settings.writes == 1
+    assert read_file(settings)["ui"]["font_size"] == 12
+
+
+def test_flush_replaces_file_without_leftovers(settings, tmp_path):
+    settings.set("ui", "toolbar_opacity", 0.5)
+    assert settings.flush()
+    assert settings.writes == 1
+    assert os.listdir(tmp_path) == ["settings.json"]
+    # 没有修改时不再写入
+    assert settings.flush()
+    assert settings.writes == 1
+
+
+def test_listeners_receive_only_changes(settings):
+    old = settings.get("ui", "toolbar_opacity")
+    changes = []
+    settings.add_listener(changes.extend)
+    settings.set("ui", "toolbar_opacity", 0.25)
+    settings.set("ui", "toolbar_opacity", 0.25)
+    assert changes == [("ui", "toolbar_opacity", old, 0.25)]
+
+
+def test_reload_reports_external_changes(settings):
+    settings.flush()
+    settings.set("ui", "toolbar_opacity", 0.5)
+    settings.flush()
+    data = read_file(settings)
+    data["ui"]["toolbar_opacity"] = 0.9
+    with open(settings.settings_file, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+    changes = settings.reload()
+    assert changes == [("ui", "toolbar_opacity", 0.5, 0.9)]
+    assert settings.get("ui", "toolbar_opacity") == 0.9
+
+
+def test_reload_keeps_unsaved_changes(settings):
+    settings.set("ui", "toolbar_opacity", 0.5)
+    assert settings.reload() == []
+    assert settings.get("ui", "toolbar_opacity") == 0.5
+
+
+def test_flatten_settings_skips_non_dict_sections():
+    flat = flatten_settings({"ui": {"opacity": 0.9, "size": [400, 300]}, "version": 2})
+    assert flat == {("ui", "opacity"): 0.9, ("ui", "size"): [400, 300]}
+
+
+def test_diff_settings_reports_changed_added_and_removed_keys():
+    old = flatten_settings({"ui": {"opacity": 0.9, "theme": "light"}, "hotkeys": {"translate": "ctrl+shift+t"}})
+    new = flatten_settings({"ui": {"opacity": 0.8, "theme": "light", "font": 12}})
+    assert sorted(diff_settings(old, new)) == sorted([
+        ("ui", "opacity", 0.9, 0.8),
+        ("ui", "font", None, 12),
+        ("hotkeys", "translate", "ctrl+shift+t", None),
+    ])
+
+
+def test_diff_settings_of_equal_settings_is_empty():
+    flat = flatten_settings({"ui": {"size": [400, 300]}})
+    assert diff_settings(flat, dict(flat)) == []
+
+
+def test_diff_settings_detects_value_set_to_none():
+    assert diff_settings({("a", "b"): 1}, {("a", "b"): None}) == [("a", "b", 1, None)]
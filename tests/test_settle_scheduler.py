@@ -0,0 +1,99 @@
+import time
+
+import pytest
+from PyQt6.QtCore import QCoreApplication
+
+import settle_scheduler
+from settle_scheduler import SettleScheduler
+
+# 计时器需要事件循环所在的应用对象
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    # 不启动 xprop 监视进程
+    monkeypatch.setattr(settle_scheduler, "_active_window_watcher", None)
+    scheduler = SettleScheduler(initial_delay_ms=100, deadline_ms=800, max_attempts=3, alpha=0.5)
+    yield scheduler
+    scheduler.stop()
+
+
+def run_check(scheduler, elapsed_ms):
+    """模拟计时器到期并假设检查开始时已过去 elapsed_ms 毫秒"""
+    scheduler.timer.stop()
+    scheduler.on_timeout()
+    scheduler.released_at = time.perf_counter() - elapsed_ms / 1000
+
+
+def test_first_check_waits_learned_delay(scheduler):
+    scheduler.delays["editor"] = 60
+    scheduler.on_mouse_released("editor")
+    assert scheduler.timer.isActive()
+    assert scheduler.timer.interval() == 60
+
+
+def test_miss_retries_with_backoff_until_attempts_run_out(scheduler):
+    scheduler.on_mouse_released("editor")
+    run_check(scheduler, 100)
+    scheduler.report(False)
+    assert scheduler.timer.interval() == 200
+
+    run_check(scheduler, 300)
+    scheduler.report(False)
+    assert scheduler.timer.interval() == 400
+
+    run_check(scheduler, 700)
+    scheduler.report(False)
+    assert not scheduler.timer.isActive()
+
+
+def test_miss_stops_at_deadline(scheduler):
+    scheduler.on_mouse_released("editor")
+    run_check(scheduler, 700)
+    scheduler.report(False)
+    assert not scheduler.timer.isActive()
+
+
+def test_miss_without_retry_gives_up(scheduler):
+    scheduler.on_mouse_released("editor")
+    run_check(scheduler, 100)
+    scheduler.report(False, retry=False)
+    assert not scheduler.timer.isActive()
+    assert "editor" not in scheduler.delays
+
+
+def test_first_try_hit_shortens_delay(scheduler):
+    scheduler.on_mouse_released("editor")
+    run_check(scheduler, 100)
+    scheduler.report(True)
+    assert scheduler.delays["editor"] == pytest.approx(95)
+
+
+def test_late_hit_raises_delay(scheduler):
+    scheduler.on_mouse_released("editor")
+    run_check(scheduler, 100)
+    scheduler.report(False)
+    run_check(scheduler, 300)
+    scheduler.report(True)
+    assert scheduler.delays["editor"] > 100
+
+
+def test_skipped_check_retries_without_learning(scheduler):
+    scheduler.on_mouse_released("editor")
+    run_check(scheduler, 100)
+    scheduler.skip()
+    assert scheduler.timer.interval() == 200
+    run_check(scheduler, 300)
+    scheduler.report(True)
+    assert "editor" not in scheduler.delays
+
+
+def test_release_during_check_restarts(scheduler):
+    scheduler.on_mouse_released("editor")
+    run_check(scheduler, 100)
+    scheduler.on_mouse_released("browser")
+    scheduler.report(True)
+    assert scheduler.app == "browser"
+    assert scheduler.attempt == 0 and scheduler.timer.isActive()
+    assert "editor" not in scheduler.delays
@@ -0,0 +1,37 @@
+from text_segmenter import split_long, split_sentences, split_text
+
+
+def test_split_sentences_keeps_punctuation_and_spaces():
+    assert split_sentences("Hello. World! 你好。再见") == ["Hello.", " World!", " 你好。", "再见"]
+
+
+def test_split_long_prefers_spaces():
+    assert split_long("aaa bbb ccc", 8) == [("aaa bbb", False), (" ccc", False)]
+    assert split_long("a" * 10, 4) == [("aaaa", True), ("aaaa", True), ("aa", False)]
+
+
+def test_short_text_is_one_segment():
+    assert split_text("Hello. World.", 500) == [("Hello. World.", "")]
+
+
+def test_paragraph_separators_are_kept():
+    segments = split_text("First.\n\nSecond.\n", 500)
+    assert segments == [("First.", "\n\n"), ("Second.", "\n")]
+
+
+def test_hard_split_has_empty_separator():
+    segments = split_text("a" * 50, 20)
+    assert [text for text, _ in segments] == ["a" * 20, "a" * 20, "a" * 10]
+    assert all(separator == "" for _, separator in segments)
+    assert "".join(text + separator for text, separator in segments) == "a" * 50
+
+
+def test_sentence_boundary_separator_is_left_to_caller():
+    segments = split_text("One two three. Four five six.", 16)
+    assert segments == [("One two three.", None), (" Four five six.", "")]
+
+
+def test_leading_blank_lines_are_kept():
+    segments = split_text("\n\nHello.\nWorld.", 500)
+    assert segments[0] == ("", "\n\n")
+    assert "".join(text + separator for text, separator in segments) == "\n\nHello.\nWorld."
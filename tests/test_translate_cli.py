@@ -0,0 +1,75 @@
+import pytest
+
+import translate_cli
+from engine_race import FASTEST_ENGINE
+from engine_registry import EngineContext, EngineRegistry, TranslationEngineBase
+from translation_engine import TranslationEngine
+
+
+class WebOnly(TranslationEngineBase):
+    name = "网页引擎"
+
+
+class Upper(TranslationEngineBase):
+    name = "接口引擎"
+
+    def translate(self, text, from_lang="auto", to_lang="zh", cancel_event=None):
+        return text.upper()
+
+
+def create_engine(*engine_classes):
+    registry = EngineRegistry(EngineContext(), plugin_dirs=(), entry_point_group="translation_tool.tests")
+    for engine_class in engine_classes:
+        registry.register(engine_class.name, engine_class)
+    return TranslationEngine(registry=registry)
+
+
+@pytest.fixture
+def cli_engine(monkeypatch):
+    """让命令行使用测试引擎，设置中的默认引擎只能在网页中翻译"""
+    engine = create_engine(WebOnly, Upper)
+    engine.current_engine = WebOnly.name
+    monkeypatch.setattr(translate_cli, "TranslationEngine", lambda *args, **kwargs: engine)
+    monkeypatch.setattr(translate_cli, "create_translation_cache", lambda settings: None)
+    monkeypatch.setattr(translate_cli, "create_offline_dictionary", lambda settings: None)
+    return engine
+
+
+def test_default_engine_prefers_configured_api_engine():
+    engine = create_engine(WebOnly, Upper)
+    try:
+        engine.current_engine = Upper.name
+        assert translate_cli.default_engine(engine) == Upper.name
+        engine.current_engine = WebOnly.name
+        assert translate_cli.default_engine(engine) == Upper.name
+    finally:
+        engine.close()
+
+
+def test_default_engine_without_api_engines():
+    engine = create_engine(WebOnly)
+    try:
+        engine.current_engine = WebOnly.name
+        assert translate_cli.default_engine(engine) == FASTEST_ENGINE
+    finally:
+        engine.close()
+
+
+def test_translates_file_with_web_only_default(cli_engine, tmp_path):
+    source = tmp_path / "input.txt"
+    source.write_text("hello\n\nworld\nhello\n", encoding="utf-8")
+    output = tmp_path / "output.txt"
+    assert translate_cli.main([str(source), "-o", str(output), "--from", "en", "--tsv"]) == 0
+    assert output.read_text(encoding="utf-8") == "hello\tHELLO\n\t\nworld\tWORLD\nhello\tHELLO\n"
+
+
+def test_rejects_web_only_engine(cli_engine, tmp_path):
+    source = tmp_path / "input.txt"
+    source.write_text("hello\n", encoding="utf-8")
+    assert translate_cli.main([str(source), "--engine", WebOnly.name]) == 2
+
+
+def test_rejects_unknown_engine(cli_engine, tmp_path):
+    source = tmp_path / "input.txt"
+    source.write_text("hello\n", encoding="utf-8")
+    assert translate_cli.main([str(source), "--engine", "不存在的引擎"]) == 2
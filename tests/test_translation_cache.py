@@ -0,0 +1,74 @@
+import time
+
+from translation_cache import TranslationCache
+
+
+def create_cache(tmp_path, **kwargs):
+    return TranslationCache(str(tmp_path / "cache.db"), **kwargs)
+
+
+def test_put_and_get_normalizes_whitespace(tmp_path):
+    cache = create_cache(tmp_path)
+    try:
+        cache.put("引擎", "en", "zh", "hello  world", "你好世界")
+        assert cache.get("引擎", "en", "zh", " hello world ") == "你好世界"
+        assert cache.get("引擎", "en", "ja", "hello world") is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["memory_hits"]) == (1, 1, 1)
+    finally:
+        cache.close()
+
+
+def test_memory_lru_evicts_least_recently_used(tmp_path):
+    cache = create_cache(tmp_path, memory_entries=2)
+    try:
+        cache.put("引擎", "en", "zh", "a", "甲")
+        cache.put("引擎", "en", "zh", "b", "乙")
+        assert cache.get("引擎", "en", "zh", "a", memory_only=True) == "甲"
+        cache.put("引擎", "en", "zh", "c", "丙")
+
+        assert cache.get("引擎", "en", "zh", "b", memory_only=True) is None
+        assert cache.get("引擎", "en", "zh", "a", memory_only=True) == "甲"
+        assert cache.stats()["memory_evictions"] == 1
+        # 被挤出内存的记录仍可从磁盘读取
+        assert cache.get("引擎", "en", "zh", "b") == "乙"
+        assert cache.stats()["disk_hits"] == 1
+    finally:
+        cache.close()
+
+
+def test_memory_only_miss_is_not_counted(tmp_path):
+    cache = create_cache(tmp_path)
+    try:
+        assert cache.get("引擎", "en", "zh", "missing", memory_only=True) is None
+        assert cache.stats()["misses"] == 0
+        assert cache.get("引擎", "en", "zh", "missing") is None
+        assert cache.stats()["misses"] == 1
+    finally:
+        cache.close()
+
+
+def test_expired_entries_are_misses(tmp_path, monkeypatch):
+    cache = create_cache(tmp_path, max_age_days=1)
+    try:
+        cache.put("引擎", "en", "zh", "hello", "你好")
+        later = time.time() + 2 * 86400
+        monkeypatch.setattr(time, "time", lambda: later)
+        assert cache.get("引擎", "en", "zh", "hello") is None
+        cache.evict()
+        assert cache.stats()["disk_evictions"] == 1
+    finally:
+        cache.close()
+
+
+def test_disk_eviction_keeps_max_entries(tmp_path):
+    cache = create_cache(tmp_path, memory_entries=0, max_entries=3)
+    try:
+        for index in range(5):
+            cache.put("引擎", "en", "zh", f"text {index}", f"译文 {index}")
+        cache.evict()
+        assert cache.stats()["disk_evictions"] == 2
+        assert cache.get("引擎", "en", "zh", "text 0") is None
+        assert cache.get("引擎", "en", "zh", "text 4") == "译文 4"
+    finally:
+        cache.close()
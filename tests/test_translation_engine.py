@@ -0,0 +1,74 @@
+from builtin_engines import LocalDictEngine
+from engine_race import FASTEST_ENGINE
+from engine_registry import EngineContext, EngineRegistry, TranslationEngineBase
+from offline_dict import LOCAL_DICT_ENGINE, OfflineDictionary
+from translation_engine import TranslationEngine
+
+
+class Short(TranslationEngineBase):
+    name = "短文本引擎"
+    max_chars = 100
+
+    def translate(self, text, from_lang="auto", to_lang="zh", cancel_event=None):
+        return text
+
+
+class Unlimited(TranslationEngineBase):
+    name = "不限长度引擎"
+
+    def translate(self, text, from_lang="auto", to_lang="zh", cancel_event=None):
+        return text
+
+
+def create_engine(offline_dict=None):
+    registry = EngineRegistry(EngineContext(offline_dict=offline_dict), plugin_dirs=(),
+                              entry_point_group="translation_tool.tests")
+    for engine_class in (Short, Unlimited, LocalDictEngine):
+        registry.register(engine_class.name, engine_class)
+    return TranslationEngine(registry=registry, offline_dict=offline_dict)
+
+
+def test_local_dict_hidden_without_offline_dict():
+    engine = create_engine()
+    try:
+        assert LOCAL_DICT_ENGINE not in engine.get_engines()
+        assert set(engine.get_engines()) == {Short.name, Unlimited.name}
+    finally:
+        engine.close()
+
+
+def test_local_dict_listed_with_offline_dict():
+    class FakeDictionary:
+        def open(self):
+            return True
+
+        def lookup(self, text, from_lang, to_lang):
+            return None
+
+        def close(self):
+            pass
+
+    engine = create_engine(FakeDictionary())
+    try:
+        assert LOCAL_DICT_ENGINE in engine.get_engines()
+    finally:
+        engine.close()
+
+
+def test_local_dict_hidden_when_index_missing(tmp_path):
+    engine = create_engine(OfflineDictionary(str(tmp_path / "missing.idx")))
+    try:
+        assert LOCAL_DICT_ENGINE not in engine.get_engines()
+    finally:
+        engine.close()
+
+
+def test_max_chars_per_engine():
+    engine = create_engine()
+    try:
+        assert engine.max_chars(Short.name) == 100
+        assert engine.max_chars(Unlimited.name) is None
+        # 最快引擎模式下片段需要满足所有引擎的限制
+        assert engine.max_chars(FASTEST_ENGINE) == 100
+    finally:
+        engine.close()
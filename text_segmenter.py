@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import re
+
+# 句子结束位置：中文句末标点之后，或英文句末标点后跟空白
+SENTENCE_END = re.compile(r'(?<=[。！？；…])|(?<=[.!?;])(?=\s)')
+# 段落分隔：换行（保留换行本身作为分隔符）
+PARAGRAPH_SPLIT = re.compile(r'(\n+)')
+
+
+def split_sentences(paragraph):
+    """按句末标点把段落切分为句子，句子保留原有的标点和空白"""
+    sentences = []
+    start = 0
+    for match in SENTENCE_END.finditer(paragraph):
+        end = match.start()
+        if end > start:
+            sentences.append(paragraph[start:end])
+            start = end
+    if start < len(paragraph):
+        sentences.append(paragraph[start:])
+    return sentences
+
+
+def split_long(sentence, max_chars):
+    """没有标点可切的超长句子按空白或固定长度强制切分
+
+    返回 [(片段, 是否在词中间强制切开)]，强制切开的片段与下一片段之间原本没有空白。
+    """
+    pieces = []
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(" ", 0, max_chars)
+        hard = cut <= 0
+        if hard:
+            cut = max_chars
+        pieces.append((sentence[:cut], hard))
+        sentence = sentence[cut:]
+    if sentence:
+        pieces.append((sentence, False))
+    return pieces
+
+
+def split_text(text, max_chars=500):
+    """把文本按段落和句子边界切分为不超过 max_chars 的片段
+
+    返回 [(片段文本, 片段后的分隔符)] 列表，把每个片段的译文和分隔符依次拼接即可还原段落结构：
+    段落之间的分隔符是原文中的换行；同一段落内句子或单词之间的分隔符为 None，由调用方按译文语言
+    决定是否加空格；在词中间强制切开的位置分隔符为空字符串。文本开头的空行作为一个空片段保留。
+    """
+    segments = []
+    leading = ""
+    parts = PARAGRAPH_SPLIT.split(text)
+    # parts 形如 [段落, 换行, 段落, 换行, ...]
+    for index in range(0, len(parts), 2):
+        paragraph = parts[index]
+        separator = parts[index + 1] if index + 1 < len(parts) else ""
+        if not paragraph.strip():
+            if segments:
+                segments[-1] = (segments[-1][0], segments[-1][1] + paragraph + separator)
+            else:
+                leading += paragraph + separator
+            continue
+
+        chunk = ""
+        hard = False
+        for sentence in split_sentences(paragraph):
+            for piece, hard_cut in split_long(sentence, max_chars):
+                if chunk and len(chunk) + len(piece) > max_chars:
+                    segments.append((chunk, "" if hard else None))
+                    chunk = ""
+                chunk += piece
+                hard = hard_cut
+        segments.append((chunk, separator))
+    if leading and segments:
+        segments.insert(0, ("", leading))
+    return segments
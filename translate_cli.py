@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""命令行批量翻译，不启动图形界面
+
+    python -m translate_cli words.txt -o words.zh.txt
+    cat words.txt | python -m translate_cli --engine 有道翻译 --to zh --tsv
+
+每行输入对应一行输出，顺序与输入一致；重复的行只翻译一次。
+使用与图形界面相同的设置、翻译引擎和翻译缓存，可以用来预先填充缓存。
+"""
+
+import sys
+import time
+import argparse
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from settings import app_settings
+from translation_engine import TranslationEngine
+from translation_cache import create_translation_cache
+from offline_dict import create_offline_dictionary
+from engine_race import FASTEST_ENGINE, EngineRacer
+from lang_detect import detect_language
+
+
+class BatchTranslator:
+    """按输入顺序产出译文的批量翻译器，同时进行的请求数不超过 concurrency"""
+    # 记住最近多少个不同的行用于合并重复行，更早的重复行由翻译缓存命中
+    MAX_REMEMBERED_LINES = 4096
+
+    def __init__(self, engine, engine_name, from_lang="auto", to_lang="zh", concurrency=4):
+        self.engine = engine
+        self.engine_name = engine_name
+        self.from_lang = from_lang
+        self.to_lang = to_lang
+        self.concurrency = concurrency
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch")
+        self.racer = EngineRacer(engine) if engine_name == FASTEST_ENGINE else None
+        # {文本: future}，重复的行直接使用已提交的结果，按最近使用顺序只保留有限数量
+        self.submitted = OrderedDict()
+        self.lines = 0
+        self.translated = 0
+        self.duplicates = 0
+        self.failures = 0
+
+    def translate_line(self, text):
+        """翻译一行，没有结果时返回 None"""
+        from_lang = self.from_lang
+        if from_lang == "auto":
+            from_lang = detect_language(text).language or "auto"
+
+        result = self.engine.lookup_local(text, from_lang, self.to_lang)
+        if result is not None:
+            return result
+        if self.racer is not None:
+            return self.racer.race(text, from_lang, self.to_lang, self.engine.get_engines())[1]
+        return self.engine.request_translation(text, from_lang, self.to_lang, self.engine_name)
+
+    def submit(self, text):
+        """提交一行，返回 (future, 是否为重复的行)"""
+        future = self.submitted.get(text)
+        if future is not None:
+            self.submitted.move_to_end(text)
+            self.duplicates += 1
+            return future, True
+        future = self.executor.submit(self.translate_line, text)
+        self.submitted[text] = future
+        if len(self.submitted) > self.MAX_REMEMBERED_LINES:
+            self.submitted.popitem(last=False)
+        return future, False
+
+    def translate(self, lines):
+        """逐行产出 (原文, 译文)；空行原样产出，翻译失败时译文为 None"""
+        # 已提交但尚未产出的行，数量有上限以免读入整个输入
+        window = deque()
+        max_pending = self.concurrency * 4
+        for line in lines:
+            text = line.rstrip("\r\n")
+            self.lines += 1
+            window.append((text, *(self.submit(text) if text.strip() else (None, False))))
+            while len(window) > max_pending:
+                yield self.result(*window.popleft())
+        while window:
+            yield self.result(*window.popleft())
+
+    def result(self, text, future, duplicate=False):
+        if future is None:
+            return text, ""
+        try:
+            translation = future.result()
+        except Exception as e:
+            if not duplicate:
+                print(f"翻译出错: {text}: {str(e)}", file=sys.stderr)
+            translation = None
+        # 重复的行已计入 duplicates，翻译和失败只按不同的行统计
+        if duplicate:
+            pass
+        elif translation is None:
+            self.failures += 1
+        else:
+            self.translated += 1
+        return text, translation
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.racer is not None:
+            self.racer.shutdown()
+
+
+def usable_engines(engine):
+    """有翻译接口的引擎名称，只能在网页中翻译的引擎不能在命令行中使用"""
+    names = []
+    for name in engine.get_engines():
+        instance = engine.registry.get(name)
+        if instance is not None and instance.has_api():
+            names.append(name)
+    return names
+
+
+def default_engine(engine):
+    """默认引擎：设置中的引擎有翻译接口时使用它，否则使用第一个有接口的引擎，都没有时使用最快引擎"""
+    configured = engine.current_engine
+    usable = usable_engines(engine)
+    if configured == FASTEST_ENGINE or configured in usable:
+        return configured
+    return usable[0] if usable else FASTEST_ENGINE
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="命令行批量翻译")
+    parser.add_argument("input", nargs="?", help="输入文件，每行一条文本；省略时从标准输入读取")
+    parser.add_argument("-o", "--output", help="输出文件，省略时写到标准输出")
+    parser.add_argument("--engine", help="翻译引擎，默认使用设置中的引擎，该引擎只能在网页中翻译时使用第一个有接口的引擎")
+    parser.add_argument("--from", dest="from_lang", default="auto", help="源语言，默认逐行自动检测")
+    parser.add_argument("--to", dest="to_lang", default=app_settings.get("translation", "default_target_lang", "zh"),
+                        help="目标语言，默认使用设置中的目标语言")
+    parser.add_argument("-j", "--concurrency", type=int, default=4, help="同时进行的请求数，默认 4")
+    parser.add_argument("--tsv", action="store_true", help="输出“原文<制表符>译文”")
+    args = parser.parse_args(argv)
+
+    engine = TranslationEngine(create_translation_cache(app_settings),
+                               offline_dict=create_offline_dictionary(app_settings))
+    engine_name = args.engine or default_engine(engine)
+    if engine_name != FASTEST_ENGINE:
+        selected = engine.registry.get(engine_name)
+        if selected is None:
+            print(f"未知的翻译引擎: {engine_name}，可用: {'、'.join(usable_engines(engine))}", file=sys.stderr)
+            engine.close()
+            return 2
+        if not selected.has_api():
+            print(f"翻译引擎 {engine_name} 只能在网页中翻译，请使用 --engine 选择: {'、'.join(usable_engines(engine))}",
+                  file=sys.stderr)
+            engine.close()
+            return 2
+
+    source = open(args.input, "r", encoding="utf-8") if args.input else sys.stdin
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    translator = BatchTranslator(engine, engine_name, args.from_lang, args.to_lang, max(1, args.concurrency))
+    start = time.perf_counter()
+    try:
+        for text, translation in translator.translate(source):
+            # 译文中的换行会打乱行对应关系，替换为空格
+            translation = (translation or "").replace("\r", " ").replace("\n", " ")
+            output.write(f"{text}\t{translation}\n" if args.tsv else translation + "\n")
+            if output is sys.stdout:
+                output.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        elapsed = time.perf_counter() - start
+        translator.shutdown()
+        engine.close()
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    rate = translator.lines / elapsed if elapsed > 0 else 0.0
+    print(f"共 {translator.lines} 行，翻译 {translator.translated} 行，重复 {translator.duplicates} 行，"
+          f"失败 {translator.failures} 行，耗时 {elapsed:.2f} 秒，{rate:.1f} 行/秒", file=sys.stderr)
+    return 1 if translator.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+class TranslationCache:
+    """翻译缓存：内存LRU缓存 + SQLite磁盘存储"""
+
+    # 每写入多少条记录执行一次淘汰
+    EVICT_EVERY = 200
+    # 磁盘命中后访问时间的更新攒够多少条再写入
+    TOUCH_BATCH = 32
+
+    def __init__(self, db_path, memory_entries=256, max_entries=10000, max_age_days=30):
+        self.db_path = db_path
+        self.memory_entries = max(0, int(memory_entries))
+        self.max_entries = max(1, int(max_entries))
+        self.max_age = max(0, float(max_age_days)) * 86400
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        # 被淘汰的内存和磁盘记录数
+        self.memory_evictions = 0
+        self.disk_evictions = 0
+        self.puts_since_evict = 0
+        # 尚未写入磁盘的访问时间 {缓存键: 访问时间}
+        self.pending_touches = {}
+        self.conn = None
+
+        try:
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS translations (
+                    engine TEXT NOT NULL,
+                    from_lang TEXT NOT NULL,
+                    to_lang TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (engine, from_lang, to_lang, source)
+                ) WITHOUT ROWID
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON translations (accessed_at)")
+            self.conn.commit()
+            self.evict()
+        except sqlite3.Error as e:
+            print(f"打开翻译缓存出错: {str(e)}")
+            self.conn = None
+
+    @staticmethod
+    def normalize(text):
+        """规范化文本：去除首尾空白并合并连续空白"""
+        return " ".join(text.split())
+
+    def make_key(self, engine, from_lang, to_lang, text):
+        """生成缓存键"""
+        return (engine, from_lang, to_lang, self.normalize(text))
+
+    def get(self, engine, from_lang, to_lang, text, memory_only=False):
+        """查询缓存，未命中时返回 None
+        
+        memory_only 为 True 时只查询内存缓存，不读取磁盘，未命中也不计入统计，
+        适合在界面线程中调用；随后在工作线程中的完整查询才计为未命中。
+        """
+        key = self.make_key(engine, from_lang, to_lang, text)
+        with self.lock:
+            result = self._get_from_memory(key)
+            if result is not None:
+                self.hits += 1
+                self.memory_hits += 1
+                return result
+            if memory_only:
+                return None
+
+            entry = self._get_from_disk(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            result, created_at = entry
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, result, created_at)
+            return result
+
+    def put(self, engine, from_lang, to_lang, text, result):
+        """写入缓存"""
+        key = self.make_key(engine, from_lang, to_lang, text)
+        if not key[3] or not result:
+            return
+        with self.lock:
+            now = time.time()
+            self._remember(key, result, now)
+            if self.conn is None:
+                return
+            self.pending_touches.pop(key, None)
+            try:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    key + (result, now, now))
+                # 顺便写入攒下的访问时间，与本次写入共用一次提交
+                self._write_touches_locked()
+                self.conn.commit()
+            except sqlite3.Error as e:
+                print(f"写入翻译缓存出错: {str(e)}")
+                return
+            self.puts_since_evict += 1
+            if self.puts_since_evict >= self.EVICT_EVERY:
+                self._evict_locked()
+
+    def evict(self):
+        """按过期时间和容量淘汰磁盘缓存"""
+        with self.lock:
+            self._evict_locked()
+
+    def stats(self):
+        """获取缓存命中统计"""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "hit_rate": self.hits / total if total else 0.0,
+                "memory_size": len(self.memory),
+                "memory_evictions": self.memory_evictions,
+                "disk_evictions": self.disk_evictions,
+            }
+
+    def clear(self):
+        """清空缓存"""
+        with self.lock:
+            self.memory.clear()
+            self.pending_touches.clear()
+            if self.conn is not None:
+                self.conn.execute("DELETE FROM translations")
+                self.conn.commit()
+
+    def close(self):
+        """关闭磁盘存储"""
+        with self.lock:
+            if self.conn is not None:
+                try:
+                    self._write_touches_locked()
+                    self.conn.commit()
+                except sqlite3.Error as e:
+                    print(f"写入翻译缓存出错: {str(e)}")
+                self.conn.close()
+                self.conn = None
+
+    def _get_from_memory(self, key):
+        """从内存LRU缓存读取，过期记录视为未命中并移除"""
+        entry = self.memory.get(key)
+        if entry is None:
+            return None
+        result, created_at = entry
+        if self.max_age and time.time() - created_at > self.max_age:
+            del self.memory[key]
+            return None
+        self.memory.move_to_end(key)
+        return result
+
+    def _remember(self, key, result, created_at):
+        """写入内存LRU缓存"""
+        if self.memory_entries <= 0:
+            return
+        self.memory[key] = (result, created_at)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+            self.memory_evictions += 1
+
+    def _get_from_disk(self, key):
+        """从磁盘读取缓存，返回 (译文, 写入时间)，过期记录视为未命中"""
+        if self.conn is None:
+            return None
+        try:
+            row = self.conn.execute(
+                "SELECT result, created_at FROM translations "
+                "WHERE engine = ? AND from_lang = ? AND to_lang = ? AND source = ?", key).fetchone()
+            if row is None:
+                return None
+            if self.max_age and time.time() - row[1] > self.max_age:
+                return None
+            # 访问时间只用于淘汰，攒够一批再写入，避免每次命中都提交一次
+            self.pending_touches[key] = time.time()
+            if len(self.pending_touches) >= self.TOUCH_BATCH:
+                self._write_touches_locked()
+                self.conn.commit()
+            return row
+        except sqlite3.Error as e:
+            print(f"读取翻译缓存出错: {str(e)}")
+            return None
+
+    def _write_touches_locked(self):
+        """写入攒下的访问时间，由调用方提交（调用方需持有锁）"""
+        if not self.pending_touches:
+            return
+        touches = [(accessed_at,) + key for key, accessed_at in self.pending_touches.items()]
+        self.pending_touches.clear()
+        self.conn.executemany(
+            "UPDATE translations SET accessed_at = ? "
+            "WHERE engine = ? AND from_lang = ? AND to_lang = ? AND source = ?", touches)
+
+    def _evict_locked(self):
+        """淘汰过期和超出容量的记录（调用方需持有锁）"""
+        self.puts_since_evict = 0
+        if self.conn is None:
+            return
+        try:
+            self._write_touches_locked()
+            if self.max_age:
+                self.disk_evictions += self.conn.execute(
+                    "DELETE FROM translations WHERE created_at < ?", (time.time() - self.max_age,)).rowcount
+            count = self.conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            if count > self.max_entries:
+                # 按最近访问时间淘汰最久未使用的记录
+                self.disk_evictions += self.conn.execute("""
+                    DELETE FROM translations WHERE (engine, from_lang, to_lang, source) IN (
+                        SELECT engine, from_lang, to_lang, source FROM translations
+                        ORDER BY accessed_at LIMIT ?
+                    )
+                """, (count - self.max_entries,)).rowcount
+            self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"清理翻译缓存出错: {str(e)}")
+
+
+def create_translation_cache(settings):
+    """根据设置创建翻译缓存，未启用时返回 None"""
+    if not settings.get("translation", "cache_enabled", True):
+        return None
+    db_path = os.path.join(os.path.dirname(settings.settings_file), "translation_cache.db")
+    return TranslationCache(
+        db_path,
+        memory_entries=settings.get("translation", "cache_memory_entries", 256),
+        max_entries=settings.get("translation", "cache_max_entries", 10000),
+        max_age_days=settings.get("translation", "cache_max_age_days", 30),
+    )
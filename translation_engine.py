@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import urllib.parse
+
+from settings import app_settings
+from http_client import create_http_client, EngineUnavailableError
+from engine_race import FASTEST_ENGINE
+from offline_dict import LOCAL_DICT_ENGINE
+from engine_registry import EngineRegistry, EngineContext
+from builtin_engines import register_builtin_engines
+from request_control import SingleFlight, RateLimiter
+
+
+class TranslationEngine:
+    """翻译引擎接口类，具体引擎由引擎注册表按名称提供"""
+    
+    def __init__(self, cache=None, http_client=None, offline_dict=None, registry=None):
+        self.current_engine = app_settings.get("translation", "default_engine", "百度翻译")
+        # 所有引擎共享的HTTP客户端（连接池、超时、重试和熔断）
+        self.http = http_client or create_http_client(app_settings)
+        # 翻译缓存，命中时不再发起网络请求
+        self.cache = cache
+        # 本地离线词典，短文本优先在本地查询
+        self.offline_dict = offline_dict
+        self.offline_max_chars = app_settings.get("translation", "offline_dict_max_chars", 40)
+        # 翻译引擎注册表：内置引擎、plugins 目录和入口点中的引擎，实例在首次使用时创建并共享
+        if registry is None:
+            registry = EngineRegistry(EngineContext(self.http, app_settings, offline_dict))
+            register_builtin_engines(registry)
+        self.registry = registry
+        # 相同的并发请求只发起一次网络请求
+        self.single_flight = SingleFlight()
+        # 按引擎限制请求频率，{引擎名称: [每秒请求数, 突发请求数]}
+        self.rate_limiter = RateLimiter(app_settings.get("translation", "engine_rate_limits", {}))
+        
+    def lookup_cached(self, text, from_lang="auto", to_lang="zh", engine_name=None, memory_only=False):
+        """查询翻译缓存，未命中时返回 None；memory_only 为 True 时不读取磁盘，可在界面线程中调用"""
+        if self.cache is None or not text or text.isspace():
+            return None
+        engine_name = engine_name or self.current_engine
+        if engine_name == FASTEST_ENGINE:
+            # 最快引擎模式下任一引擎的缓存结果都可以直接使用
+            for name in self.get_engines():
+                result = self.cache.get(name, from_lang, to_lang, text, memory_only)
+                if result is not None:
+                    return result
+            return None
+        return self.cache.get(engine_name, from_lang, to_lang, text, memory_only)
+    
+    def lookup_local(self, text, from_lang="auto", to_lang="zh"):
+        """在本地词典中查询短文本，未找到或文本过长时返回 None"""
+        if not text or len(text) > self.offline_max_chars:
+            return None
+        engine = self.registry.get(LOCAL_DICT_ENGINE)
+        return engine.translate(text, from_lang, to_lang) if engine else None
+    
+    def local_fallback(self, text, from_lang="auto", to_lang="zh"):
+        """网络引擎请求失败时使用本地词典的结果，未找到时返回 None"""
+        result = self.lookup_local(text, from_lang, to_lang)
+        if result is None:
+            return None
+        return f"{result}\n\n（在线翻译失败，以上为{LOCAL_DICT_ENGINE}结果）"
+    
+    def request_translation_stream(self, text, from_lang="auto", to_lang="zh", engine_name=None, cancel_event=None):
+        """向翻译引擎的接口请求译文，逐段产出
+        
+        引擎没有可用的翻译接口时不产出任何内容；请求失败时抛出异常。
+        """
+        engine_name = engine_name or self.current_engine
+        engine = self.registry.get(engine_name)
+        if engine is None:
+            return
+        
+        local = engine.capabilities.get("local", False)
+        if not local:
+            cached = self.lookup_cached(text, from_lang, to_lang, engine_name)
+            if cached is not None:
+                yield cached
+                return
+        
+        if local:
+            yield from engine.translate_stream(text, from_lang, to_lang, cancel_event)
+            return
+        
+        key = (engine_name, from_lang, to_lang, text)
+        while True:
+            leader, flight = self.single_flight.join(key)
+            if leader:
+                break
+            # 相同的请求正在进行，等待它的结果
+            result = flight.wait(cancel_event)
+            if flight.abandoned and not (cancel_event is not None and cancel_event.is_set()):
+                # 执行请求的调用方被取消了，由本请求接替执行
+                continue
+            if result:
+                yield result
+            return
+        
+        def cancelled():
+            return cancel_event is not None and cancel_event.is_set()
+        
+        chunks = []
+        try:
+            if not self.rate_limiter.acquire(engine_name, engine.rate_limit, cancel_event):
+                # 等待配额时被取消：不发布空结果，交给等待同一结果的请求继续
+                self.single_flight.abandon(key, flight)
+                return
+            stream = engine.translate_stream(text, from_lang, to_lang, cancel_event)
+            try:
+                for chunk in stream:
+                    chunks.append(chunk)
+                    yield chunk
+            except GeneratorExit:
+                # 调用方不再需要结果，仍然读完响应交给等待同一结果的请求
+                try:
+                    chunks.extend(stream)
+                    if cancelled():
+                        self.single_flight.abandon(key, flight)
+                    else:
+                        flight.set_result("".join(chunks) or None)
+                except Exception as e:
+                    flight.set_error(e)
+                raise
+            if cancelled():
+                # 请求被取消，译文可能不完整，不发布也不缓存
+                self.single_flight.abandon(key, flight)
+                return
+            translated = "".join(chunks) or None
+            flight.set_result(translated)
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            flight.set_error(e)
+            raise
+        finally:
+            self.single_flight.leave(key, flight)
+        # 只缓存网络接口的翻译结果
+        if translated and self.cache is not None:
+            self.cache.put(engine_name, from_lang, to_lang, text, translated)
+    
+    def request_translation(self, text, from_lang="auto", to_lang="zh", engine_name=None, cancel_event=None):
+        """向翻译引擎的接口请求完整译文
+        
+        返回译文；引擎没有可用的翻译接口时返回 None；请求失败时抛出异常。
+        """
+        translated = "".join(self.request_translation_stream(text, from_lang, to_lang, engine_name, cancel_event))
+        return translated or None
+    
+    def translate_stream(self, text, from_lang="auto", to_lang="zh", engine_name=None, cancel_event=None):
+        """流式翻译，逐段产出译文，可在后台线程中调用"""
+        if not text or text.isspace():
+            yield "没有选中文本或文本为空"
+            return
+        
+        # 显式传入引擎名称，避免后台线程读取被界面线程修改的当前引擎
+        engine_name = engine_name or self.current_engine
+        if engine_name == FASTEST_ENGINE:
+            engine_name = self.get_engines()[0]
+        engine = self.registry.get(engine_name)
+        if engine is None:
+            yield "翻译引擎未配置"
+            return
+        
+        # 使用API进行翻译
+        produced = False
+        try:
+            for chunk in self.request_translation_stream(text, from_lang, to_lang, engine_name, cancel_event):
+                produced = True
+                yield chunk
+            if not produced:
+                # 如果没有API或没有结果，显示引擎提供的提示
+                yield engine.placeholder(text, from_lang, to_lang)
+            
+        except EngineUnavailableError as e:
+            if not produced:
+                yield self.local_fallback(text, from_lang, to_lang) or \
+                    f'{str(e)}，请稍后重试或切换翻译引擎。\n\n您可以点击"打开网页"在浏览器中查看翻译。'
+        except Exception as e:
+            local = None if produced else self.local_fallback(text, from_lang, to_lang)
+            if local:
+                yield local
+                return
+            prefix = "\n\n" if produced else ""
+            yield f'{prefix}翻译出错: {str(e)}\n\n您可以点击"打开网页"在浏览器中查看翻译。'
+        
+    def translate(self, text, from_lang="auto", to_lang="zh", engine_name=None, cancel_event=None):
+        """进行文本翻译，可在后台线程中调用"""
+        return "".join(self.translate_stream(text, from_lang, to_lang, engine_name, cancel_event))
+    
+    def get_translation_url(self, text, from_lang="auto", to_lang="zh", engine_name=None):
+        """获取翻译网页URL"""
+        engine_name = engine_name or self.current_engine
+        if engine_name == FASTEST_ENGINE:
+            engine_name = self.get_engines()[0]
+        engine = self.registry.get(engine_name)
+        if engine is None:
+            return ""
+            
+        # 编码查询参数
+        return engine.web_url(text, from_lang, to_lang, urllib.parse.quote(text))
+    
+    def engine_stats(self):
+        """获取各翻译引擎的延迟和成功率统计"""
+        return self.http.all_stats()
+    
+    def request_stats(self):
+        """获取合并的重复请求数、各引擎被限流的次数和翻译缓存的命中统计"""
+        stats = self.single_flight.stats()
+        stats["throttled"] = self.rate_limiter.stats()
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        return stats
+    
+    def get_engines(self):
+        """获取所有支持的翻译引擎名称：设置中的引擎在前，插件新增的引擎在后
+
+        没有可用的离线词典（未启用或索引文件不存在）时不列出本地词典。
+        """
+        has_offline_dict = self.offline_dict is not None and self.offline_dict.open()
+        registered = [name for name in self.registry.names() if name != LOCAL_DICT_ENGINE or has_offline_dict]
+        configured = app_settings.get("translation", "available_engines", registered)
+        engines = [name for name in configured if name in registered]
+        return engines + [name for name in registered if name not in engines]
+    
+    def max_chars(self, engine_name=None):
+        """引擎单次请求的最大字符数，不限制时返回 None；最快引擎模式下取各引擎中最小的限制"""
+        engine_name = engine_name or self.current_engine
+        names = self.get_engines() if engine_name == FASTEST_ENGINE else [engine_name]
+        engines = [self.registry.get(name) for name in names]
+        limits = [engine.max_chars for engine in engines if engine is not None and engine.max_chars]
+        return min(limits) if limits else None
+    
+    def set_engine(self, engine_name):
+        """设置当前使用的翻译引擎"""
+        if engine_name in self.registry or engine_name == FASTEST_ENGINE:
+            self.current_engine = engine_name
+            app_settings.set("translation", "default_engine", engine_name)
+            return True
+        return False
+    
+    def close(self):
+        """释放引擎占用的资源"""
+        self.registry.close()
+        if self.offline_dict is not None:
+            self.offline_dict.close()
+        if self.cache is not None:
+            self.cache.close()
+        self.http.close()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from engine_race import FASTEST_ENGINE, EngineRacer
+from text_segmenter import split_text
+
+# 译文中句子之间不加空格的目标语言
+NO_SPACE_LANGS = ("zh", "ja")
+
+
+class TranslationPipeline(QObject):
+    """异步翻译流水线，在后台线程池中执行翻译请求，避免阻塞界面线程"""
+    translation_chunk = pyqtSignal(int, str)
+    translation_progress = pyqtSignal(int, int, int)
+    translation_finished = pyqtSignal(int, str)
+
+    # 工作线程发出的内部信号，跨线程时自动以队列方式投递到界面线程
+    _worker_chunk = pyqtSignal(int, str)
+    _worker_progress = pyqtSignal(int, int, int)
+    _worker_done = pyqtSignal(int, str)
+
+    def __init__(self, engine, max_workers=2, chunk_max_chars=500, chunk_concurrency=3):
+        super().__init__()
+        self.engine = engine
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translate")
+        # 长文本分段并行翻译，使用独立线程池避免与整体请求互相等待
+        self.chunk_max_chars = chunk_max_chars
+        self.chunk_executor = ThreadPoolExecutor(max_workers=chunk_concurrency, thread_name_prefix="chunk")
+        self.current_request_id = 0
+        self.current_future = None
+        self.cancel_event = threading.Event()
+        # 最快引擎模式下同时请求多个引擎
+        self.racer = EngineRacer(engine)
+        self._worker_chunk.connect(self._on_worker_chunk)
+        self._worker_progress.connect(self._on_worker_progress)
+        self._worker_done.connect(self._on_worker_done)
+
+    def submit(self, text, from_lang="auto", to_lang="zh", engine_name=None):
+        """提交翻译请求，返回请求编号；新的请求会取消尚未完成的旧请求"""
+        self.cancel()
+
+        # 内存缓存命中或短文本在本地词典中查到时直接返回结果，无需进入线程池；
+        # 磁盘缓存在工作线程中查询，避免在界面线程中读写数据库
+        cached = self.engine.lookup_cached(text, from_lang, to_lang, engine_name, memory_only=True)
+        if cached is None:
+            cached = self.engine.lookup_local(text, from_lang, to_lang)
+        if cached is not None:
+            self.translation_finished.emit(self.current_request_id, cached)
+            return self.current_request_id
+
+        # 长文本按段落和句子切分后并行翻译，片段不超过引擎单次请求的字符数限制
+        max_chars = self.chunk_max_chars
+        engine_max_chars = self.engine.max_chars(engine_name)
+        if engine_max_chars:
+            max_chars = min(max_chars, engine_max_chars)
+        segments = split_text(text, max_chars)
+        if len(segments) > 1:
+            return self._start(self._chunked_stream, self.current_request_id, segments, from_lang, to_lang, engine_name)
+
+        if engine_name == FASTEST_ENGINE:
+            return self._start(self._race_stream, text, from_lang, to_lang)
+        return self._start(self.engine.translate_stream, text, from_lang, to_lang, engine_name)
+
+    def _start(self, stream_func, *args):
+        """以当前请求编号提交后台任务"""
+        request_id = self.current_request_id
+        self.cancel_event = threading.Event()
+        self.current_future = self.executor.submit(self._run, request_id, stream_func, args, self.cancel_event)
+        return request_id
+
+    def cancel(self):
+        """取消当前请求，已在执行中的请求不再重试，其结果将被丢弃"""
+        if self.current_future is not None:
+            self.current_future.cancel()
+            self.current_future = None
+        self.cancel_event.set()
+        self.current_request_id += 1
+
+    def is_current(self, request_id):
+        """判断请求是否仍是最新的请求"""
+        return request_id == self.current_request_id and self.current_future is not None
+
+    def shutdown(self):
+        """关闭线程池"""
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.chunk_executor.shutdown(wait=False, cancel_futures=True)
+        self.racer.shutdown()
+
+    def _run(self, request_id, stream_func, args, cancel_event):
+        """在工作线程中逐段执行，每段结果立即发送到界面线程"""
+        chunks = []
+        try:
+            for chunk in stream_func(*args, cancel_event=cancel_event):
+                if cancel_event.is_set():
+                    return
+                chunks.append(chunk)
+                self._worker_chunk.emit(request_id, chunk)
+        except Exception as e:
+            # 已经显示了部分结果时，错误信息作为最后一段追加，否则会被已显示的内容覆盖
+            prefix = "\n\n" if chunks else ""
+            error = f"{prefix}翻译出错: {str(e)}"
+            chunks.append(error)
+            self._worker_chunk.emit(request_id, error)
+        self._worker_done.emit(request_id, "".join(chunks))
+
+    def _race_stream(self, text, from_lang, to_lang, cancel_event=None):
+        """同时请求所有可用引擎，使用最先成功的结果"""
+        engines = self.engine.get_engines()
+        _, result = self.racer.race(text, from_lang, to_lang, engines, cancel_event)
+        if result is not None:
+            yield result
+            return
+        # 所有引擎都没有可用结果时，使用表现最好的引擎给出提示信息
+        best_engine = self.racer.scoreboard.ranked(engines)[0]
+        yield self.engine.translate(text, from_lang, to_lang, engine_name=best_engine)
+
+    def _translate_segment(self, text, from_lang, to_lang, engine_name, cancel_event):
+        """翻译单个片段，每个片段单独使用翻译缓存"""
+        if cancel_event.is_set() or not text.strip():
+            return ""
+        if engine_name == FASTEST_ENGINE:
+            return "".join(self._race_stream(text, from_lang, to_lang, cancel_event=cancel_event))
+        return self.engine.translate(text, from_lang, to_lang, engine_name=engine_name, cancel_event=cancel_event)
+
+    def _chunked_stream(self, request_id, segments, from_lang, to_lang, engine_name, cancel_event=None):
+        """并行翻译各片段，按原顺序产出译文并报告进度"""
+        total = len(segments)
+        done = [0]
+        lock = threading.Lock()
+
+        def on_segment_done(future):
+            with lock:
+                done[0] += 1
+                finished = done[0]
+            self._worker_progress.emit(request_id, finished, total)
+
+        futures = []
+        for text, _ in segments:
+            future = self.chunk_executor.submit(
+                self._translate_segment, text, from_lang, to_lang, engine_name, cancel_event)
+            future.add_done_callback(on_segment_done)
+            futures.append(future)
+
+        # 同一段落内的句子在非中日文译文中用空格连接
+        joiner = "" if to_lang in NO_SPACE_LANGS else " "
+        try:
+            for future, (_, separator) in zip(futures, segments):
+                result = future.result().strip()
+                yield result + (joiner if separator is None else separator)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _on_worker_progress(self, request_id, done, total):
+        """在界面线程中转发分段翻译进度"""
+        if self.is_current(request_id):
+            self.translation_progress.emit(request_id, done, total)
+
+    def _on_worker_chunk(self, request_id, chunk):
+        """在界面线程中接收部分结果，过滤已取消的请求"""
+        if self.is_current(request_id):
+            self.translation_chunk.emit(request_id, chunk)
+
+    def _on_worker_done(self, request_id, result):
+        """在界面线程中接收翻译结果，过滤已取消的请求"""
+        if not self.is_current(request_id):
+            return
+        self.current_future = None
+        self.translation_finished.emit(request_id, result)